@@ -0,0 +1,233 @@
+#Code for the prebuilt sprite bundle: frame sets stored sliced, scaled and flipped, as raw pixels
+#Build it from the repository root:  python asset_bundle.py [--out sprites.bundle]
+import argparse
+import ctypes
+import json
+import mmap
+import os
+import struct
+import pygame
+from sprite_cache import slice_sheet
+
+BUNDLE_PATH = "sprites.bundle"
+MAGIC = b"SWSBNDL1"
+HEADER = struct.Struct("<8sI")  # Magic, then the byte length of the JSON index that follows
+ALIGN = 16  # Frame data starts on aligned offsets
+# Pixels are stored as BGRA bytes: the ARGB8888 layout convert_alpha() produces on
+# little-endian machines, so the mapped surfaces can be blitted without converting
+PIXEL_FORMAT = 'BGRA'
+PIXEL_MASKS = (0xFF0000, 0xFF00, 0xFF, 0xFF000000)
+
+
+def data_start(index_length):
+    """File offset of the frame data, which follows the header and index; index offsets are relative to it."""
+    start = HEADER.size + index_length
+    return start + -start % ALIGN
+
+
+def bundle_key(key, mtime_ns):
+    """Index key of a frame cache key (which holds the scale or size) plus its source file's mtime."""
+    return json.dumps([list(part) if isinstance(part, tuple) else part for part in key] + [mtime_ns])
+
+
+class AssetBundle:
+    """Memory-mapped bundle of frames keyed like the frame cache.
+
+    frame_set() and image() wrap the mapped bytes in Surfaces: no PNG decode,
+    no scaling, no flipping and, when the display uses the stored pixel
+    layout, no conversion or copy either (pages are read in as they are first
+    drawn). Entries are keyed with the source file's mtime, so an edited PNG
+    simply misses and the caller falls back to loading it. The mapping is
+    copy-on-write: drawing onto a bundled surface copies just the pages it
+    touches and never changes the file. span() and release() let the frame
+    cache count and give back the pages its entries read in.
+    """
+    def __init__(self, path=BUNDLE_PATH):
+        self.path = path
+        self.file = open(path, 'rb')
+        # A read-only mapping would make every surface over it crash the process when written to
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_COPY)
+        # Address range of the mapping, to tell which surfaces point into it (see maps())
+        anchor = ctypes.c_char.from_buffer(self.map)
+        self.address = ctypes.addressof(anchor)
+        del anchor  # Releases the buffer export so close() can unmap
+        magic, index_length = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a sprite bundle")
+        self.index = json.loads(self.map[HEADER.size:HEADER.size + index_length])
+        self.view = memoryview(self.map)[data_start(index_length):]
+        self.native = None  # Whether the display's alpha format matches PIXEL_MASKS, checked on first use
+        self.hits = 0
+        self.stale = 0  # Lookups whose source changed (or is unknown) since the bundle was built
+
+    @classmethod
+    def open(cls, path=BUNDLE_PATH):
+        """Returns the bundle at path, or None if there is no usable bundle."""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path)
+        except (OSError, ValueError) as error:
+            print(f"Ignoring sprite bundle {path}: {error}")
+            return None
+
+    def entry(self, key):
+        """Index entry of a frame cache key, or None if it is missing or its source changed."""
+        try:
+            mtime_ns = os.stat(key[0]).st_mtime_ns
+        except OSError:
+            return None
+        return self.index.get(bundle_key(key, mtime_ns))
+
+    def has(self, key):
+        return self.entry(key) is not None
+
+    def frame_set(self, key):
+        """(frames, flipped frames) ready for blitting for a sheet key, or None."""
+        entry = self.lookup(key)
+        if entry is None:
+            return None
+        return self._surfaces(entry['frames']), self._surfaces(entry['flipped'])
+
+    def image(self, key):
+        """The single image of an image key ready for blitting, or None."""
+        entry = self.lookup(key)
+        if entry is None:
+            return None
+        return self._surfaces(entry['frames'])[0]
+
+    def lookup(self, key):
+        entry = self.entry(key)
+        if entry is None:
+            self.stale += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def _surfaces(self, entries):
+        if self.native is None:
+            probe = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+            self.native = probe.get_masks() == PIXEL_MASKS
+        view = self.view
+        surfaces = [pygame.image.frombuffer(view[offset:offset + width * height * 4], (width, height), PIXEL_FORMAT)
+                    for offset, width, height in entries]
+        if not self.native:
+            surfaces = [surface.convert_alpha() for surface in surfaces]
+        return surfaces
+
+    def maps(self, surface):
+        """True if the pixels of surface are the mapped file itself (not a converted copy)."""
+        return not self.map.closed and self.address <= surface._pixels_address < self.address + len(self.map)
+
+    def span(self, surfaces):
+        """(start, end) byte offsets in the mapping covering the pixels of the surfaces that map it, or None."""
+        start = end = None
+        for surface in surfaces:
+            if not self.maps(surface):
+                continue
+            offset = surface._pixels_address - self.address
+            start = offset if start is None else min(start, offset)
+            end = max(end or 0, offset + surface.get_pitch() * surface.get_height())
+        return None if start is None else (start, end)
+
+    @staticmethod
+    def span_bytes(start, end):
+        """Memory the pages under a span take once read in."""
+        return end + -end % mmap.PAGESIZE - (start - start % mmap.PAGESIZE)
+
+    def release(self, start, end):
+        """Drops the read-in pages of a span, e.g. once the frame cache evicted the entry over it.
+
+        Only pages wholly inside the span are dropped, as the ones at its ends
+        may hold a neighbouring entry. Surfaces still pointing into the span
+        stay valid: the pages are read in again from the file, as built, when next touched.
+        """
+        first = start + -start % mmap.PAGESIZE
+        last = end - end % mmap.PAGESIZE
+        if last > first and not self.map.closed and hasattr(mmap, 'MADV_DONTNEED'):
+            self.map.madvise(mmap.MADV_DONTNEED, first, last - first)
+
+    def stats(self):
+        return {'entries': len(self.index), 'hits': self.hits, 'stale': self.stale}
+
+    def close(self):
+        if getattr(self, 'view', None) is not None:
+            self.view.release()
+            self.view = None
+        self.map.close()
+        self.file.close()
+
+
+def bundled_keys():
+    """Frame cache keys of every enemy sheet and image, plus the player's bullet."""
+    from enemy import Enemy
+    from weapon import BULLET_IMAGE
+
+    sheets, images = [], []
+    enemy_types = list(Enemy.__subclasses__())
+    while enemy_types:
+        enemy_type = enemy_types.pop(0)
+        enemy_types.extend(enemy_type.__subclasses__())
+        type_sheets, type_images = enemy_type.asset_keys()
+        sheets.extend(key for key in type_sheets if key not in sheets)
+        images.extend(key for key in type_images if key not in images)
+    if BULLET_IMAGE not in images:
+        images.append(BULLET_IMAGE)
+    return sheets, images
+
+
+def build(out_path=BUNDLE_PATH):
+    """Slices and scales every bundled asset and writes the bundle file. Returns (entries, bytes)."""
+    sheets, images = bundled_keys()
+    index = {}
+    chunks = []
+    offset = 0
+    decoded = {}  # Each source PNG is decoded once even if several keys use it
+
+    def write(surfaces):
+        nonlocal offset
+        entries = []
+        for surface in surfaces:
+            data = pygame.image.tobytes(surface, PIXEL_FORMAT)
+            padding = -offset % ALIGN
+            chunks.append(b"\0" * padding + data)
+            offset += padding
+            entries.append([offset, surface.get_width(), surface.get_height()])
+            offset += len(data)
+        return entries
+
+    for key in sheets:
+        path, frame_width, frame_height, rows, cols, scale = key
+        if path not in decoded:
+            decoded[path] = pygame.image.load(path)
+        frames = slice_sheet(decoded[path], frame_width, frame_height, rows, cols, scale)
+        index[bundle_key(key, os.stat(path).st_mtime_ns)] = {
+            'frames': write(frames),
+            'flipped': write([pygame.transform.flip(frame, True, False) for frame in frames]),
+        }
+    for key in images:
+        path, size = key
+        image = pygame.image.load(path)
+        if size is not None:
+            image = pygame.transform.scale(image, size)
+        index[bundle_key(key, os.stat(path).st_mtime_ns)] = {'frames': write([image])}
+
+    index_bytes = json.dumps(index).encode()
+    temp_path = out_path + ".tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(index_bytes)))
+        file.write(index_bytes)
+        file.write(b"\0" * (data_start(len(index_bytes)) - HEADER.size - len(index_bytes)))
+        for chunk in chunks:
+            file.write(chunk)
+    os.replace(temp_path, out_path)  # A running game never sees a half-written bundle
+    return len(index), os.path.getsize(out_path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Prebuild the sprite bundle loaded by the game at startup.")
+    parser.add_argument('--out', default=BUNDLE_PATH)
+    args = parser.parse_args()
+    entries, size = build(args.out)
+    print(f"Wrote {args.out}: {entries} entries, {size / (1024 * 1024):.1f} MB")
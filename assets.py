@@ -0,0 +1,144 @@
+#Code for loading the sprite sheets of upcoming waves on a worker thread
+import queue
+import threading
+import time
+import pygame
+from sprite_cache import FrameSet, frame_cache, slice_sheet
+
+
+class AssetManager:
+    """Decodes and scales the sprite sheets a wave needs before its enemies spawn.
+
+    Enemy classes declare their sheets (Enemy.SHEETS, Enemy.asset_keys()), so
+    the sheets of a wave table entry are known without building an enemy. A
+    worker thread gets each source image the way the frame cache does
+    (cache.load_source: its texture atlas region, else the converted PNG) and
+    slices, scales and flips it; poll() on the main thread stores the finished
+    frames in the shared frame cache, where get_frames() then finds them. So
+    prefetched frames share the atlas pages the cache uses instead of being a
+    second copy. Anything that was not prefetched still loads on demand.
+    Sheets found in the cache's prebuilt bundle need no work and are mapped in
+    straight away.
+    """
+    def __init__(self, cache=frame_cache, budget_ms=2.0):
+        self.cache = cache
+        self.budget_ms = budget_ms  # Main-thread time poll() may spend storing finished assets per call
+        self.requests = queue.Queue()
+        self.results = queue.Queue()
+        self.queued = set()  # Keys handed to the worker and not yet polled
+        self.total = 0  # Keys in the current batch, for progress()
+        self.completed = 0
+        self.errors = []  # (key, exception) of files the worker could not load
+        self.worker = None
+
+    def wave_keys(self, wave):
+        """Frame cache keys of the sheets and images needed by the enemy types of a wave."""
+        sheets, images = [], []
+        for enemy_type, _, _ in wave['enemies']:
+            type_sheets, type_images = enemy_type.asset_keys()
+            sheets.extend(key for key in type_sheets if key not in sheets)
+            images.extend(key for key in type_images if key not in images)
+        return sheets, images
+
+    def prefetch_wave(self, wave):
+        self.prefetch(*self.wave_keys(wave))
+
+    def prefetch(self, sheets=(), images=()):
+        """Queues every key that is neither cached nor already queued for the worker."""
+        if not self.queued:
+            self.total = 0
+            self.completed = 0
+        bundle = self.cache.bundle
+        for kind, keys, cached, load in (('sheet', sheets, self.cache.has_frames, self.cache.get_frames),
+                                         ('image', images, self.cache.has_image, self.cache.get_image)):
+            for key in keys:
+                if key in self.queued or cached(key):
+                    continue
+                if bundle is not None and bundle.has(key):
+                    load(*key)
+                    continue
+                self.queued.add(key)
+                self.total += 1
+                self.requests.put((kind, key))
+
+        if self.queued and (self.worker is None or not self.worker.is_alive()):
+            self.worker = threading.Thread(target=self._work, name="asset-prefetch", daemon=True)
+            self.worker.start()
+
+    def _work(self):
+        sources = {}  # Sheet path -> source surface, shared by keys that only differ in scale
+        while True:
+            kind, key = self.requests.get()
+            try:
+                if kind == 'sheet':
+                    path, frame_width, frame_height, rows, cols, scale = key
+                    if path not in sources:
+                        sources[path] = self.cache.load_source(path)
+                    source = sources[path]
+                    frames = slice_sheet(source, frame_width, frame_height, rows, cols, scale)
+                    # Frames followed by their flipped copies
+                    payload = frames + [pygame.transform.flip(frame, True, False) for frame in frames]
+                else:
+                    path, size = key
+                    image = source = self.cache.load_source(path)
+                    if size is not None:
+                        image = pygame.transform.scale(image, size)
+                    payload = [image]
+            except (pygame.error, OSError) as error:
+                payload = source = error
+            # The source goes along so the cache charges the key for its atlas page
+            self.results.put((kind, key, payload, source))
+            if self.requests.empty():
+                sources.clear()
+
+    def poll(self, budget_ms=None):
+        """Stores finished assets in the frame cache until the budget is spent. Main thread only.
+
+        The worker's surfaces are already in the display format (load_source
+        converts), so this is only bookkeeping. Returns how many assets were completed.
+        """
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        deadline = time.perf_counter() + budget_ms / 1000
+        moved = 0
+        while time.perf_counter() < deadline:
+            try:
+                kind, key, payload, source = self.results.get_nowait()
+            except queue.Empty:
+                break
+            if isinstance(payload, Exception):
+                # Left to the on-demand load, which raises where the asset is used
+                self.errors.append((key, payload))
+            elif not (self.cache.has_frames(key) or self.cache.has_image(key)):  # Else loaded on demand meanwhile
+                if kind == 'sheet':
+                    half = len(payload) // 2
+                    self.cache.put_frames(key, FrameSet(payload[:half], payload[half:]), [source])
+                else:
+                    self.cache.put_image(key, payload[0], [source])
+            self.queued.discard(key)
+            self.completed += 1
+            moved += 1
+        return moved
+
+    def pending(self):
+        return len(self.queued)
+
+    def progress(self):
+        """Fraction (0..1) of the current batch that is in the frame cache."""
+        return self.completed / self.total if self.total else 1.0
+
+    def ready(self, enemy_type):
+        """True once every sheet and image of an enemy type is cached, so building one loads nothing."""
+        sheets, images = enemy_type.asset_keys()
+        return all(self.cache.has_frames(key) for key in sheets) and \
+            all(self.cache.has_image(key) for key in images)
+
+    def load(self, sheets=(), images=(), on_progress=None, interval=1 / 60):
+        """Blocking load (e.g. behind a loading screen), calling on_progress(fraction) about every interval."""
+        self.prefetch(sheets, images)
+        while self.pending():
+            self.poll(budget_ms=interval * 1000)
+            if on_progress is not None:
+                on_progress(self.progress())
+            time.sleep(interval)
+        if on_progress is not None:
+            on_progress(1.0)
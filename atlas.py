@@ -0,0 +1,182 @@
+#Code for packing sprite PNGs into a few atlas pages, and looking up their regions at runtime
+#Build the atlas from the repository root:  python atlas.py [--page-size 2048] [--out atlas]
+import argparse
+import glob
+import json
+import os
+import threading
+import pygame
+
+ATLAS_DIR = "atlas"
+INDEX_FILE = "atlas.json"
+SOURCE_DIRS = ["Sprites", "Shop_Cards"]
+PAGE_SIZE = 2048
+PADDING = 1  # Transparent pixels between regions
+
+
+def region_name(path):
+    """Atlas name of a source file: its repository-relative path with forward slashes, as used in code."""
+    return os.path.relpath(path).replace(os.sep, "/")
+
+
+def source_group(name):
+    """Sprites of one folder (an enemy, the bullets, Shop_Cards, ...) are packed onto their own pages,
+    so loading one archetype's sheets does not decode every other sprite with them."""
+    return name.rsplit("/", 1)[0]
+
+
+def pack(sizes, page_size=PAGE_SIZE, padding=PADDING):
+    """Shelf-packs {name: (width, height)} onto pages.
+
+    Items go tallest first into rows ("shelves") filled left to right; a new
+    shelf opens below when a row is full, and a new page when the page is.
+    Items wider than the page get a page of their own width. Returns
+    ([(page width, page height)], {name: (page, x, y, width, height)}).
+    """
+    pages = []
+    regions = {}
+    page_index = -1
+    shelf_x = shelf_y = shelf_height = page_width = 0
+    for name, (width, height) in sorted(sizes.items(), key=lambda item: (-item[1][1], -item[1][0], item[0])):
+        fits_row = page_index >= 0 and shelf_x + width <= page_width
+        if not fits_row and page_index >= 0:
+            # Next shelf on the same page
+            shelf_y += shelf_height + padding
+            shelf_x = shelf_height = 0
+            fits_row = width <= page_width
+        if page_index < 0 or not fits_row or shelf_y + height > pages[page_index][1]:
+            page_width = max(page_size, width)
+            pages.append((page_width, max(page_size, height)))
+            page_index += 1
+            shelf_x = shelf_y = shelf_height = 0
+        regions[name] = (page_index, shelf_x, shelf_y, width, height)
+        shelf_x += width + padding
+        shelf_height = max(shelf_height, height)
+    # Trim every page to the area actually used
+    used = [(0, 0)] * len(pages)
+    for page, x, y, width, height in regions.values():
+        used[page] = (max(used[page][0], x + width), max(used[page][1], y + height))
+    return used, regions
+
+
+def build(out_dir=ATLAS_DIR, source_dirs=SOURCE_DIRS, page_size=PAGE_SIZE):
+    """Packs every PNG under source_dirs into page PNGs plus an index. Returns (regions, pages)."""
+    images = {}
+    for source_dir in source_dirs:
+        for path in sorted(glob.glob(os.path.join(source_dir, "**", "*.png"), recursive=True)):
+            images[region_name(path)] = pygame.image.load(path)
+
+    groups = {}
+    for name in images:
+        groups.setdefault(source_group(name), []).append(name)
+
+    os.makedirs(out_dir, exist_ok=True)
+    for old_page in glob.glob(os.path.join(out_dir, "page*.png")):
+        os.remove(old_page)
+    page_files = []
+    index_regions = {}
+    for group in sorted(groups):
+        sizes = {name: images[name].get_size() for name in groups[group]}
+        page_sizes, regions = pack(sizes, page_size)
+        first_page = len(page_files)
+        surfaces = [pygame.Surface(size, pygame.SRCALPHA) for size in page_sizes]
+        for name, (page, x, y, width, height) in regions.items():
+            surfaces[page].blit(images[name], (x, y))
+            index_regions[name] = [first_page + page, x, y, width, height, os.stat(name).st_mtime_ns]
+        for surface in surfaces:
+            page_file = f"page{len(page_files)}.png"
+            pygame.image.save(surface, os.path.join(out_dir, page_file))
+            page_files.append(page_file)
+
+    with open(os.path.join(out_dir, INDEX_FILE), 'w') as file:
+        json.dump({'pages': page_files, 'regions': index_regions}, file, indent=1)
+    return len(index_regions), len(page_files)
+
+
+class TextureAtlas:
+    """Runtime lookup of atlas regions by source path.
+
+    get() returns a subsurface of a converted page, so every sprite of a
+    folder shares one surface. Pages are loaded the first time one of their
+    regions is requested (and unloaded by the frame cache once none of its
+    entries uses them), from the main thread or the asset prefetch worker
+    (so loading a page holds a lock). A region whose source PNG changed after
+    the atlas was built is treated as missing, so the caller loads the PNG itself.
+    """
+    def __init__(self, directory=ATLAS_DIR):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as file:
+            index = json.load(file)
+        self.page_files = index['pages']
+        self.regions = index['regions']
+        self.pages = [None] * len(self.page_files)
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.stale = 0
+
+    @classmethod
+    def open(cls, directory=ATLAS_DIR):
+        """Returns the atlas in directory, or None if it has not been built."""
+        if not os.path.exists(os.path.join(directory, INDEX_FILE)):
+            return None
+        try:
+            return cls(directory)
+        except (OSError, ValueError, KeyError) as error:
+            print(f"Ignoring texture atlas {directory}: {error}")
+            return None
+
+    def has(self, name):
+        region = self.regions.get(name)
+        if region is None:
+            return False
+        try:
+            return os.stat(name).st_mtime_ns == region[5]
+        except OSError:
+            return True  # Source removed: the atlas copy is all there is
+
+    def get(self, name):
+        """Subsurface of the region for a source path, or None if it is missing or stale."""
+        if not self.has(name):
+            self.stale += name in self.regions
+            return None
+        page_index, x, y, width, height, _ = self.regions[name]
+        page = self.pages[page_index]
+        if page is None:
+            with self.lock:
+                page = self.pages[page_index]
+                if page is None:
+                    page = pygame.image.load(os.path.join(self.directory, self.page_files[page_index])).convert_alpha()
+                    self.pages[page_index] = page
+        self.hits += 1
+        return page.subsurface((x, y, width, height))
+
+    def page_of(self, surface):
+        """Index of the loaded page that surface is (a subsurface of), or None if its pixels are its own."""
+        parent = surface.get_abs_parent()
+        for page_index, page in enumerate(self.pages):
+            if parent is page:
+                return page_index
+        return None
+
+    def unload(self, page_index):
+        """Forgets a loaded page; its pixels are freed once no region of it is referenced any more."""
+        with self.lock:
+            self.pages[page_index] = None
+
+    def stats(self):
+        return {
+            'regions': len(self.regions),
+            'pages': len(self.pages),
+            'pages_loaded': sum(page is not None for page in self.pages),
+            'hits': self.hits,
+            'stale': self.stale,
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack Sprites/ and Shop_Cards/ into atlas pages.")
+    parser.add_argument('--out', default=ATLAS_DIR)
+    parser.add_argument('--page-size', type=int, default=PAGE_SIZE)
+    args = parser.parse_args()
+    regions, pages = build(args.out, page_size=args.page_size)
+    print(f"Wrote {args.out}/: {regions} regions on {pages} pages")
@@ -0,0 +1,109 @@
+#Benchmark for bullet-vs-enemy collision: brute force against the ProjectileSystem with the spatial hash broadphase
+#Run from the repository root:  python benchmarks/bench_collision.py
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from projectiles import FACTION_PLAYER, ProjectileSystem
+from spatial_hash import SpatialHash
+from weapon import BULLET_DAMAGE
+
+ENEMY_COUNTS = [10, 100, 500, 1000, 5000]
+BULLET_COUNT = 200
+WORLD_SIZE = 704
+REPEATS = 20
+
+
+class DummyEnemy:
+    """Stand-in enemy that takes hits without dying, so every run sees the same load."""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.is_dead = False
+
+    def take_damage(self, damage):
+        pass
+
+
+class BenchBullet:
+    """Minimal copy of the removed weapon.Bullet for the brute force baseline."""
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.dx = 1
+        self.dy = 0
+        self.damage = BULLET_DAMAGE
+
+
+def brute_force_update(bullets, enemies):
+    """The original O(bullets * enemies) loop from the removed Weapon.update_bullets."""
+    bullets_to_remove = []
+    for bullet in bullets:
+        bullet.x += bullet.dx
+        bullet.y += bullet.dy
+        for enemy in enemies:
+            if not enemy.is_dead:
+                enemy_rect = pygame.Rect(enemy.x - 25, enemy.y - 25, 50, 50)
+                bullet_rect = pygame.Rect(bullet.x - 2, bullet.y - 2, 4, 4)
+                if bullet_rect.colliderect(enemy_rect):
+                    enemy.take_damage(bullet.damage)
+                    bullets_to_remove.append(bullet)
+                    break
+    for bullet in bullets_to_remove:
+        if bullet in bullets:
+            bullets.remove(bullet)
+
+
+def make_positions(rng):
+    return [(rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE)) for _ in range(BULLET_COUNT)]
+
+
+def time_it(run):
+    best = float("inf")
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    rng = random.Random(1234)
+    start_positions = make_positions(rng)
+    system = ProjectileSystem(capacity=BULLET_COUNT, bounds=(-100, -100, WORLD_SIZE + 100, WORLD_SIZE + 100))
+    sprite_id = system.register_sprite(pygame.Surface((4, 4)))
+    far_away = DummyEnemy(-1000, -1000)  # Stands in for the player so enemy projectiles never hit
+
+    print(f"{BULLET_COUNT} bullets, best of {REPEATS} runs (ms per tick)")
+    print(f"{'enemies':>8} {'brute':>10} {'system':>10} {'speedup':>8}")
+    for count in ENEMY_COUNTS:
+        enemies = [DummyEnemy(rng.uniform(0, WORLD_SIZE), rng.uniform(0, WORLD_SIZE))
+                   for _ in range(count)]
+        spatial_hash = SpatialHash(cell_size=64)
+
+        def run_brute():
+            brute_force_update([BenchBullet(x, y) for x, y in start_positions], enemies)
+
+        def run_system():
+            system.clear()
+            for x, y in start_positions:
+                system.spawn(x, y, 1, 0, BULLET_DAMAGE, FACTION_PLAYER, sprite_id, 600)
+            spatial_hash.rebuild(enemies)
+            system.update(far_away, spatial_hash)
+
+        brute_ms = time_it(run_brute)
+        system_ms = time_it(run_system)
+        print(f"{count:>8} {brute_ms:>10.3f} {system_ms:>10.3f} {brute_ms / system_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#Benchmark for chase movement: per-object Enemy.update against the vectorized EnemyStore pass
+#Run from the repository root:  python benchmarks/bench_enemy_store.py
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from enemy import Enemy
+from enemy_store import EnemyStore
+from pathfinding import FlowField
+
+ENEMY_COUNTS = [100, 1000, 10000]
+TICKS = 30
+GRID_SIZE = 44
+TILE_SIZE = 16
+FRAME_BUDGET_MS = 1000 / 60
+
+
+class DummyPlayer:
+    def __init__(self):
+        self.x = GRID_SIZE * TILE_SIZE / 2
+        self.y = GRID_SIZE * TILE_SIZE / 2
+        self.health = 1e12
+
+
+class Chaser(Enemy):
+    """Plain chasing enemy with no special behaviour and no sprites."""
+    def update_behavior(self, player):
+        pass
+
+
+def make_enemies(rng, count, obstacle_map, flow_field):
+    enemies = []
+    for _ in range(count):
+        enemy = Chaser(rng.uniform(16, 688), rng.uniform(16, 688), speed=120, health=100,
+                      damage=1, acceptance_radius=10)
+        enemy.obstacle_map = obstacle_map
+        enemy.flow_field = flow_field
+        enemies.append(enemy)
+    return enemies
+
+
+def time_ticks(tick):
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        tick()
+    return (time.perf_counter() - start) * 1000 / TICKS
+
+
+def main():
+    rng = random.Random(1234)
+    obstacle_map = [[x in (0, GRID_SIZE - 1) or y in (0, GRID_SIZE - 1) for x in range(GRID_SIZE)]
+                    for y in range(GRID_SIZE)]
+    flow_field = FlowField(TILE_SIZE)
+    player = DummyPlayer()
+    flow_field.update(player.x, player.y, obstacle_map, 1)
+
+    print(f"ms per tick, mean of {TICKS} ticks (frame budget {FRAME_BUDGET_MS:.1f} ms)")
+    print(f"{'enemies':>8} {'objects':>10} {'store pass':>11} {'store tick':>11}")
+    for count in ENEMY_COUNTS:
+        object_enemies = make_enemies(rng, count, obstacle_map, flow_field)
+        stored_enemies = make_enemies(rng, count, obstacle_map, flow_field)
+        store = EnemyStore()
+        for enemy in stored_enemies:
+            store.add(enemy)
+
+        def object_tick():
+            for enemy in object_enemies:
+                enemy.update(player)
+
+        def store_pass():
+            store.step_chase(player, flow_field)
+
+        def store_tick():
+            # Per-object work that is left (animation, behaviour hooks) plus the vectorized pass
+            for enemy in stored_enemies:
+                enemy.update(player)
+            store.step_chase(player, flow_field)
+
+        object_ms = time_ticks(object_tick)
+        pass_ms = time_ticks(store_pass)
+        tick_ms = time_ticks(store_tick)
+        print(f"{count:>8} {object_ms:>10.3f} {pass_ms:>11.3f} {tick_ms:>11.3f}")
+
+
+if __name__ == "__main__":
+    main()
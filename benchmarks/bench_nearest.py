@@ -0,0 +1,59 @@
+#Benchmark for the auto-aim nearest-target query: linear min() scan against the spatial hash
+#Run from the repository root:  python benchmarks/bench_nearest.py
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from spatial_hash import SpatialHash
+
+ENEMY_COUNTS = [10, 100, 1000, 5000, 20000]
+QUERIES = 200
+
+
+class DummyEnemy:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.is_dead = False
+
+
+def linear_nearest(enemies, x, y):
+    """The original WeaponManager.update lookup."""
+    living_enemies = [e for e in enemies if not e.is_dead]
+    return min(living_enemies, key=lambda e: math.sqrt((e.x - x)**2 + (e.y - y)**2))
+
+
+def main():
+    rng = random.Random(1234)
+    print(f"{QUERIES} queries, ms per query (world grows with enemy count, density is fixed)")
+    print(f"{'enemies':>8} {'linear':>10} {'hash':>10} {'rebuild':>10}")
+    for count in ENEMY_COUNTS:
+        world_size = 70 * math.sqrt(count)
+        enemies = [DummyEnemy(rng.uniform(0, world_size), rng.uniform(0, world_size))
+                   for _ in range(count)]
+        points = [(rng.uniform(0, world_size), rng.uniform(0, world_size)) for _ in range(QUERIES)]
+
+        spatial_hash = SpatialHash(cell_size=64)
+        start = time.perf_counter()
+        spatial_hash.rebuild(enemies)
+        rebuild_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for x, y in points:
+            linear_nearest(enemies, x, y)
+        linear_ms = (time.perf_counter() - start) * 1000 / QUERIES
+
+        start = time.perf_counter()
+        for x, y in points:
+            spatial_hash.nearest(x, y)
+        hash_ms = (time.perf_counter() - start) * 1000 / QUERIES
+
+        print(f"{count:>8} {linear_ms:>10.4f} {hash_ms:>10.4f} {rebuild_ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
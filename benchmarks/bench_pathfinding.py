@@ -0,0 +1,70 @@
+#Benchmark for grid A*: the old PriorityQueue search against GridPathfinder (plain, JPS, cached)
+#Run from the repository root:  python benchmarks/bench_pathfinding.py
+import os
+import random
+import sys
+import time
+from queue import PriorityQueue
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pathfinding import GridPathfinder
+
+GRID_SIZES = [44, 128, 256]
+OBSTACLE_DENSITIES = [0.02, 0.2]
+QUERIES = 50
+
+
+def old_astar(start, goal, obstacle_map, size):
+    """The original Enemy.pathfind_to_player search (4-connected, PriorityQueue, no closed set)."""
+    frontier = PriorityQueue()
+    frontier.put((0, start))
+    came_from = {start: None}
+    cost_so_far = {start: 0}
+    while not frontier.empty():
+        _, current = frontier.get()
+        if current == goal:
+            break
+        x, y = current
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < size and 0 <= ny < size and not obstacle_map[ny][nx]:
+                new_cost = cost_so_far[current] + 1
+                if (nx, ny) not in cost_so_far or new_cost < cost_so_far[(nx, ny)]:
+                    cost_so_far[(nx, ny)] = new_cost
+                    frontier.put((new_cost + abs(goal[0] - nx) + abs(goal[1] - ny), (nx, ny)))
+                    came_from[(nx, ny)] = current
+    return came_from
+
+
+def make_map(rng, size, density):
+    obstacle_map = [[rng.random() < density for _ in range(size)] for _ in range(size)]
+    cells = [(x, y) for y in range(size) for x in range(size) if not obstacle_map[y][x]]
+    queries = [(rng.choice(cells), rng.choice(cells)) for _ in range(QUERIES)]
+    return obstacle_map, queries
+
+
+def time_queries(search, queries):
+    start = time.perf_counter()
+    for query_start, query_goal in queries:
+        search(query_start, query_goal)
+    return (time.perf_counter() - start) * 1000 / len(queries)
+
+
+def main():
+    rng = random.Random(1234)
+    print(f"{QUERIES} random queries, ms per query")
+    print(f"{'obstacles':>9} {'grid':>6} {'old':>10} {'astar':>10} {'jps':>10} {'cached':>10}")
+    for density, size in [(density, size) for density in OBSTACLE_DENSITIES for size in GRID_SIZES]:
+        obstacle_map, queries = make_map(rng, size, density)
+        astar = GridPathfinder(use_jps=False)
+        jps = GridPathfinder(use_jps=True)
+
+        old_ms = time_queries(lambda s, g: old_astar(s, g, obstacle_map, size), queries)
+        astar_ms = time_queries(lambda s, g: astar.find_path(s, g, obstacle_map, 1), queries)
+        jps_ms = time_queries(lambda s, g: jps.find_path(s, g, obstacle_map, 1), queries)
+        cached_ms = time_queries(lambda s, g: jps.find_path(s, g, obstacle_map, 1), queries)
+        print(f"{int(density * 100):>8}% {size:>6} {old_ms:>10.3f} {astar_ms:>10.3f} {jps_ms:>10.3f} {cached_ms:>10.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#Benchmark for sprite rotation: pygame.transform.rotate per call against the quantized rotation cache
+#Run from the repository root:  python benchmarks/bench_rotation.py
+import math
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+pygame.init()
+pygame.display.set_mode((1, 1))
+
+from sprite_cache import RotationCache
+
+SPRITES = {
+    'gun 32x32': ("Sprites/Sprites_Weapon/Assaut-rifle-4-scoped.png", (32, 32)),
+    'bullet 48x48': ("Sprites/Sprites_Effect/Bullets/14.png", (48, 48)),
+}
+ROTATIONS = 2000
+
+
+def time_it(run):
+    start = time.perf_counter()
+    run()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    angles = [(index * 7.3) % 360 for index in range(ROTATIONS)]
+    print(f"{ROTATIONS} rotations per run (ms)")
+    print(f"{'sprite':>14} {'mode':>8} {'bake':>8} {'rotate':>9} {'cached':>8} {'speedup':>8}")
+    for name, (path, size) in SPRITES.items():
+        image = pygame.transform.scale(pygame.image.load(path).convert_alpha(), size)
+        for precise in (False, True):
+            cache = RotationCache()
+            bake_ms = time_it(lambda: cache.get_rotations(image, precise))
+            rotations = cache.get_rotations(image, precise)
+
+            def run_rotate():
+                for angle in angles:
+                    rotated = pygame.transform.rotate(image, angle)
+                    rotated.get_rect(center=(100, 100))
+
+            def run_cached():
+                for angle in angles:
+                    rotations.get(angle)
+
+            rotate_ms = time_it(run_rotate)
+            cached_ms = time_it(run_cached)
+            mode = 'precise' if precise else 'fast'
+            print(f"{name:>14} {mode:>8} {bake_ms:>8.2f} {rotate_ms:>9.2f} {cached_ms:>8.2f} "
+                  f"{rotate_ms / cached_ms:>7.0f}x")
+
+    # Worst case snapping error of the default step count, in pixels at the sprite edge
+    cache = RotationCache()
+    error = math.radians(180 / cache.steps) * 24
+    print(f"default {cache.steps} steps: at most {180 / cache.steps:.2f} degrees off, "
+          f"{error:.2f} px at the edge of a 48 px sprite")
+
+
+if __name__ == "__main__":
+    main()
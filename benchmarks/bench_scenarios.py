@@ -0,0 +1,164 @@
+#Scenario benchmarks: replays every wave of main.waves (and scaled-up copies) headless and times each subsystem
+#Run from the repository root:  python benchmarks/bench_scenarios.py [--scales 1 10 100] [--out results.json]
+#Compare two runs:               python benchmarks/bench_scenarios.py --compare old.json new.json
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from collections import defaultdict
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import main
+from profiler import Profiler
+
+SEED = 1234
+TICKS = 600  # 10 simulated seconds per scenario
+STRESS_TICKS = 120  # Scales above x1 are slow per tick, so they run shorter
+SECTIONS = ['spawning', 'ai', 'pathfinding', 'collision', 'projectiles', 'draw', 'player', 'weapons', 'total']
+LEG_TICKS = 60  # The scripted player walks a square, one second per side
+
+
+def scripted_keys():
+    """Key states for a player walking right, down, left and up around the map center."""
+    legs = []
+    for key in (pygame.K_RIGHT, pygame.K_DOWN, pygame.K_LEFT, pygame.K_UP):
+        keys = defaultdict(bool)
+        keys[key] = True
+        legs.append(keys)
+    return lambda tick: legs[(tick // LEG_TICKS) % len(legs)]
+
+
+def scaled_wave(wave, scale):
+    # Spawn rates scale with the counts, so a scaled wave arrives over the same time
+    return {
+        'enemies': [(enemy_type, count * scale, spawn_rate * scale)
+                    for enemy_type, count, spawn_rate in wave['enemies']],
+        'message': wave['message'],
+    }
+
+
+def run_scenario(wave, scale, ticks, draw, use_enemy_store):
+    """Plays one wave until it is cleared or for `ticks` ticks and returns its timing summary."""
+    profiler = Profiler()
+    # Frames are drawn but never presented, so the whole frame is redrawn each time
+    session = main.GameSession(headless=not draw, use_enemy_store=use_enemy_store, seed=SEED,
+                               wave_table=[scaled_wave(wave, scale)], profiler=profiler, dirty_rects=False)
+    session.start()
+    enemies = sum(count for _, count, _ in session.wave_manager.waves[0]['enemies'])
+    keys = scripted_keys()
+    max_health = session.max_health
+
+    for tick in range(ticks):
+        start = time.perf_counter()
+        running = session.step(keys(tick))
+        if draw:
+            session.draw()
+        profiler.add('total', (time.perf_counter() - start) * 1000)
+        profiler.end_frame()
+        # The player cannot die, so every scenario measures the same amount of play
+        session.player.health = max_health
+        # A cleared wave only leaves empty ticks until the next one, which would skew the percentiles
+        if not running or session.wave_manager.wave_completed:
+            break
+
+    sections = profiler.summary()
+    if draw and 'draw' not in sections:
+        # The default run must time rendering; a silently skipped draw path would look like a speedup
+        raise RuntimeError("draw mode recorded no 'draw' timings")
+    return {
+        'enemies': enemies,
+        'ticks': profiler.frames,
+        'enemies_left': len(session.wave_manager.enemies) + session.wave_manager.spawn_scheduler.pending(),
+        'projectiles_fired': session.projectile_system.spawned,
+        'sections': sections,
+    }
+
+
+def print_table(results):
+    print(f"{'scenario':<14} {'enemies':>7} {'ticks':>5}  " +
+          " ".join(f"{name:>12}" for name in SECTIONS))
+    print(f"{'':<14} {'':>7} {'':>5}  " + " ".join(f"{'p50/p99 ms':>12}" for _ in SECTIONS))
+    for name, result in results.items():
+        cells = []
+        for section in SECTIONS:
+            stats = result['sections'].get(section)
+            cells.append(f"{stats['p50']:>5.2f}/{stats['p99']:<6.2f}" if stats else f"{'-':>12}")
+        print(f"{name:<14} {result['enemies']:>7} {result['ticks']:>5}  " + " ".join(cells))
+
+
+def compare(old_path, new_path):
+    """Prints the p50 and p99 change of every section between two result files."""
+    with open(old_path) as file:
+        old = json.load(file)['scenarios']
+    with open(new_path) as file:
+        new = json.load(file)['scenarios']
+    print(f"{'scenario':<14} {'section':<12} {'old p50':>9} {'new p50':>9} {'change':>8} {'old p99':>9} {'new p99':>9}")
+    for name in new:
+        if name not in old:
+            continue
+        for section in SECTIONS:
+            before = old[name]['sections'].get(section)
+            after = new[name]['sections'].get(section)
+            if not before or not after:
+                continue
+            change = (after['p50'] - before['p50']) / before['p50'] * 100 if before['p50'] else 0.0
+            print(f"{name:<14} {section:<12} {before['p50']:>9.3f} {after['p50']:>9.3f} {change:>+7.1f}% "
+                  f"{before['p99']:>9.3f} {after['p99']:>9.3f}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Replay the wave table headless and time each subsystem.")
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--waves', type=int, nargs='+', help="1-based wave numbers (default: all)")
+    parser.add_argument('--ticks', type=int, default=TICKS)
+    parser.add_argument('--stress-ticks', type=int, default=STRESS_TICKS)
+    parser.add_argument('--no-draw', action='store_true', help="skip rendering (pure simulation cost)")
+    parser.add_argument('--enemy-store', action='store_true', help="use the NumPy enemy store backend")
+    parser.add_argument('--out', default="scenario_results.json")
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    wave_numbers = args.waves or range(1, len(main.waves) + 1)
+    results = {}
+    for wave_number in wave_numbers:
+        for scale in args.scales:
+            ticks = args.ticks if scale == 1 else args.stress_ticks
+            name = f"wave{wave_number} x{scale}"
+            results[name] = run_scenario(main.waves[wave_number - 1], scale, ticks,
+                                         not args.no_draw, args.enemy_store)
+            results[name].update(wave=wave_number, scale=scale)
+            print(f"{name}: {results[name]['enemies']} enemies, {results[name]['ticks']} ticks, "
+                  f"total p50 {results[name]['sections']['total']['p50']:.2f} ms", flush=True)
+
+    print()
+    print_table(results)
+    output = {
+        'meta': {
+            'seed': SEED,
+            'draw': not args.no_draw,
+            'enemy_store': args.enemy_store,
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'date': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'scenarios': results,
+    }
+    with open(args.out, 'w') as file:
+        json.dump(output, file, indent=2)
+    print(f"\nWrote {args.out}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,44 @@
+#Render smoke test: draws and presents frames with and without dirty-rect tracking on the dummy video driver
+#Run from the repository root:  python benchmarks/smoke_render.py [--frames 120]
+import argparse
+import os
+import sys
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import main
+
+SEED = 1234
+
+
+def render_frames(dirty_rects, frames):
+    """Steps, draws and presents a session for `frames` frames. Returns how many entity sprites the last frame drew."""
+    session = main.GameSession(seed=SEED, dirty_rects=dirty_rects)
+    session.start()
+    for _ in range(frames):
+        session.step()
+        session.draw()
+        session.present()
+        session.player.health = session.max_health
+    return session.render_queue.submitted
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description="Draw frames in every render mode and fail on any error.")
+    parser.add_argument('--frames', type=int, default=120)
+    args = parser.parse_args()
+
+    for dirty_rects in (True, False):
+        submitted = render_frames(dirty_rects, args.frames)
+        if submitted == 0:
+            sys.exit(f"dirty_rects={dirty_rects}: the last frame drew no sprites")
+        print(f"dirty_rects={dirty_rects}: {args.frames} frames ok, {submitted} sprites in the last frame")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,51 @@
+#Code for the camera: which part of the world is on screen
+import pygame
+
+
+class Camera:
+    """A screen-sized view onto a world that may be much larger than the screen.
+
+    follow() centers the view on a world position, clamped to the world edges
+    and snapped to whole pixels so sprites do not shimmer. Drawing subtracts
+    offset() from world positions, and visible() culls anything outside the
+    view plus a margin, so the cost of a frame depends on what is on screen
+    rather than on the size of the world.
+    """
+    def __init__(self, view_width, view_height, world_width, world_height, margin=64):
+        self.width = view_width
+        self.height = view_height
+        self.world_width = world_width
+        self.world_height = world_height
+        self.margin = margin  # Extra pixels around the view that still count as visible
+        self.x = 0  # World position of the view's top-left corner
+        self.y = 0
+
+    def follow(self, x, y):
+        """Centers the view on the world position (x, y), keeping it inside the world."""
+        self.x = int(max(0, min(x - self.width // 2, self.world_width - self.width)))
+        self.y = int(max(0, min(y - self.height // 2, self.world_height - self.height)))
+
+    def offset(self):
+        """(x, y) of the view in the world; subtract it from world positions to get screen positions."""
+        return self.x, self.y
+
+    def world_to_screen(self, x, y):
+        return x - self.x, y - self.y
+
+    def screen_to_world(self, x, y):
+        return x + self.x, y + self.y
+
+    def view_rect(self):
+        """The world area on screen."""
+        return pygame.Rect(self.x, self.y, self.width, self.height)
+
+    def cull_bounds(self):
+        """(left, top, right, bottom) of the view plus the margin, in world coordinates."""
+        margin = self.margin
+        return self.x - margin, self.y - margin, self.x + self.width + margin, self.y + self.height + margin
+
+    def visible(self, x, y, radius=0):
+        """True if something centered at (x, y), reaching `radius` pixels out, overlaps the view plus margin."""
+        reach = self.margin + radius
+        return (self.x - reach <= x <= self.x + self.width + reach and
+                self.y - reach <= y <= self.y + self.height + reach)
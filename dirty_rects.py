@@ -0,0 +1,78 @@
+#Code for dirty-rectangle rendering: redraw and present only the parts of the screen that changed
+import pygame
+
+
+class DirtyRectTracker:
+    """Remembers where things were drawn so the next frame touches only those areas.
+
+    Each frame restore() copies the cached background over last frame's rects,
+    the caller draws and add()s the rects its draw calls return, and present()
+    pushes last frame's and this frame's rects with pygame.display.update().
+    When the dirty area passes full_threshold of the screen (or after
+    invalidate(), a background recompose or a camera move) the frame is
+    redrawn and flipped whole instead, which is cheaper than many overlapping
+    updates.
+    """
+    def __init__(self, screen_rect, full_threshold=0.5):
+        self.screen_rect = pygame.Rect(screen_rect)
+        self.full_threshold = full_threshold  # Fraction of the screen above which the whole frame is flipped
+        self.previous = []  # Rects drawn last frame: erased at the start of this one
+        self.current = []
+        self.full_redraw = True  # The first frame always draws everything
+        self.background_version = None
+        self.offset = None  # Camera offset of the last frame: when it moves, everything on screen moves
+        self.full_frames = 0
+        self.partial_frames = 0
+        self.last_dirty_area = 0
+
+    def invalidate(self):
+        """Forces a full redraw and flip on the next frame (mode switches, overlays closing...)."""
+        self.full_redraw = True
+
+    def add(self, rect):
+        if rect:
+            self.current.append(rect)
+
+    def extend(self, rects):
+        current = self.current
+        for rect in rects:
+            if rect:
+                current.append(rect)
+
+    def restore(self, surface, background, offset=(0, 0)):
+        """Starts a frame: copies the background over last frame's rects, or over everything."""
+        if background.recompose_count != self.background_version or offset != self.offset:
+            self.background_version = background.recompose_count
+            self.offset = offset
+            self.full_redraw = True
+        if self.full_redraw:
+            background.draw(surface, offset)
+        else:
+            background.draw_areas(surface, self.previous, offset)
+
+    def present(self):
+        """Ends a frame: updates the dirty rects on the display, or flips it. Returns True for a full flip."""
+        screen_rect = self.screen_rect
+        current = [rect.clip(screen_rect) for rect in self.current]
+        dirty = self.previous + current
+        # Overlaps are counted twice, which only makes the fallback kick in a little early
+        area = sum(rect.width * rect.height for rect in dirty)
+        self.last_dirty_area = area
+        full = self.full_redraw or area > self.full_threshold * screen_rect.width * screen_rect.height
+        if full:
+            pygame.display.flip()
+            self.full_frames += 1
+        else:
+            pygame.display.update(dirty)
+            self.partial_frames += 1
+        self.previous = current
+        self.current = []
+        self.full_redraw = False
+        return full
+
+    def stats(self):
+        return {
+            'full_frames': self.full_frames,
+            'partial_frames': self.partial_frames,
+            'last_dirty_area': self.last_dirty_area,
+        }
@@ -1,8 +1,13 @@
 import pygame
 import math
 import random
-from queue import PriorityQueue
 import player
+from sprite_cache import frame_cache
+from pathfinding import shared_path_finder
+from enemy_store import CONTACT_DAMAGE_RATE
+from projectiles import FACTION_ENEMY
+from render_queue import LAYER_ENTITIES
+from timestep import FIXED_DT, countdown, elapsed, lerp
 
 
 class StateMachine:
@@ -66,10 +71,13 @@ class ChaseState(AIState):
         elif distance > enemy.lose_aggro_range:
             return IdleState()
 
-        # Pathfinding logic
+        # Pathfinding logic: follow the shared flow field towards the player
+        target_x, target_y = enemy.chase_target(player)
+        dx, dy = target_x - enemy.x, target_y - enemy.y
+        distance = math.hypot(dx, dy)
         if distance >0 :
-            enemy.x += dx / distance * enemy.speed
-            enemy.y += dy / distance * enemy.speed
+            enemy.x += dx / distance * enemy.speed * FIXED_DT
+            enemy.y += dy / distance * enemy.speed * FIXED_DT
 
         return None
 
@@ -105,8 +113,8 @@ class TacticalRetreatState(AIState):
         tangent_x = -dy * self.retreat_direction
         tangent_y = dx * self.retreat_direction
 
-        enemy.x += tangent_x * enemy.speed
-        enemy.y += tangent_y * enemy.speed
+        enemy.x += tangent_x * enemy.speed * FIXED_DT
+        enemy.y += tangent_y * enemy.speed * FIXED_DT
 
         if enemy.health > enemy.max_health * 0.3:
             return ChaseState()
@@ -115,34 +123,32 @@ class TacticalRetreatState(AIState):
 
 
 class Enemy:
-    def __init__(self, x, y, speed, health, damage, acceptance_radius, scale=1):
-        self.x = x
-        self.y = y
-        self.speed = speed
-        self.health = health
+    # Set while the enemy is in an EnemyStore: x, y, health, ... then live in its arrays
+    # (see StoreBacked in enemy_store.py); otherwise they are plain attributes
+    _store = None
+    _slot = None
+
+    # Assets of an enemy type, declared on the class so they can be loaded before
+    # any enemy of the type is built (see assets.py)
+    SCALE = 1
+    SHEETS = []  # (action, sheet path, frame width, frame height, rows, cols)
+    PROJECTILE_IMAGE = None  # (path, size) of the projectile sprite, for enemies that shoot
+
+    def __init__(self, x, y, speed, health, damage, acceptance_radius, scale=None):
+        self.base_speed = speed  # Pixels per second
         self.max_health = health
-        self.damage = damage  # Damage per second
+        self.base_damage = damage  # Projectile damage; contact damage is CONTACT_DAMAGE_RATE * damage per second
         self.acceptance_radius = acceptance_radius  # Stop moving when within this distance
-        self.scale = scale
+        self.scale = self.SCALE if scale is None else scale
         self.frames = {}  # Dictionary to hold frames for different actions
-        self.current_action = 'idle'
-        self.previous_action = None  # Track previous action 
-        self.current_frame = 0
-        self.frame_timer = 0
-        self.frame_delay = 10  # Adjust for animation speed
-        self.look_right = True
-        ##For death
-        self.is_dead = False
-        self.is_taking_hit = False
-        self.hit_animation_timer = 0
-        self.death_animation_completed = False
-        self.ai_state = None
-        self.last_player_position = (0, 0)
+        self.flipped_frames = {}  # Same frames mirrored, used when facing left
+        self.draw_radius = 0  # Half the largest frame side, for camera culling
+        self.frame_delay = 1 / 12  # Seconds per animation frame
         self.lose_aggro_range = 500
-        self.attack_cooldown = 0
-        self.patrol_path = []
-        self.current_patrol_point = 0
         self.obstacle_map = None
+        self.obstacle_map_version = 0
+        self.flow_field = None  # Shared FlowField towards the player, set by the WaveManager
+        self.summoner = None  # Callback (enemy_type, x, y) that adds an enemy to the wave, set by the WaveManager
         self.fov = 120  # Field of view in degrees
 
         # Add AI states
@@ -152,25 +158,76 @@ class Enemy:
         self.state_machine.add_state('retreat', TacticalRetreatState())
 
         # Ranged attack properties
-        self.ranged_attack_cooldown = 0
         self.ranged_attack_range = 600  # Distance at which the enemy will use ranged attacks
-        self.projectile_speed = 10
-        self.projectiles = []  # List to store active projectiles
+        self.projectile_speed = 1200  # Pixels per second (the old 10 px per update, updated twice per tick)
+        self.projectile_range = 1500  # Pixels a projectile travels before it expires
+        self.projectile_system = None  # Shared ProjectileSystem, set by the WaveManager
+        if self.PROJECTILE_IMAGE is not None:
+            self.projectile_image = frame_cache.get_image(*self.PROJECTILE_IMAGE)
+
+        self.reset(x, y)
+
+    def reset(self, x, y):
+        """Puts the enemy back in its freshly spawned state at (x, y), so a pooled enemy can be reused.
+
+        Subclasses extend this with their own per-life state (timers, cooldowns);
+        it runs at the end of Enemy.__init__, before the subclass __init__ body.
+        """
+        self.x = x
+        self.y = y
+        # Position at the previous tick and the interpolated position drawn this frame
+        self.prev_x, self.prev_y = x, y
+        self.render_x, self.render_y = x, y
+        self.speed = self.base_speed
+        self.health = self.max_health
+        self.damage = self.base_damage
+        self.current_action = 'idle'
+        self.previous_action = None  # Track previous action 
+        self.current_frame = 0
+        self.frame_timer = 0  # Seconds since the animation frame last advanced
+        self.on_screen = True  # Cleared by the WaveManager while the camera culls this enemy
+        self.look_right = True
+        ##For death
+        self.is_dead = False
+        self.is_taking_hit = False
+        self.hit_animation_timer = 0  # Seconds
+        self.death_animation_completed = False
+        self.ai_state = None
+        self.state_machine.current_state = None
+        self.last_player_position = (0, 0)
+        self.attack_cooldown = 0  # Seconds
+        self.patrol_path = []
+        self.current_path = []  # Pixel waypoints from the last path request
+        self.current_patrol_point = 0
+        self.ranged_attack_cooldown = 0  # Seconds until the next shot
 
     def load_frame_sheet(self, sprite_file_path, frame_width, frame_height, rows, cols):
-        """Loads a sprite sheet and returns a list of frames."""
-        sprite_sheet = pygame.image.load(sprite_file_path).convert_alpha()
-        frames = []
-        for row in range(rows):
-            for col in range(cols):
-                frame = sprite_sheet.subsurface(
-                    (col * frame_width, row * frame_height, frame_width, frame_height)
-                )
-                scaled_frame = pygame.transform.scale(
-                    frame, (int(frame_width * self.scale), int(frame_height * self.scale))
-                )
-                frames.append(scaled_frame)
-        return frames
+        """Returns the list of frames for a sprite sheet from the shared frame cache."""
+        return frame_cache.get_frames(sprite_file_path, frame_width, frame_height,
+                                      rows, cols, self.scale).frames
+
+    @classmethod
+    def asset_keys(cls):
+        """Frame cache keys of every sheet (and the projectile image) this enemy type uses."""
+        sheets = [(path, frame_width, frame_height, rows, cols, cls.SCALE)
+                  for _, path, frame_width, frame_height, rows, cols in cls.SHEETS]
+        images = [cls.PROJECTILE_IMAGE] if cls.PROJECTILE_IMAGE is not None else []
+        return sheets, images
+
+    def load_frames(self):
+        """Registers the frames of every action listed in SHEETS."""
+        for action, sprite_file_path, frame_width, frame_height, rows, cols in self.SHEETS:
+            self.load_animation(action, sprite_file_path, frame_width, frame_height, rows, cols)
+
+    def load_animation(self, action, sprite_file_path, frame_width, frame_height, rows, cols):
+        """Registers the frames (and flipped frames) of a sprite sheet for an action."""
+        frame_set = frame_cache.get_frames(sprite_file_path, frame_width, frame_height,
+                                           rows, cols, self.scale)
+        self.frames[action] = frame_set.frames
+        self.flipped_frames[action] = frame_set.flipped
+        if frame_set.frames:
+            frame = frame_set.frames[0]
+            self.draw_radius = max(self.draw_radius, max(frame.get_width(), frame.get_height()) // 2)
 
     def take_damage(self, damage):
         if not self.is_dead:
@@ -186,12 +243,22 @@ class Enemy:
                 self.hit_animation_timer = len(
                     self.frames['takehit']) * self.frame_delay  # Adjust based on animation length
 
+    def save_previous_position(self):
+        """Remembers where the enemy was before this tick, for render interpolation."""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def interpolate(self, alpha):
+        """Sets the position to draw at, alpha of the way from the previous tick to this one."""
+        self.render_x = lerp(self.prev_x, self.x, alpha)
+        self.render_y = lerp(self.prev_y, self.y, alpha)
+
     def update(self, player):
-        """Update the enemy state, position, and check for collisions."""
+        """Advance the enemy by one fixed tick: state, position, and collisions."""
         if self.is_dead:
             # Complete death animation
-            self.frame_timer += 1
-            if self.frame_timer >= self.frame_delay:
+            self.frame_timer += FIXED_DT
+            if elapsed(self.frame_timer, self.frame_delay):
                 self.frame_timer = 0
                 if self.current_frame < len(self.frames['death']) - 1:
                     self.current_frame += 1
@@ -200,8 +267,8 @@ class Enemy:
             return  # Don't do anything else if dead
 
         if self.is_taking_hit:
-            self.frame_timer += 1
-            if self.frame_timer >= self.frame_delay:
+            self.frame_timer += FIXED_DT
+            if elapsed(self.frame_timer, self.frame_delay):
                 self.frame_timer = 0
                 if self.current_frame < len(self.frames['takehit']) - 1:
                     self.current_frame += 1
@@ -225,12 +292,18 @@ class Enemy:
             self.current_frame = 0  # Reset animation frame
             self.previous_action = self.current_action  # Update previous action
 
-        if distance > self.acceptance_radius:  # Move only if outside acceptance radius
-            dx /= distance
-            dy /= distance
+        # With the store backend, movement and contact damage run vectorized in EnemyStore.step_chase
+        if distance > self.acceptance_radius and self._store is None:  # Move only if outside acceptance radius
+            # Head for the next flow field cell (or straight at the player when close)
+            target_x, target_y = self.chase_target(player)
+            dx, dy = target_x - self.x, target_y - self.y
+            step_distance = (dx ** 2 + dy ** 2) ** 0.5
+            if step_distance > 0:
+                dx /= step_distance
+                dy /= step_distance
             # Move enemy towards player's center
-            self.x += dx * self.speed
-            self.y += dy * self.speed
+            self.x += dx * self.speed * FIXED_DT
+            self.y += dy * self.speed * FIXED_DT
 
             # Update direction only when moving
             if dx > 0:
@@ -238,30 +311,30 @@ class Enemy:
             elif dx < 0:
                 self.look_right = False
 
-        # Update animation frame
-        self.frame_timer += 1
-        if self.frame_timer >= self.frame_delay:
-            self.frame_timer = 0
-            if self.current_action in self.frames and len(self.frames[self.current_action]) > 0:
-                self.current_frame = (self.current_frame + 1) % len(self.frames[self.current_action])
+        # Update animation frame; looping animations are not advanced off screen, where nobody sees them
+        if self.on_screen:
+            self.frame_timer += FIXED_DT
+            if elapsed(self.frame_timer, self.frame_delay):
+                self.frame_timer = 0
+                if self.current_action in self.frames and len(self.frames[self.current_action]) > 0:
+                    self.current_frame = (self.current_frame + 1) % len(self.frames[self.current_action])
 
                 # Check collision with player
-        enemy_rect = pygame.Rect(self.x, self.y, 50, 50)
-        player_rect = pygame.Rect(player.x, player.y, 64, 64)
-        if enemy_rect.colliderect(player_rect):
-            player.health -= self.damage / 60  # Adjusting for per second damage
+        if self._store is None:
+            enemy_rect = pygame.Rect(self.x, self.y, 50, 50)
+            player_rect = pygame.Rect(player.x, player.y, 64, 64)
+            if enemy_rect.colliderect(player_rect):
+                player.health -= self.damage * CONTACT_DAMAGE_RATE * FIXED_DT
 
         # Decrement the ranged attack cooldown if it is active.
         if self.ranged_attack_cooldown > 0:
-            self.ranged_attack_cooldown -= 0.5
-
-        # Update projectiles
-        self.update_projectiles(player)
+            self.ranged_attack_cooldown = countdown(self.ranged_attack_cooldown)
 
     def has_line_of_sight(self, player):
-        # Convert positions to grid indices
-        x0, y0 = int(self.x // 16), int(self.y // 16)
-        x1, y1 = int(player.x // 16), int(player.y // 16)
+        # Convert positions to grid indices (relative to the obstacle map's origin cell, if it has one)
+        origin_x, origin_y = getattr(self.obstacle_map, 'origin', (0, 0))
+        x0, y0 = int(self.x // 16) - origin_x, int(self.y // 16) - origin_y
+        x1, y1 = int(player.x // 16) - origin_x, int(player.y // 16) - origin_y
 
         # Ensure x and y are within valid range
         max_x = len(self.obstacle_map[0]) - 1
@@ -277,98 +350,58 @@ class Enemy:
                     return False
         return True
 
+    def chase_target(self, player):
+        """Point to move towards when chasing: the next flow field cell, or the player itself."""
+        if self.flow_field is not None:
+            # Once in the player's cell (or next to it) go straight for the player
+            if (abs(self.x - player.x) >= self.flow_field.tile_size * 2 or
+                    abs(self.y - player.y) >= self.flow_field.tile_size * 2):
+                step = self.flow_field.next_step(self.x, self.y)
+                if step is not None:
+                    return step
+        return player.x, player.y
+
     def pathfind_to_player(self, player):
-        """A* pathfinding implementation with grid-based coordinates"""
+        """A* pathfinding to the player's cell, returned as pixel waypoints ([] if unreachable)"""
         # Convert pixel positions to grid coordinates
-        start_x = int(self.x // 16)
-        start_y = int(self.y // 16)
-        goal_x = int(player.x // 16)
-        goal_y = int(player.y // 16)
-        
-        start = (start_x, start_y)
-        goal = (goal_x, goal_y)
-        
-        frontier = PriorityQueue()
-        frontier.put(start, 0)
-        came_from = {}
-        cost_so_far = {}
-        came_from[start] = None
-        cost_so_far[start] = 0
-        
-        while not frontier.empty():
-            current = frontier.get()
-            
-            if current == goal:
-                break
-                
-            for next in self.get_neighbors(current):
-                new_cost = cost_so_far[current] + 1
-                if next not in cost_so_far or new_cost < cost_so_far[next]:
-                    cost_so_far[next] = new_cost
-                    priority = new_cost + self.heuristic(goal, next)
-                    frontier.put(next, priority)
-                    came_from[next] = current
-        
-        # Reconstruct path and convert back to pixel coordinates
-        path = []
-        current = goal
-        while current != start:
-            path.append((
-                current[0] * 16 + 16//2,
-                current[1] * 16 + 16//2
-            ))
-            current = came_from.get(current, start)  # Fallback to start if path not found
-        path.reverse()
-        return path
-    
-    def update_projectiles(self, player):
-        """Update the position of projectiles and check for collisions with the player."""
-        for projectile in self.projectiles[:]:
-            projectile['x'] += projectile['dx']
-            projectile['y'] += projectile['dy']
-
-            # Remove projectiles after they travel 1500 pixels from origin
-            distance_traveled = math.hypot(projectile['x'] - self.x, projectile['y'] - self.y)
-            if distance_traveled > 1500:
-                self.projectiles.remove(projectile)
-                continue
-
-            # Check collision with player
-            projectile_rect = pygame.Rect(projectile['x'], projectile['y'], 10, 10)
-            player_rect = pygame.Rect(player.x, player.y, 64, 64)
-            if projectile_rect.colliderect(player_rect):
-                player.health -= projectile['damage']
-                self.projectiles.remove(projectile)
+        start = (int(self.x // 16), int(self.y // 16))
+        goal = (int(player.x // 16), int(player.y // 16))
+
+        path = shared_path_finder.find_path(start, goal, self.obstacle_map, self.obstacle_map_version)
+        return self.cells_to_waypoints(path)
+
+    def cells_to_waypoints(self, path):
+        """Converts a list of grid cells to pixel cell centers ([] for no route)."""
+        if path is None:
+            return []  # No route: keep the caller from following a made-up path
+        return [(x * 16 + 16 // 2, y * 16 + 16 // 2) for x, y in path]
+
+    def receive_path(self, path):
+        """Callback for the PathScheduler when a requested path is ready."""
+        self.current_path = self.cells_to_waypoints(path)
+
+    def draw_path(self, surface, offset=(0, 0)):
+        """Debug view of the last planned path; offset is the camera's."""
+        if self.current_path:
+            offset_x, offset_y = offset
+            points = [(x - offset_x, y - offset_y) for x, y in [(self.x, self.y)] + self.current_path]
+            return pygame.draw.lines(surface, (255, 255, 0), False, points, 1)
+        return None
 
     def shoot_projectile(self, target_x, target_y):
         """Shoot a projectile towards specified coordinates with safety checks"""
-        if self.ranged_attack_cooldown <= 0:
-            # Calculate direction to target
-            dx = target_x - self.x
-            dy = target_y - self.y
-            distance = math.hypot(dx, dy)
-
-            # Prevent division by zero
-            if distance == 0:
+        if self.ranged_attack_cooldown <= 0 and self.projectile_system is not None:
+            # Projectiles are owned by the shared system, so they outlive this enemy
+            handle = self.projectile_system.spawn_towards(
+                self.x, self.y, target_x, target_y, self.projectile_speed, self.damage,
+                FACTION_ENEMY,
+                self.projectile_system.register_sprite(self.projectile_image, self.PROJECTILE_IMAGE),
+                self.projectile_range / self.projectile_speed)
+            if handle is None:
                 return  # Can't shoot if already at target position
 
-            # Normalize direction vector
-            dx /= distance
-            dy /= distance
-
-            # Create projectile dictionary
-            projectile = {
-                'x': self.x,
-                'y': self.y,
-                'dx': dx * self.projectile_speed,
-                'dy': dy * self.projectile_speed,
-                'damage': self.damage,
-                'image': self.projectile_image
-            }
-
-            # Add to projectiles list and reset cooldown to 2 seconds (120 frames)
-            self.projectiles.append(projectile)
-            self.ranged_attack_cooldown = 120  # 2 second cooldown at 60 FPS
+            # Reset cooldown
+            self.ranged_attack_cooldown = 2  # Seconds
 
     def update_behavior(self, player):
         """Default enemy behavior (to be overridden by subclasses)."""
@@ -410,42 +443,18 @@ class Enemy:
             self.shoot_projectile(self.x + dx*50, self.y + dy*50)
 
 
-    def draw(self, surface):
-        """Draw the enemy, handling boss rendering separately."""
+    def draw(self, render_queue):
+        """Submit the current frame to the render queue, ordered by the enemy's y. Shared by every enemy type."""
         if self.current_action not in self.frames:
             print(f"Warning: Missing animation frames for action '{self.current_action}' in {type(self).__name__}")
             return  # Skip drawing if frames are missing
 
-        sprite = self.frames[self.current_action][self.current_frame]
-
-        if not self.look_right:
-            sprite = pygame.transform.flip(sprite, True, False)
-        sprite_rect = sprite.get_rect(center=(self.x, self.y))
+        frames = self.frames if self.look_right else self.flipped_frames
+        sprite = frames[self.current_action][self.current_frame]
+        sprite_rect = sprite.get_rect(center=(self.render_x, self.render_y))
 
-        # Draw the sprite
-        surface.blit(sprite, sprite_rect.topleft)
-
-    def get_neighbors(self, pos):
-        """Get valid neighboring positions for pathfinding"""
-        x, y = pos
-        neighbors = [
-            (x + 1, y),  # Right
-            (x - 1, y),  # Left
-            (x, y + 1),  # Down
-            (x, y - 1)   # Up
-        ]
-        
-        # Filter valid neighbors within map bounds and not blocked
-        valid_neighbors = []
-        for nx, ny in neighbors:
-            if 0 <= nx < 44 and 0 <= ny < 44:
-                if not self.obstacle_map[ny][nx]:  # Note: obstacle_map is [y][x]
-                    valid_neighbors.append((nx, ny))
-        return valid_neighbors
-
-    def heuristic(self, a, b):
-        """Manhattan distance heuristic for A* pathfinding"""
-        return abs(a[0] - b[0]) + abs(a[1] - b[1])
+        # Drawn with every other entity in one blits() call when the queue is flushed
+        render_queue.submit(sprite, sprite_rect.topleft, LAYER_ENTITIES, self.render_y)
 
 
 class EnemySquad:
@@ -517,24 +526,30 @@ class EnemySwarm:
             if enemy.has_line_of_sight(player):
                 enemy.ranged_attack(player)
 
-# Basic enemy classes with their own load_frames functions
+# Basic enemy classes with their own sprite sheet specs
 class EvilWizard(Enemy):
+    SCALE = 1.5
+    PROJECTILE_IMAGE = ("Sprites/Sprites_Effect/Bullets/13.png", (30, 18))
+    SHEETS = [
+        ('attack1', "Sprites/Sprites_Enemy/Evil Wizard/Attack1.png", 250, 250, 1, 8),
+        ('attack2', "Sprites/Sprites_Enemy/Evil Wizard/Attack2.png", 250, 250, 1, 8),
+        ('death', "Sprites/Sprites_Enemy/Evil Wizard/Death.png", 250, 250, 1, 7),
+        ('idle', "Sprites/Sprites_Enemy/Evil Wizard/Idle.png", 250, 250, 1, 8),
+        ('run', "Sprites/Sprites_Enemy/Evil Wizard/Run.png", 250, 250, 1, 8),
+        ('takehit', "Sprites/Sprites_Enemy/Evil Wizard/Take hit.png", 250, 250, 1, 3),
+    ]
+
     def __init__(self, x, y):
-        super().__init__(x, y, speed=0.75, health=200, damage=2.5, acceptance_radius=10, scale=1.5)
-        self.projectile_image = pygame.image.load("Sprites/Sprites_Effect/Bullets/13.png").convert_alpha()
-        self.projectile_image = pygame.transform.scale(self.projectile_image, (30, 18))  # Adjust size as needed
+        super().__init__(x, y, speed=90, health=200, damage=2.5, acceptance_radius=10)
         self.ranged_attack_range = 600  # Even longer range for wizard
-        self.projectile_speed = 10  # Faster projectiles
+        self.projectile_speed = 1200  # Faster projectiles, pixels per second
+        self.minion_type = Goblin  # Summoned once the wizard drops below half health
+        self.minion_count = 3
         self.load_frames()
 
-    def load_frames(self):
-        """Load frames for each action of Evil Wizard."""
-        self.frames['attack1'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Evil Wizard/Attack1.png", 250, 250, 1, 8)
-        self.frames['attack2'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Evil Wizard/Attack2.png", 250, 250, 1, 8)
-        self.frames['death'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Evil Wizard/Death.png", 250, 250, 1, 7)
-        self.frames['idle'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Evil Wizard/Idle.png", 250, 250, 1, 8)
-        self.frames['run'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Evil Wizard/Run.png", 250, 250, 1, 8)
-        self.frames['takehit'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Evil Wizard/Take hit.png", 250, 250, 1, 3)
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.has_summoned = False
 
     def update_behavior(self, player):
         """Wizard Boss chase and attack when close."""
@@ -553,9 +568,9 @@ class EvilWizard(Enemy):
             # Advanced spell patterns
             if self.attack_cooldown <= 0:
                 self.cast_spread_spell(player)
-                self.attack_cooldown = 45
+                self.attack_cooldown = 0.375  # Seconds
             else:
-                self.attack_cooldown -= 1
+                self.attack_cooldown = countdown(self.attack_cooldown)
 
 
 
@@ -564,6 +579,14 @@ class EvilWizard(Enemy):
                 self.summon_minions()
                 self.has_summoned = True
 
+    def summon_minions(self):
+        """Calls minions into the wave in a ring around the wizard."""
+        if self.summoner is None:
+            return
+        for index in range(self.minion_count):
+            angle = 2 * math.pi * index / self.minion_count
+            self.summoner(self.minion_type, self.x + math.cos(angle) * 60, self.y + math.sin(angle) * 60)
+
     def cast_spread_spell(self, target):
         for angle in range(-30, 31, 15):
             dx = math.cos(math.radians(angle))
@@ -574,35 +597,24 @@ class EvilWizard(Enemy):
         """Calculate Euclidean distance to a target (player or object)."""
         return ((self.x - target.x) ** 2 + (self.y - target.y) ** 2) ** 0.5
 
-    def draw(self, surface):
-        """Draw the current frame of the enemy on the screen."""
-        if self.current_action not in self.frames:
-            print(f"Warning: Missing animation frames for action '{self.current_action}' in {type(self).__name__}")
-            return  # Skip drawing if frames are missing
-
-        sprite = self.frames[self.current_action][self.current_frame]
-
-        if not self.look_right:
-            sprite = pygame.transform.flip(sprite, True, False)
-        sprite_rect = sprite.get_rect(center=(self.x, self.y))
-
-        # Draw the sprite
-        surface.blit(sprite, sprite_rect.topleft)
-
 
 class FlyingEye(Enemy):
+    SCALE = 1
+    PROJECTILE_IMAGE = ("Sprites/Sprites_Effect/Bullets/29.png", (30, 18))
+    SHEETS = [
+        ('attack', "Sprites/Sprites_Enemy/Flying eye/Attack.png", 150, 150, 1, 8),
+        ('death', "Sprites/Sprites_Enemy/Flying eye/Death.png", 150, 150, 1, 4),
+        ('idle', "Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8),
+        ('takehit', "Sprites/Sprites_Enemy/Flying eye/Take Hit.png", 150, 150, 1, 4),
+    ]
+
     def __init__(self, x, y):
-        super().__init__(x, y, speed=0.75, health=100, damage=0.5, acceptance_radius=40, scale=1)
-        self.projectile_image = pygame.image.load("Sprites/Sprites_Effect/Bullets/29.png").convert_alpha()
-        self.projectile_image = pygame.transform.scale(self.projectile_image, (30, 18))  # Adjust size as needed
+        super().__init__(x, y, speed=90, health=100, damage=0.5, acceptance_radius=40)
         self.load_frames()
 
-    def load_frames(self):
-        """Load frames for each action of Flying Eye."""
-        self.frames['attack'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Attack.png", 150, 150, 1, 8)
-        self.frames['death'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Death.png", 150, 150, 1, 4)
-        self.frames['idle'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8)
-        self.frames['takehit'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Take Hit.png", 150, 150, 1, 4)
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.strafe_angle = 0  # Radians around the player, advancing at 1 radian per second
 
     def update_behavior(self, player):
         """Flying Eye chase and attack when close."""
@@ -620,7 +632,8 @@ class FlyingEye(Enemy):
             self.shoot_projectile(player.x, player.y)  # FIX: Pass (x, y) instead of player object
 
         # Circular strafing pattern
-        angle = pygame.time.get_ticks() * 0.001  # Continuous rotation
+        self.strafe_angle += FIXED_DT  # Continuous rotation
+        angle = self.strafe_angle
         radius = 150
 
         target_x = player.x + math.cos(angle) * radius
@@ -631,13 +644,13 @@ class FlyingEye(Enemy):
         move_distance = math.hypot(dx, dy)
 
         if move_distance > 10:
-            self.x += dx / move_distance * self.speed
-            self.y += dy / move_distance * self.speed
+            self.x += dx / move_distance * self.speed * FIXED_DT
+            self.y += dy / move_distance * self.speed * FIXED_DT
 
         # Predictive leading shots
         if self.attack_cooldown <= 0:
             self.predictive_shot(player)
-            self.attack_cooldown = 60
+            self.attack_cooldown = 0.5  # Seconds
 
 
     def predictive_shot(self, player):
@@ -668,38 +681,27 @@ class FlyingEye(Enemy):
     def distance_to(self, target):
         """Calculate Euclidean distance to a target (player or object)."""
         return ((self.x - target.x) ** 2 + (self.y - target.y) ** 2) ** 0.5
-    
-    def draw(self, surface):
-        """Draw the current frame of the enemy on the screen."""
-        super().draw(surface)
-        # Draw projectiles
-        for projectile in self.projectiles:
-            projectile_rect = pygame.Rect(projectile['x'], projectile['y'], 10, 10)
-
-            # Load the projectile image and animate it
-            rotated_projectile = pygame.transform.rotate(projectile['image'],
-                                                         -math.degrees(math.atan2(projectile['dy'], projectile['dx'])))
-            surface.blit(rotated_projectile, projectile_rect.topleft)
 
 
 # Similar classes for Goblin, Mushroom, and Skeleton
 class Goblin(Enemy):
+    SCALE = 1
+    SHEETS = [
+        ('attack', "Sprites/Sprites_Enemy/Goblin/Attack.png", 150, 150, 1, 8),
+        ('death', "Sprites/Sprites_Enemy/Goblin/Death.png", 150, 150, 1, 4),
+        ('idle', "Sprites/Sprites_Enemy/Goblin/Idle.png", 150, 150, 1, 4),
+        ('run', "Sprites/Sprites_Enemy/Goblin/Run.png", 150, 150, 1, 8),
+        ('takehit', "Sprites/Sprites_Enemy/Goblin/Take Hit.png", 150, 150, 1, 4),
+    ]
+
     def __init__(self, x, y):
-        super().__init__(x, y, speed=0.75, health=75, damage=1.5, acceptance_radius=30, scale=1)
+        super().__init__(x, y, speed=90, health=75, damage=1.5, acceptance_radius=30)
         self.load_frames()
     def distance_to(self, target):
         """Calculate Euclidean distance to a target (player or object)."""
         return ((self.x - target.x) ** 2 + (self.y - target.y) ** 2) ** 0.5
 
 
-    def load_frames(self):
-        """Load frames for each action of Goblin."""
-        self.frames['attack'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Goblin/Attack.png", 150, 150, 1, 8)
-        self.frames['death'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Goblin/Death.png", 150, 150, 1, 4)
-        self.frames['idle'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Goblin/Idle.png", 150, 150, 1, 4)
-        self.frames['run'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Goblin/Run.png", 150, 150, 1, 8)
-        self.frames['takehit'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Goblin/Take Hit.png", 150, 150, 1, 4)
-
     def update_behavior(self, player):
         """Goblins chase and attack when close."""
         distance = ((player.x - self.x) ** 2 + (player.y - self.y) ** 2) ** 0.5
@@ -711,18 +713,19 @@ class Goblin(Enemy):
 
 
 class Mushroom(Enemy):
+    SCALE = 2
+    SHEETS = [
+        ('attack', "Sprites/Sprites_Enemy/Mushroom/Attack.png", 150, 150, 1, 8),
+        ('death', "Sprites/Sprites_Enemy/Mushroom/Death.png", 150, 150, 1, 4),
+        ('idle', "Sprites/Sprites_Enemy/Mushroom/Idle.png", 150, 150, 1, 4),
+        ('run', "Sprites/Sprites_Enemy/Mushroom/Run.png", 150, 150, 1, 8),
+        ('takehit', "Sprites/Sprites_Enemy/Mushroom/Take Hit.png", 150, 150, 1, 4),
+    ]
+
     def __init__(self, x, y):
-        super().__init__(x, y, speed=1.25, health=200, damage=2.5, acceptance_radius=40, scale=2)
+        super().__init__(x, y, speed=150, health=200, damage=2.5, acceptance_radius=40)
         self.load_frames()
 
-    def load_frames(self):
-        """Load frames for each action of Mushroom."""
-        self.frames['attack'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Mushroom/Attack.png", 150, 150, 1, 8)
-        self.frames['death'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Mushroom/Death.png", 150, 150, 1, 4)
-        self.frames['idle'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Mushroom/Idle.png", 150, 150, 1, 4)
-        self.frames['run'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Mushroom/Run.png", 150, 150, 1, 8)
-        self.frames['takehit'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Mushroom/Take Hit.png", 150, 150, 1, 4)
-
     def update_behavior(self, player):
         """Mushrooms chase and attack when close."""
         distance = ((player.x - self.x) ** 2 + (player.y - self.y) ** 2) ** 0.5
@@ -734,24 +737,29 @@ class Mushroom(Enemy):
 
 
 class Skeleton(Enemy):
+    SCALE = 1
+    SHEETS = [
+        ('attack', "Sprites/Sprites_Enemy/Skeleton/Attack.png", 150, 150, 1, 8),
+        ('death', "Sprites/Sprites_Enemy/Skeleton/Death.png", 150, 150, 1, 4),
+        ('idle', "Sprites/Sprites_Enemy/Skeleton/Idle.png", 150, 150, 1, 4),
+        ('shield', "Sprites/Sprites_Enemy/Skeleton/Shield.png", 150, 150, 1, 4),
+        ('run', "Sprites/Sprites_Enemy/Skeleton/Walk.png", 150, 150, 1, 4),
+        ('takehit', "Sprites/Sprites_Enemy/Skeleton/Take Hit.png", 150, 150, 1, 4),
+    ]
+
     def __init__(self, x, y):
-        super().__init__(x, y, speed=1, health=100, damage=2, acceptance_radius=5, scale=1)
+        super().__init__(x, y, speed=120, health=100, damage=2, acceptance_radius=5)
         self.load_frames()
 
+        self.shield_duration = 1.5  # Seconds
+        self.shield_cooldown = 5  # Seconds
+
+    def reset(self, x, y):
+        super().reset(x, y)
         self.shield_active = False
-        self.shield_duration = 180
-        self.shield_cooldown = 600
         self.shield_timer = 0
         self.shield_cooldown_timer = 0
 
-    def load_frames(self):
-        self.frames['attack'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Skeleton/Attack.png", 150, 150, 1, 8)
-        self.frames['death'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Skeleton/Death.png", 150, 150, 1, 4)
-        self.frames['idle'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Skeleton/Idle.png", 150, 150, 1, 4)
-        self.frames['shield'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Skeleton/Shield.png", 150, 150, 1, 4)
-        self.frames['run'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Skeleton/Walk.png", 150, 150, 1, 4)
-        self.frames['takehit'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Skeleton/Take Hit.png", 150, 150, 1, 4)
-
     def take_damage(self, damage):
         if self.shield_active:
             return
@@ -768,15 +776,15 @@ class Skeleton(Enemy):
         distance = ((player.x - self.x) ** 2 + (player.y - self.y) ** 2) ** 0.5
 
         if self.shield_active:
-            self.shield_timer -= 1
+            self.shield_timer = countdown(self.shield_timer)
             if self.shield_timer <= 0:
                 self.shield_active = False
                 self.shield_cooldown_timer = self.shield_cooldown
             return
 
         if self.shield_cooldown_timer > 0:
-            self.shield_cooldown_timer -= 1
-        elif self.health < 50 and random.random() < 0.1:
+            self.shield_cooldown_timer = countdown(self.shield_cooldown_timer)
+        elif self.health < 50 and random.random() < 12 * FIXED_DT:  # About 12 tries per second
             self.activate_shield()
 
         new_action = 'run' if distance > 150 else 'idle' if distance > self.acceptance_radius else 'attack'
@@ -789,43 +797,48 @@ class Skeleton(Enemy):
 ## I have created MODIFIED Goblins() for Level 1 .
 ##
 class BigFlyingEye(Enemy):
+    SCALE = 3
+    PROJECTILE_IMAGE = ("Sprites/Sprites_Effect/Bullets/13.png", (60, 36))
+    SHEETS = [
+        ('attack', "Sprites/Sprites_Enemy/Flying eye/Attack.png", 150, 150, 1, 8),
+        ('death', "Sprites/Sprites_Enemy/Flying eye/Death.png", 150, 150, 1, 4),
+        ('idle', "Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8),
+        ('takehit', "Sprites/Sprites_Enemy/Flying eye/Take Hit.png", 150, 150, 1, 4),
+        ('charge', "Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8),
+        ('dash', "Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8),
+    ]
+
     def __init__(self, x, y):
-        super().__init__(x, y, speed=0.75, health=200, damage=4, acceptance_radius=100, scale=3)
-        self.projectile_image = pygame.image.load("Sprites/Sprites_Effect/Bullets/13.png").convert_alpha()
-        self.projectile_image = pygame.transform.scale(self.projectile_image, (60, 36))  # Adjust size as needed
+        super().__init__(x, y, speed=90, health=200, damage=4, acceptance_radius=100)
         self.load_frames()
 
         # Enhanced dash mechanics
-        self.dash_speed = 5  # Increased dash speed
-        self.dash_duration = 60
-        self.dash_cooldown = 60  # Reduced cooldown from 240 to 60
-        self.is_dashing = False
-        self.dash_invincibility = False
-        self.dash_vector = (0, 0)  # Initialize dash vector
+        self.dash_speed = 600  # Increased dash speed, pixels per second
 
         # New power: Energy Projection
-        self.energy_projectile_cooldown = 0
         self.max_energy_projectiles = 3
-        self.energy_projectiles = []
+        # Pixels per second: energy shots used to move 5 px per update, twice per tick
+        self.energy_projectile_speed = 600
 
         # Rage and survival mechanics
-        self.shield_count = 2
         self.rage_multiplier = 1.5
-        self.original_damage = self.damage
-        self.original_speed = self.speed
+        self.original_damage = self.base_damage
+        self.original_speed = self.base_speed
 
         # Teleport escape mechanism
-        self.teleport_cooldown = 0
         self.teleport_threshold = 0.4
 
-    def load_frames(self):
-        """Load frames for each action of Big Flying Eye."""
-        self.frames['attack'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Attack.png", 150, 150, 1, 8)
-        self.frames['death'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Death.png", 150, 150, 1, 4)
-        self.frames['idle'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8)
-        self.frames['takehit'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Take Hit.png", 150, 150, 1, 4)
-        self.frames['charge'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8)
-        self.frames['dash'] = self.load_frame_sheet("Sprites/Sprites_Enemy/Flying eye/Flight.png", 150, 150, 1, 8)
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.dash_duration = 0.5  # Seconds
+        self.dash_cooldown = 0.5  # Seconds, reduced from 2
+        self.is_dashing = False
+        self.dash_invincibility = False
+        self.dash_vector = (0, 0)  # Initialize dash vector
+        self.energy_projectile_cooldown = 0  # Seconds
+        self.energy_projectiles = []  # ProjectileSystem handles of this boss's energy projectiles
+        self.shield_count = 2
+        self.teleport_cooldown = 0  # Seconds
 
     def take_damage(self, damage):
         """Strategic damage taking with teleport escape."""
@@ -845,17 +858,18 @@ class BigFlyingEye(Enemy):
         """Teleport to a random location when critically wounded."""
         self.x += random.uniform(-200, 200)
         self.y += random.uniform(-200, 200)
-        self.teleport_cooldown = 300  # 5 second cooldown
+        self.save_previous_position()  # Jump instead of sliding across the screen
+        self.teleport_cooldown = 2.5  # Seconds
         self.dash_invincibility = True
-        self.dash_duration = 90  # Longer invincibility after teleport
+        self.dash_duration = 0.75  # Longer invincibility after teleport
 
     def start_dash(self, player):
         """Initiate a high-speed dash towards player."""
         if self.dash_cooldown <= 0:
             self.is_dashing = True
-            self.dash_duration = 60
+            self.dash_duration = 0.5
             self.dash_invincibility = True
-            self.dash_cooldown = 60  # Reduced cooldown
+            self.dash_cooldown = 0.5  # Reduced cooldown
 
             # Calculate dash vector
             dx = player.x - self.x
@@ -864,46 +878,23 @@ class BigFlyingEye(Enemy):
             self.dash_vector = (dx / distance * self.dash_speed, dy / distance * self.dash_speed)
 
     def create_energy_projectile(self, player):
+        # Only keep handles of energy projectiles that are still flying
+        self.energy_projectiles = [handle for handle in self.energy_projectiles
+                                   if self.projectile_system.is_alive(handle)]
         if self.energy_projectile_cooldown <= 0 and len(self.energy_projectiles) < self.max_energy_projectiles:
-            dx = player.x - self.x
-            dy = player.y - self.y
-            distance = math.sqrt(dx ** 2 + dy ** 2)
-
-            # Normalize direction
-            dx, dy = dx / distance, dy / distance
-
-            # Calculate angle for rotation
-            angle = math.degrees(math.atan2(dy, dx))
-            rotated_image = pygame.transform.rotate(self.projectile_image, -angle)
-
-            projectile = {
-                'x': self.x,
-                'y': self.y,
-                'dx': dx * 5,
-                'dy': dy * 5,
-                'damage': 10,
-                'image': rotated_image
-            }
-            self.energy_projectiles.append(projectile)
-            self.energy_projectile_cooldown = 180
+            handle = self.projectile_system.spawn_towards(
+                self.x, self.y, player.x, player.y, self.energy_projectile_speed, 10, FACTION_ENEMY,
+                self.projectile_system.register_sprite(self.projectile_image, self.PROJECTILE_IMAGE),
+                self.projectile_range / self.energy_projectile_speed)
+            if handle is None:
+                return
+            self.energy_projectiles.append(handle)
+            self.energy_projectile_cooldown = 1.5  # Seconds
 
     def update_energy_projectiles(self, player):
-        """Update and manage energy projectiles."""
+        """Update and manage energy projectiles (movement and hits run in the ProjectileSystem)."""
         if self.energy_projectile_cooldown > 0:
-            self.energy_projectile_cooldown -= 1
-
-        # Update existing projectiles
-        for projectile in self.energy_projectiles[:]:
-            projectile['x'] += projectile['dx']
-            projectile['y'] += projectile['dy']
-
-            # Check player collision
-            projectile_rect = pygame.Rect(projectile['x'], projectile['y'], 10, 10)
-            player_rect = pygame.Rect(player.x, player.y, 64, 64)
-
-            if projectile_rect.colliderect(player_rect):
-                player.health -= projectile['damage']
-                self.energy_projectiles.remove(projectile)
+            self.energy_projectile_cooldown = countdown(self.energy_projectile_cooldown)
 
     def update_behavior(self, player):
         """Advanced boss behavior with new mechanics."""
@@ -911,16 +902,16 @@ class BigFlyingEye(Enemy):
 
         # Reduced dash cooldown mechanics
         if self.dash_cooldown > 0:
-            self.dash_cooldown -= 1
+            self.dash_cooldown = countdown(self.dash_cooldown)
         if self.teleport_cooldown > 0:
-            self.teleport_cooldown -= 1
+            self.teleport_cooldown = countdown(self.teleport_cooldown)
 
         # Dash mechanics
         if self.is_dashing:
-            self.x += self.dash_vector[0]
-            self.y += self.dash_vector[1]
+            self.x += self.dash_vector[0] * FIXED_DT
+            self.y += self.dash_vector[1] * FIXED_DT
 
-            self.dash_duration -= 1
+            self.dash_duration = countdown(self.dash_duration)
             if self.dash_duration <= 0:
                 self.is_dashing = False
                 self.dash_invincibility = False
@@ -930,15 +921,15 @@ class BigFlyingEye(Enemy):
 
         # Strategic dash and projectile trigger
         if not self.is_dashing:
-            if distance < 300 and random.random() < 0.05:  # Increased dash probability
+            if distance < 300 and random.random() < 6 * FIXED_DT:  # Increased dash probability, ~6 tries per second
                 self.start_dash(player)
 
-            if distance < 400 and random.random() < 0.03:
+            if distance < 400 and random.random() < 3.6 * FIXED_DT:
                 self.create_energy_projectile(player)
 
         # Erratic movement
-        self.x += random.uniform(-0.5, 0.5)
-        self.y += random.uniform(-0.5, 0.5)
+        self.x += random.uniform(-60, 60) * FIXED_DT
+        self.y += random.uniform(-60, 60) * FIXED_DT
 
         # Determine action and movement
         if distance > 300:
@@ -959,32 +950,24 @@ class BigFlyingEye(Enemy):
         # Look direction
         self.look_right = player.x > self.x
 
-    def draw(self, surface):
-        """Draw the enemy and its energy projectiles."""
-        # Draw the boss
-        super().draw(surface)
-
-        # Draw energy projectiles
-        for projectile in self.energy_projectiles:
-            surface.blit(projectile['image'],
-                         (projectile['x'] - projectile['image'].get_width() // 2,
-                          projectile['y'] - projectile['image'].get_height() // 2))
-
 
 class DashingGoblin(Goblin):
-    def __init__(self, x, y, speed=1, health=200, damage=1.5, acceptance_radius=30, scale=1):
+    def __init__(self, x, y, speed=120, health=200, damage=1.5, acceptance_radius=30, scale=1):
         super().__init__(x, y)
-        self.dash_cooldown = 3 * 60  # 3 seconds at 60 FPS
-        self.dash_timer = 0
-        self.is_dashing = False
-        self.dash_duration = 1 * 60  # 1 second dash duration
+        self.dash_cooldown = 1.5  # Seconds between dashes
+        self.dash_duration = 0.5  # Seconds
         self.dash_speed_multiplier = 3  # 3x speed during dash
+
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.dash_timer = 0  # Seconds since the last dash ended
+        self.is_dashing = False
         self.dash_direction = (0, 0)
 
     def update_behavior(self, player):
         """Dashing Goblin chase and periodically dash at player."""
         # Dash cooldown and timer management
-        self.dash_timer += 1
+        self.dash_timer += FIXED_DT
 
         # Calculate distance to player
         distance = ((player.x - self.x) ** 2 + (player.y - self.y) ** 2) ** 0.5
@@ -992,16 +975,16 @@ class DashingGoblin(Goblin):
         # Determine action based on distance and dash state
         if self.is_dashing:
             # During dash, move in dash direction at high speed
-            self.x += self.dash_direction[0] * self.speed * self.dash_speed_multiplier
-            self.y += self.dash_direction[1] * self.speed * self.dash_speed_multiplier
+            self.x += self.dash_direction[0] * self.speed * self.dash_speed_multiplier * FIXED_DT
+            self.y += self.dash_direction[1] * self.speed * self.dash_speed_multiplier * FIXED_DT
 
             # End dash after duration
-            if self.dash_timer >= self.dash_cooldown + self.dash_duration:
+            if elapsed(self.dash_timer, self.dash_cooldown + self.dash_duration):
                 self.is_dashing = False
                 self.dash_timer = 0
 
             new_action = 'idle'  # Use 'idle' as a fallback if 'run' is not available
-        elif self.dash_timer >= self.dash_cooldown:
+        elif elapsed(self.dash_timer, self.dash_cooldown):
             # Initiate dash towards player
             self.is_dashing = True
 
@@ -1024,41 +1007,20 @@ class DashingGoblin(Goblin):
             self.current_frame = 0
 
 
-    def draw(self, surface):
-        """Draw the current frame of the enemy on the screen."""
-        if self.current_action not in self.frames:
-            print(f"Warning: Missing animation frames for action '{self.current_action}' in {type(self).__name__}")
-            return  # Skip drawing if frames are missing
-
-        sprite = self.frames[self.current_action][self.current_frame]
-
-        if not self.look_right:
-            sprite = pygame.transform.flip(sprite, True, False)
-        sprite_rect = sprite.get_rect(center=(self.x, self.y))
-
-        # Draw the sprite
-        surface.blit(sprite, sprite_rect.topleft)
-
-        # Draw projectiles
-        for projectile in self.projectiles:
-            projectile_rect = pygame.Rect(projectile['x'], projectile['y'], 10, 10)
-
-            # Load the projectile image and animate it
-            rotated_projectile = pygame.transform.rotate(projectile['image'],
-                                                         -math.degrees(math.atan2(projectile['dy'], projectile['dx'])))
-            surface.blit(rotated_projectile, projectile_rect.topleft)
-            
-
 class TeleportingMushroom(Mushroom):
 
     def __init__(self, x, y):
             super().__init__(x, y)
-            self.teleport_timer = 0
+            self.teleport_interval = 5 / 3  # Seconds between teleports
+
+    def reset(self, x, y):
+        super().reset(x, y)
+        self.teleport_timer = 0  # Seconds
 
     def update(self, player):
         super().update(player)
-        self.teleport_timer += 1
-        if self.teleport_timer > 200:
+        self.teleport_timer += FIXED_DT
+        if elapsed(self.teleport_timer, self.teleport_interval):
             self.teleport(player)
             self.teleport_timer = 0
 
@@ -1066,3 +1028,4 @@ class TeleportingMushroom(Mushroom):
         """Teleport to a random position."""
         self.x = player.x + random.randint(5, 50)
         self.y = player.y + random.randint(5, 30)
+        self.save_previous_position()  # Jump instead of sliding across the screen
@@ -0,0 +1,70 @@
+#Code for reusing enemy objects across spawns and waves
+from collections import defaultdict
+
+
+class EnemyPool:
+    """Per-archetype free lists of enemies that finished dying.
+
+    acquire() hands out a released enemy of the requested type after
+    Enemy.reset(), and only constructs a new one (loading its frames and AI
+    states) when none is free. Enemies go back with release() once their death
+    animation has played, so a long game settles at the largest number of each
+    type alive at once and stops allocating enemies.
+    """
+    def __init__(self):
+        self.free = defaultdict(list)  # Enemy type -> released enemies ready for reuse
+        self.active = defaultdict(int)  # Enemy type -> enemies handed out and not yet released
+        self.created = defaultdict(int)
+        self.reused = defaultdict(int)
+
+    def acquire(self, enemy_type, x, y):
+        """Returns an enemy of enemy_type at (x, y), reused if one is free."""
+        free = self.free[enemy_type]
+        if free:
+            enemy = free.pop()
+            enemy.reset(x, y)
+            self.reused[enemy_type] += 1
+        else:
+            enemy = enemy_type(x, y)
+            self.created[enemy_type] += 1
+        self.active[enemy_type] += 1
+        return enemy
+
+    def release(self, enemy):
+        """Returns an enemy that is no longer in play; it must not be updated or drawn afterwards."""
+        enemy_type = type(enemy)
+        self.free[enemy_type].append(enemy)
+        self.active[enemy_type] -= 1
+
+    def reserve(self, enemy_type, count, limit=None):
+        """Builds free enemies until `count` of enemy_type are free (at most `limit` now). Returns how many were built."""
+        free = self.free[enemy_type]
+        built = 0
+        while len(free) < count and (limit is None or built < limit):
+            free.append(enemy_type(0, 0))
+            self.created[enemy_type] += 1
+            built += 1
+        return built
+
+    def discard(self, enemy_type):
+        """Forgets the free enemies of a type (e.g. to let its frames be freed). Returns how many there were."""
+        return len(self.free.pop(enemy_type, ()))
+
+    def stats(self):
+        """Occupancy per enemy type name: free, active, created and reused counts."""
+        types = set(self.free) | set(self.active) | set(self.created)
+        return {
+            enemy_type.__name__: {
+                'free': len(self.free[enemy_type]),
+                'active': self.active[enemy_type],
+                'created': self.created[enemy_type],
+                'reused': self.reused[enemy_type],
+            }
+            for enemy_type in sorted(types, key=lambda enemy_type: enemy_type.__name__)
+        }
+
+    def clear(self):
+        self.free.clear()
+        self.active.clear()
+        self.created.clear()
+        self.reused.clear()
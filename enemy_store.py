@@ -0,0 +1,263 @@
+#Code for the struct-of-arrays enemy storage backend
+import numpy as np
+
+from timestep import FIXED_DT
+
+# Bits of the per-enemy state array
+STATE_DEAD = 1
+STATE_TAKING_HIT = 2
+
+# Contact damage per second, as a multiple of an enemy's damage
+CONTACT_DAMAGE_RATE = 2
+
+# Enemy attributes that live in the store's arrays while an enemy is stored
+STORED_ATTRIBUTES = ('x', 'y', 'speed', 'health', 'damage', 'acceptance_radius', 'look_right',
+                     'is_dead', 'is_taking_hit')
+
+
+class StoreField:
+    """Attribute read from and written to the enemy's slot in its EnemyStore's arrays (see StoreBacked)."""
+    def __init__(self, cast=float):
+        self.cast = cast
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        return self.cast(enemy._store.arrays[self.name][enemy._slot])
+
+    def __set__(self, enemy, value):
+        enemy._store.arrays[self.name][enemy._slot] = value
+
+
+class StoreFlag:
+    """Boolean attribute kept as one bit of the store's state array (is_dead, is_taking_hit)."""
+    def __init__(self, bit):
+        self.bit = bit
+
+    def __get__(self, enemy, owner=None):
+        if enemy is None:
+            return self
+        return bool(enemy._store.state[enemy._slot] & self.bit)
+
+    def __set__(self, enemy, value):
+        if value:
+            enemy._store.state[enemy._slot] |= self.bit
+        else:
+            enemy._store.state[enemy._slot] &= ~self.bit
+
+
+class StoreBacked:
+    """Mixin that makes an enemy a thin view onto its slot in an EnemyStore.
+
+    Only enemies in a store get it: EnemyStore.add() switches the enemy to a
+    subclass of its type with this mixin in front, and remove() switches it
+    back, so enemies outside a store (the default) keep plain instance
+    attributes and pay nothing for the descriptors.
+    """
+    x = StoreField()
+    y = StoreField()
+    speed = StoreField()
+    health = StoreField()
+    damage = StoreField()
+    acceptance_radius = StoreField()
+    look_right = StoreField(bool)
+    is_dead = StoreFlag(STATE_DEAD)
+    is_taking_hit = StoreFlag(STATE_TAKING_HIT)
+
+
+_stored_classes = {}  # Enemy type -> its StoreBacked subclass
+
+
+def stored_class(enemy_type):
+    """The StoreBacked subclass of an enemy type, made on first use. It keeps the type's name."""
+    stored = _stored_classes.get(enemy_type)
+    if stored is None:
+        stored = type(enemy_type.__name__, (StoreBacked, enemy_type), {
+            '__module__': enemy_type.__module__,
+            '__qualname__': enemy_type.__qualname__,
+            'plain_class': enemy_type,
+        })
+        _stored_classes[enemy_type] = stored
+    return stored
+
+
+class EnemyStore:
+    """Keeps position, velocity, speed, health and state of all enemies in NumPy arrays.
+
+    Chase movement and contact damage then run as one vectorized pass over every
+    living enemy instead of once per enemy object.
+    """
+    # name -> dtype of the arrays behind the StoreField attributes of StoreBacked
+    FIELDS = {
+        'x': 'f8',
+        'y': 'f8',
+        'speed': 'f8',
+        'health': 'f8',
+        'damage': 'f8',
+        'acceptance_radius': 'f8',
+        'look_right': '?',
+    }
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.arrays = {name: np.zeros(capacity, dtype=dtype) for name, dtype in self.FIELDS.items()}
+        self.vx = np.zeros(capacity)  # Last chase velocity, in pixels per second
+        self.vy = np.zeros(capacity)
+        self.state = np.zeros(capacity, dtype=np.int8)
+        self.used = np.zeros(capacity, dtype=np.bool_)
+        self.size = 0  # Slots below this index have been handed out at least once
+        self.free_slots = []
+        self.enemies = [None] * capacity
+        self._flow_table = None
+        self._flow_table_key = None
+
+    def __len__(self):
+        return self.size - len(self.free_slots)
+
+    def add(self, enemy):
+        """Moves an enemy's fields into the arrays and makes the enemy a view onto its slot."""
+        if enemy._store is not None:
+            return
+        if self.free_slots:
+            slot = self.free_slots.pop()
+        else:
+            if self.size == self.capacity:
+                self._grow()
+            slot = self.size
+            self.size += 1
+
+        for name in self.FIELDS:
+            self.arrays[name][slot] = getattr(enemy, name)
+        state = 0
+        if enemy.is_dead:
+            state |= STATE_DEAD
+        if enemy.is_taking_hit:
+            state |= STATE_TAKING_HIT
+        self.state[slot] = state
+        self.vx[slot] = 0
+        self.vy[slot] = 0
+        self.used[slot] = True
+        self.enemies[slot] = enemy
+        # The arrays hold these now; the copies on the object would only go stale
+        for name in STORED_ATTRIBUTES:
+            enemy.__dict__.pop(name, None)
+        enemy._store = self
+        enemy._slot = slot
+        enemy.__class__ = stored_class(type(enemy))
+
+    def remove(self, enemy):
+        """Copies the fields back onto the enemy object and frees its slot."""
+        if enemy._store is not self:
+            return
+        slot = enemy._slot
+        values = {name: getattr(enemy, name) for name in self.FIELDS}
+        is_dead = enemy.is_dead
+        is_taking_hit = enemy.is_taking_hit
+        enemy.__class__ = enemy.plain_class
+        enemy._store = None
+        enemy._slot = None
+        for name, value in values.items():
+            setattr(enemy, name, value)
+        enemy.is_dead = is_dead
+        enemy.is_taking_hit = is_taking_hit
+
+        self.used[slot] = False
+        self.enemies[slot] = None
+        self.free_slots.append(slot)
+
+    def clear(self):
+        for enemy in list(self.enemies[:self.size]):
+            if enemy is not None:
+                self.remove(enemy)
+        self.size = 0
+        self.free_slots = []
+
+    def _grow(self):
+        new_capacity = self.capacity * 2
+        for name, array in self.arrays.items():
+            grown = np.zeros(new_capacity, dtype=array.dtype)
+            grown[:self.capacity] = array
+            self.arrays[name] = grown
+        for name in ('vx', 'vy', 'state', 'used'):
+            array = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=array.dtype)
+            grown[:self.capacity] = array
+            setattr(self, name, grown)
+        self.enemies.extend([None] * (new_capacity - self.capacity))
+        self.capacity = new_capacity
+
+    def _flow_targets(self, flow_field):
+        """Next cell index towards the goal for every cell, as an array (-1 where there is none)."""
+        key = (id(flow_field), flow_field.rebuild_count)
+        if self._flow_table_key != key:
+            self._flow_table = np.array(flow_field.next_cell_table(), dtype=np.int64)
+            self._flow_table_key = key
+        return self._flow_table
+
+    def step_chase(self, player, flow_field=None):
+        """Moves every active enemy towards the player and applies contact damage, vectorized.
+
+        Matches the per-object Enemy.update: enemies outside their acceptance radius
+        move `speed` pixels per second towards the next flow field cell (or straight
+        at the player when within two tiles), and every enemy whose 50x50 box
+        overlaps the player's 64x64 box deals CONTACT_DAMAGE_RATE * damage per second.
+        """
+        size = self.size
+        if size == 0:
+            return
+        active = np.flatnonzero(self.used[:size] & (self.state[:size] == 0))
+        if active.size == 0:
+            return
+
+        arrays = self.arrays
+        x = arrays['x'][active]
+        y = arrays['y'][active]
+        player_x, player_y = player.x, player.y
+        distance = np.hypot(player_x - x, player_y - y)
+        moving = distance > arrays['acceptance_radius'][active]
+
+        target_x = np.full(active.size, float(player_x))
+        target_y = np.full(active.size, float(player_y))
+        if flow_field is not None and flow_field.goal is not None:
+            tile_size = flow_field.tile_size
+            # Cells relative to the flow field's obstacle map, which may start anywhere in the world
+            cell_x = np.floor_divide(x, tile_size).astype(np.int64) - flow_field.origin_x
+            cell_y = np.floor_divide(y, tile_size).astype(np.int64) - flow_field.origin_y
+            use_field = ((np.abs(x - player_x) >= tile_size * 2) | (np.abs(y - player_y) >= tile_size * 2)) & \
+                (cell_x >= 0) & (cell_x < flow_field.width) & (cell_y >= 0) & (cell_y < flow_field.height)
+            next_cell = np.full(active.size, -1, dtype=np.int64)
+            next_cell[use_field] = self._flow_targets(flow_field)[
+                cell_y[use_field] * flow_field.width + cell_x[use_field]]
+            has_step = next_cell >= 0
+            target_x[has_step] = (next_cell[has_step] % flow_field.width + flow_field.origin_x) * tile_size + \
+                tile_size / 2
+            target_y[has_step] = (next_cell[has_step] // flow_field.width + flow_field.origin_y) * tile_size + \
+                tile_size / 2
+
+        step_x = target_x - x
+        step_y = target_y - y
+        step_distance = np.hypot(step_x, step_y)
+        step_distance[step_distance == 0] = 1
+        scale = np.where(moving, arrays['speed'][active] / step_distance, 0)
+        vx = step_x * scale
+        vy = step_y * scale
+        x += vx * FIXED_DT
+        y += vy * FIXED_DT
+        arrays['x'][active] = x
+        arrays['y'][active] = y
+        self.vx[active] = vx
+        self.vy[active] = vy
+
+        # Facing only changes while moving sideways
+        look_right = arrays['look_right'][active]
+        look_right[vx > 0] = True
+        look_right[vx < 0] = False
+        arrays['look_right'][active] = look_right
+
+        # Contact damage: enemy box (x, y, 50, 50) against player box (px, py, 64, 64)
+        touching = (x < player_x + 64) & (x + 50 > player_x) & (y < player_y + 64) & (y + 50 > player_y)
+        if touching.any():
+            player.health -= float(arrays['damage'][active][touching].sum()) * CONTACT_DAMAGE_RATE * FIXED_DT
@@ -0,0 +1,131 @@
+#Code for keeping the enemy frame sets in the frame cache within a memory budget
+from collections import OrderedDict
+from sprite_cache import frame_cache
+
+
+def archetype_keys(enemy_type):
+    """Frame cache keys of every sheet and image an enemy type uses, without repeats."""
+    sheets, images = enemy_type.asset_keys()
+    return set(sheets) | set(images)
+
+
+class FrameBudget:
+    """Caps the bytes the frame cache holds by evicting whole enemy archetypes, least recently used first.
+
+    An archetype is an enemy type together with the frame sets and images its
+    asset_keys() lists. set_waves() marks the types of the current and next
+    wave as in use, and touch() marks a type as just spawned (summoned minions
+    included). When the cache holds more than budget_bytes, enforce() evicts
+    the other types in LRU order, skipping types with enemies still alive and
+    keys shared with a type in use, until it is back under budget. Free pooled
+    enemies of an evicted type are dropped too, since they keep its frames
+    alive. If what is in use alone exceeds the budget, enforce() records it
+    in overruns and overrun_bytes, and report() describes it, so going over
+    is never silent. A budget of None only keeps the accounting.
+
+    The budget covers all the sprite memory the cache keeps loaded (frames,
+    bundle pages and atlas pages, see FrameCache) for everything in it
+    (player, weapons, tiles...) but only enemy frames are ever evicted; an evicted type loads again on demand
+    or through the asset prefetcher when a later wave needs it.
+    """
+    def __init__(self, budget_bytes=None, cache=frame_cache, pool=None):
+        self.budget_bytes = budget_bytes
+        self.cache = cache
+        self.pool = pool  # EnemyPool whose free enemies of evicted types are dropped
+        self.recent = OrderedDict()  # Enemy type -> None, least recently used first
+        self.known = set()  # Every type seen, for resident()
+        self.in_use = set()
+        self.evicted_types = 0
+        self.evicted_bytes = 0
+        self.overruns = 0  # enforce() calls that could not get under budget
+        self.overrun_bytes = 0  # How far over budget the last enforce() left the cache
+        self.reported_bytes = 0  # overrun_bytes at the last report()
+
+    def touch(self, enemy_type):
+        """Marks an enemy type as just used."""
+        recent = self.recent
+        if enemy_type in recent:
+            recent.move_to_end(enemy_type)
+        else:
+            recent[enemy_type] = None
+            self.known.add(enemy_type)
+
+    def set_waves(self, *waves):
+        """Pins the enemy types of the given wave table entries (None entries are skipped)."""
+        self.in_use = {enemy_type for wave in waves if wave is not None for enemy_type, _, _ in wave['enemies']}
+        for enemy_type in self.in_use:
+            self.touch(enemy_type)
+
+    def _alive(self, enemy_type):
+        return self.pool is not None and self.pool.active.get(enemy_type, 0) > 0
+
+    def enforce(self):
+        """Evicts unused archetypes until the cache fits the budget. Returns the bytes freed."""
+        cache = self.cache
+        self.overrun_bytes = 0
+        if self.budget_bytes is None or cache.resident_bytes <= self.budget_bytes:
+            return 0
+        keep = set()
+        for enemy_type in self.recent:
+            if enemy_type in self.in_use or self._alive(enemy_type):
+                keep |= archetype_keys(enemy_type)
+
+        freed = 0
+        for enemy_type in list(self.recent):
+            if cache.resident_bytes <= self.budget_bytes:
+                break
+            if enemy_type in self.in_use or self._alive(enemy_type):
+                continue
+            type_freed = 0
+            for key in archetype_keys(enemy_type):
+                if key not in keep:
+                    type_freed += cache.evict(key)
+            if self.pool is not None:
+                self.pool.discard(enemy_type)
+            del self.recent[enemy_type]
+            if type_freed:
+                self.evicted_types += 1
+                freed += type_freed
+        self.evicted_bytes += freed
+
+        if cache.resident_bytes > self.budget_bytes:
+            # Everything left is needed now or next: record it rather than evict frames about to be drawn
+            self.overruns += 1
+            self.overrun_bytes = cache.resident_bytes - self.budget_bytes
+        return freed
+
+    def report(self):
+        """A message about the overrun the last enforce() left, or None if there is none or it was already reported."""
+        if self.overrun_bytes == self.reported_bytes:
+            return None
+        self.reported_bytes = self.overrun_bytes
+        if not self.overrun_bytes:
+            return None
+        in_use = ", ".join(sorted(enemy_type.__name__ for enemy_type in self.in_use))
+        return (f"Frame budget exceeded: {self.cache.resident_bytes / 2 ** 20:.1f} MB resident for a "
+                f"{self.budget_bytes / 2 ** 20:.1f} MB budget; in use: {in_use}")
+
+    def resident(self):
+        """Memory each known enemy type keeps loaded through the cache, by class name.
+
+        That is its frames, the bundle pages under them and the atlas pages
+        they come from (see FrameCache.footprint). Keys and pages shared
+        between types (e.g. a subclass reusing its parent's sheets) count for
+        each of them, so the values can add up to more than the cache holds.
+        """
+        cache = self.cache
+        return {
+            enemy_type.__name__: cache.footprint(archetype_keys(enemy_type))
+            for enemy_type in sorted(self.known, key=lambda enemy_type: enemy_type.__name__)
+        }
+
+    def stats(self):
+        return {
+            'budget_bytes': self.budget_bytes,
+            'resident_bytes': self.cache.resident_bytes,
+            'evicted_types': self.evicted_types,
+            'evicted_bytes': self.evicted_bytes,
+            'overruns': self.overruns,
+            'overrun_bytes': self.overrun_bytes,
+            'resident_by_type': self.resident(),
+        }
@@ -1,39 +1,61 @@
 import pygame
+import os
 import sys
+import time
 import random
+from collections import defaultdict
 from player import Player
 from enemy import FlyingEye, Goblin, Mushroom, Skeleton, EvilWizard, BigFlyingEye, DashingGoblin,EnemySwarm, TeleportingMushroom
 from weapon import WeaponManager
-
-# Initialize Pygame
-pygame.init()
+from sprite_cache import frame_cache
+from tilemap import TileMap, TileMapLayer
+from camera import Camera
+from dirty_rects import DirtyRectTracker
+from render_queue import RenderQueue
+from spatial_hash import SpatialHash
+from pathfinding import FlowField, PathScheduler, shared_path_finder
+from enemy_store import EnemyStore
+from spawn_scheduler import SpawnScheduler
+from enemy_pool import EnemyPool
+from frame_budget import FrameBudget
+from assets import AssetManager
+from asset_bundle import AssetBundle
+from atlas import TextureAtlas
+from projectiles import ProjectileSystem
+from timestep import FIXED_DT, FixedTimestep
+from profiler import Profiler, null_profiler
+from perf_overlay import PerfOverlay
+from text_cache import text_cache
 
 # Screen Dimensions
 TILE_SIZE = 16
+SCREEN_WIDTH = TILE_SIZE * 44
+SCREEN_HEIGHT = TILE_SIZE * 44
+# World dimensions: one screen by default, GameSession(grid_size=...) makes the world larger
 GRID_SIZE = 44
 MAP_WIDTH = TILE_SIZE * GRID_SIZE
 MAP_HEIGHT = TILE_SIZE * GRID_SIZE
+# Enemies path over this many tiles around the player; larger worlds move the window along with them
+OBSTACLE_WINDOW = 48
+OBSTACLE_WINDOW_STEP = 16  # The window moves in whole steps of this many tiles
+
+# Frame cache memory above which enemy types not in the current or next wave are evicted
+# (all the enemy types together keep about 115 MB loaded from the bundle or the PNGs, and
+# about 140 MB with their atlas pages); None never evicts
+FRAME_BUDGET_MB = 96
 
 # Colors
 WHITE = (255, 255, 255)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 
-# Load tile and map resources
-DESERT_TILE = pygame.image.load("Sprites/Sprites_Environment/desert_tile.png")  # Use forward slashes
-DESERT_TILE = pygame.transform.scale(DESERT_TILE, (TILE_SIZE, TILE_SIZE))  # Resize tile to 16x16
-
-# Set up display
-screen = pygame.display.set_mode((MAP_WIDTH, MAP_HEIGHT))
-pygame.display.set_caption("SwarmShot by IIITA")
+# Font sizes (fonts are loaded once by text_cache)
+WAVE_FONT_SIZE = 36
+GAME_OVER_FONT_SIZE = 72
+HEALTH_FONT_SIZE = 18
 
-# Clock for controlling frame rate
-clock = pygame.time.Clock()
-
-# Load Player
-player = Player(MAP_WIDTH // 2, MAP_HEIGHT // 2)
-
-weapon_manager = WeaponManager()
+# Key state with nothing pressed, used when a headless session is stepped without input
+NO_KEYS = defaultdict(bool)
 
 # Define Enemy Wave Data
 waves = [
@@ -70,130 +92,299 @@ waves = [
 
 
 class WaveManager:
-    def __init__(self):
+    def __init__(self, player, projectile_system, use_enemy_store=False, wave_table=None, profiler=null_profiler,
+                 assets=None, grid_size=GRID_SIZE, tilemap=None, frame_budget_bytes=None):
+        self.player = player
+        self.grid_size = grid_size  # World size in tiles
+        # Rocks and huts of the world block line of sight and pathfinding
+        self.tilemap = tilemap if tilemap is not None else TileMap(grid_size, grid_size)
+        self.projectile_system = projectile_system
+        self.waves = waves if wave_table is None else wave_table
+        self.profiler = profiler  # Times the AI and pathfinding phases of update()
+        self.assets = assets  # Optional AssetManager that loads the next wave's sheets during the cooldown
         self.wave_index = 0
         self.enemies = []
-        self.spawn_timer = 0
+        self.enemy_pool = EnemyPool()  # Dead enemies are reset and reused by later spawns
+        # Tracks the frame memory of each enemy type and evicts types no wave needs soon
+        self.frame_budget = FrameBudget(frame_budget_bytes, pool=self.enemy_pool)
+        # Releases each wave's enemies at their spawn_rate
+        self.spawn_scheduler = SpawnScheduler(TILE_SIZE, pool=self.enemy_pool)
+        self.summoned = []  # Enemies summoned during this tick's AI pass, added after it
+        self.time = 0  # Simulated seconds since the session started
         self.wave_message = ""
-        self.message_timer = 0
+        self.message_timer = 0  # Simulated time the current wave message appeared
         self.time_between_waves = 5  # Time in seconds between waves
         self.wave_completed = False
-        self.wave_cooldown = 0
+        self.wave_cooldown = 0  # Simulated time the last wave was cleared
         self.squads = []  # Added for squad management
-        self.obstacle_map = [[False for _ in range(GRID_SIZE)]
-                           for _ in range(GRID_SIZE)]  # For pathfinding
-    def _generate_obstacle_map(self):
-        """Generates an obstacle map for enemy pathfinding (placeholder implementation)."""
-        for y in range(GRID_SIZE):
-            for x in range(GRID_SIZE):
-                # Example: Mark edges as obstacles (modify as needed)
-                if x == 0 or y == 0 or x == GRID_SIZE - 1 or y == GRID_SIZE - 1:
-                    self.obstacle_map[y][x] = True
+        self.spatial_hash = SpatialHash(cell_size=64)  # Broadphase for bullet collisions
+        self.obstacle_map = None  # For pathfinding: the tilemap's obstacles around the player (an ObstacleWindow)
+        self.obstacle_map_version = 0  # Bumped whenever obstacle_map changes
+        self.flow_field = FlowField(TILE_SIZE)  # Shared chase directions towards the player
+        self.path_scheduler = PathScheduler(shared_path_finder, budget_ms=1.0)  # Time-sliced A* requests
+        # Optional vectorized backend: chase movement and contact damage run as one vectorized pass
+        self.enemy_store = EnemyStore() if use_enemy_store else None
+        self._update_obstacle_window()
+    def _update_obstacle_window(self):
+        """Keeps obstacle_map on the OBSTACLE_WINDOW tiles around the player. Returns True if it moved.
+
+        A world no larger than the window is covered whole, once. In larger
+        worlds the window re-centres (snapped to OBSTACLE_WINDOW_STEP tiles) when
+        the player drifts a quarter of it away from its centre, so the flow field,
+        A* and line of sight cost the same whatever the size of the world.
+        """
+        tilemap = self.tilemap
+        width = min(OBSTACLE_WINDOW, tilemap.width)
+        height = min(OBSTACLE_WINDOW, tilemap.height)
+        player_x = int(self.player.x // TILE_SIZE)
+        player_y = int(self.player.y // TILE_SIZE)
+        if self.obstacle_map is not None:
+            left, top = self.obstacle_map.origin
+            if abs(player_x - (left + width // 2)) <= width // 4 and abs(player_y - (top + height // 2)) <= height // 4:
+                return False
+        step = OBSTACLE_WINDOW_STEP
+        left = min(max(round((player_x - width // 2) / step) * step, 0), tilemap.width - width)
+        top = min(max(round((player_y - height // 2) / step) * step, 0), tilemap.height - height)
+        if self.obstacle_map is not None and self.obstacle_map.origin == (left, top):
+            return False  # Already as close as the world edges allow
+
+        self.obstacle_map = tilemap.obstacle_window(left, top, width, height)
+        self.obstacle_map_version += 1
+        for enemy in self.enemies:
+            enemy.obstacle_map = self.obstacle_map
+            enemy.obstacle_map_version = self.obstacle_map_version
+        # Spawns come in from the edges of the window
+        self.spawn_scheduler.update_edge_cells(self.obstacle_map, self.obstacle_map_version)
+        return True
     def _generate_patrol_path(self, enemy):
         """Generates a simple patrol path for an enemy."""
         path = []
+        left, top = self.obstacle_map.origin
         for _ in range(5):  # Create a 5-point patrol path
-            x = random.randint(0, GRID_SIZE - 1) * TILE_SIZE
-            y = random.randint(0, GRID_SIZE - 1) * TILE_SIZE
+            x = (left + random.randint(0, len(self.obstacle_map[0]) - 1)) * TILE_SIZE
+            y = (top + random.randint(0, len(self.obstacle_map) - 1)) * TILE_SIZE
             path.append((x, y))
         return path
 
 
     def start_wave(self):
-        if self.wave_index >= len(waves):
+        if self.wave_index >= len(self.waves):
             return False  # No more waves
 
-        wave_data = waves[self.wave_index]
+        wave_data = self.waves[self.wave_index]
+        if self.enemy_store is not None:
+            self.enemy_store.clear()
+        for enemy in self.enemies:
+            self.path_scheduler.cancel(enemy)
+            self.enemy_pool.release(enemy)
         self.enemies = []
         self.wave_message = wave_data['message']
-        self.message_timer = pygame.time.get_ticks()
+        self.message_timer = self.time
         self.wave_completed = False
 
-        # Spawn enemies
-        for enemy_type, count, spawn_rate in wave_data['enemies']:
-            for _ in range(count):
-                x = random.randint(0, GRID_SIZE - 1) * TILE_SIZE
-                y = random.randint(0, GRID_SIZE - 1) * TILE_SIZE
-                enemy = enemy_type(x, y)
-                self.enemies.append(enemy)
-                enemy.spawn_rate = spawn_rate
+        # Frames of this wave and the next stay cached; older types go if over budget
+        next_wave = self.waves[self.wave_index + 1] if self.wave_index + 1 < len(self.waves) else None
+        self.frame_budget.set_waves(wave_data, next_wave)
+        self._enforce_frame_budget()
 
-        # Initialize obstacle map
-        self._generate_obstacle_map()
-
-        # Initialize squads
-        self._organize_into_squads(wave_data)
-
-        # Initialize AI systems for each enemy
-        for enemy in self.enemies:
-            enemy.obstacle_map = self.obstacle_map
-            enemy.patrol_path = self._generate_patrol_path(enemy)
+        # Obstacles around where the player is now
+        self._update_obstacle_window()
 
+        # Enemies are built over the following ticks as their spawn streams release them
+        self.squads = []
+        self.spawn_scheduler.start_wave(wave_data['enemies'], self.time)
+        self._spawn_due_enemies()
         return True
 
-    def _organize_into_squads(self, wave_data):
-        """Organize enemies into coordinated squads"""
-        self.squads = []
+    def _spawn_due_enemies(self):
+        """Adds the enemies the spawn scheduler released this tick and sets up their AI."""
+        new_enemies = self.spawn_scheduler.update(self.time, self.player.x, self.player.y)
+        for enemy in new_enemies:
+            self._add_enemy(enemy)
+
+        if new_enemies and DEBUG_MODE and not self.spawn_scheduler.pending():
+            # Misses should only grow for enemy types not seen before
+            print(f"Frame cache after wave spawned: {frame_cache.stats()}")
+            print(f"Enemy pool: {self.enemy_pool.stats()}")
+            print(f"Frame memory per enemy type: {self.frame_budget.resident()}")
+
+    def _enforce_frame_budget(self):
+        """Evicts enemy types no wave needs soon if the frame cache is over budget."""
+        self.frame_budget.enforce()
+        # Each overrun is reported once, not on every enforce() that finds it again
+        message = self.frame_budget.report()
+        if message and DEBUG_MODE:
+            print(message)
+
+    def _prepare_next_wave(self):
+        """Builds one pooled enemy per tick for the next wave, so it spawns without constructing any."""
+        if self.wave_index + 1 >= len(self.waves):
+            return
+        needed = defaultdict(int)
+        for enemy_type, count, _ in self.waves[self.wave_index + 1]['enemies']:
+            needed[enemy_type] += count
+        for enemy_type, count in needed.items():
+            if self.assets is not None and not self.assets.ready(enemy_type):
+                continue  # Still being prefetched; building one now would load its sheets here
+            if self.enemy_pool.reserve(enemy_type, count, limit=1):
+                return
+
+    def _add_enemy(self, enemy):
+        self.frame_budget.touch(type(enemy))
+        if self.enemy_store is not None:
+            self.enemy_store.add(enemy)
+        self.enemies.append(enemy)
+        self._add_to_squad(enemy)
+
+        # Initialize AI systems for the enemy
+        enemy.obstacle_map = self.obstacle_map
+        enemy.obstacle_map_version = self.obstacle_map_version
+        enemy.flow_field = self.flow_field
+        enemy.projectile_system = self.projectile_system
+        enemy.summoner = self.summon
+        enemy.patrol_path = self._generate_patrol_path(enemy)
+
+    def summon(self, enemy_type, x, y):
+        """Adds an enemy mid-wave (e.g. a boss's minions); it joins the wave after this tick's AI pass."""
+        enemy = self.enemy_pool.acquire(enemy_type, x, y)
+        enemy.spawn_rate = 1
+        self.summoned.append(enemy)
+
+    def _add_to_squad(self, enemy):
+        """Organize enemies into coordinated squads as they spawn"""
         squad_size = 4  # Enemies per squad
 
-        for i in range(0, len(self.enemies), squad_size):
-            squad = EnemySwarm(self.enemies[i:i+squad_size])
+        if not self.squads or len(self.squads[-1].members) >= squad_size:
+            squad = EnemySwarm([])
             squad.strategy = random.choice(["flank", "swarm", "cover"])
             self.squads.append(squad)
+        self.squads[-1].members.append(enemy)
 
     def update(self):
-        for enemy in self.enemies:
-            if enemy.spawn_rate and not enemy.is_dead:
+        """Advances every enemy and the wave timers by one fixed tick."""
+        player = self.player
+        self.time += FIXED_DT
+        profiler = self.profiler
+        with profiler.section('pathfinding'):
+            self._update_obstacle_window()
+            # One Dijkstra from the player's cell serves every chasing enemy;
+            # it only reruns when the player changes cell or the obstacles change
+            self.flow_field.update(player.x, player.y, self.obstacle_map, self.obstacle_map_version)
+
+        player_cell = (int(player.x // TILE_SIZE), int(player.y // TILE_SIZE))
+
+        with profiler.section('spawning'):
+            self._spawn_due_enemies()
+
+        with profiler.section('ai'):
+            for enemy in self.enemies:
+                if not enemy.spawn_rate:
+                    continue
+                enemy.save_previous_position()
+                if enemy.is_dead:
+                    enemy.update(player)  # Plays the death animation
+                    continue
+
                 enemy.update(player)  # Changed from regular update
 
                 # Line of sight check
                 if enemy.has_line_of_sight(player):
                     enemy.last_seen_player_pos = (player.x, player.y)
 
-                # Environmental awareness
-                if random.random() < 0.02:  # 2% chance per frame to replan path
-                    enemy.current_path = enemy.pathfind_to_player(player)
+                # Movement follows the flow field; A* paths are only planned for the debug path view.
+                # Replan only when the player's cell or the obstacle map changed (the scheduler drops
+                # repeats of the same goal)
+                if DEBUG_MODE:
+                    self.path_scheduler.submit(enemy, (int(enemy.x // TILE_SIZE), int(enemy.y // TILE_SIZE)),
+                                               player_cell, self.obstacle_map, self.obstacle_map_version,
+                                               enemy.receive_path)
 
-        # Clean up dead enemies that have completed their death animation
-        self.enemies = [enemy for enemy in self.enemies
-                        if not (enemy.is_dead and enemy.death_animation_completed)]
+            if self.summoned:
+                for enemy in self.summoned:
+                    self._add_enemy(enemy)
+                self.summoned = []
 
-        # Check if wave is complete
-        if len(self.enemies) == 0 and not self.wave_completed:
+            if self.enemy_store is not None:
+                self.enemy_store.step_chase(player, self.flow_field)
+
+        with profiler.section('pathfinding'):
+            # Run queued path searches within this frame's budget
+            self.path_scheduler.run()
+
+        # Return dead enemies that have completed their death animation to the pool
+        finished = False
+        for enemy in self.enemies:
+            if enemy.is_dead:
+                self.path_scheduler.cancel(enemy)
+                if enemy.death_animation_completed:
+                    finished = True
+                    if self.enemy_store is not None:
+                        self.enemy_store.remove(enemy)
+                    self.enemy_pool.release(enemy)
+        if finished:
+            # Only rebuilt on ticks where an enemy actually left
+            self.enemies = [enemy for enemy in self.enemies
+                            if not (enemy.is_dead and enemy.death_animation_completed)]
+
+        # Check if wave is complete (every enemy spawned and defeated)
+        if len(self.enemies) == 0 and not self.wave_completed and not self.spawn_scheduler.pending():
             self.wave_completed = True
-            self.wave_cooldown = pygame.time.get_ticks()
+            self.wave_cooldown = self.time
+            # Make room before the next wave's frames come in
+            self._enforce_frame_budget()
+            if self.assets is not None and self.wave_index + 1 < len(self.waves):
+                # The worker decodes the next wave's sheets while the cooldown runs
+                self.assets.prefetch_wave(self.waves[self.wave_index + 1])
+
+        if self.assets is not None and self.assets.pending():
+            with profiler.section('assets'):
+                self.assets.poll()
 
         # Start next wave after cooldown
         if self.wave_completed:
-            if pygame.time.get_ticks() - self.wave_cooldown > self.time_between_waves * 1000:
+            with profiler.section('spawning'):
+                self._prepare_next_wave()
+            if self.time - self.wave_cooldown > self.time_between_waves:
                 self.wave_index += 1
                 if not self.start_wave():  # Returns False if no more waves
                     print("Game Completed!")
                     return
 
-        # Handle enemy spawning
-        for enemy in self.enemies:
-            if enemy.spawn_rate:
-                enemy.update(player)
+        # Rebuild the collision grid from this tick's final enemy positions
+        with profiler.section('collision'):
+            self.spatial_hash.rebuild(self.enemies)
 
-    def draw(self, surface):
+    def nearest_enemy(self, x, y, max_range=None):
+        """Nearest living enemy to (x, y) within max_range, or None. Use this instead of scanning self.enemies."""
+        return self.spatial_hash.nearest(x, y, max_range)
+
+    def draw(self, surface, render_queue, alpha=1.0, camera=None):
+        """Queues every enemy; debug paths are drawn straight onto surface. Returns the rects of those paths.
+
+        With a camera, enemies outside its view (plus margin) are neither drawn
+        nor animated until they come back.
+        """
+        rects = []
+        offset = camera.offset() if camera is not None else (0, 0)
         if DEBUG_MODE:
             for enemy in self.enemies:
-                enemy.draw_path(surface)
-        # Draw all enemies
+                rects.append(enemy.draw_path(surface, offset))
+        # Queue all enemies between their last two simulated positions
         for enemy in self.enemies:
-            enemy.draw(surface)
-# Add debug mode toggle
+            if camera is not None:
+                enemy.on_screen = camera.visible(enemy.x, enemy.y, enemy.draw_radius)
+                if not enemy.on_screen:
+                    continue
+            enemy.interpolate(alpha)
+            enemy.draw(render_queue)
+        return rects
+# Add debug mode toggle (F3 in game); also shows the performance overlay
 DEBUG_MODE = False
 
-# Initialize Wave Manager
-wave_manager = WaveManager()
-
 # Function to render a basic map
-def render_map():
-    for y in range(GRID_SIZE):
-        for x in range(GRID_SIZE):
-            screen.blit(DESERT_TILE, (x * TILE_SIZE, y * TILE_SIZE))
+def render_map(surface, background, offset=(0, 0)):
+    # A few blits of the prerendered chunks under the view instead of a blit per tile
+    background.draw(surface, offset)
 
 # Function to draw the health bar
 def draw_health_bar(surface, x, y, health, max_health):
@@ -204,60 +395,276 @@ def draw_health_bar(surface, x, y, health, max_health):
     fill_rect = pygame.Rect(x, y, fill, bar_height)
     pygame.draw.rect(surface, GREEN, fill_rect)
     pygame.draw.rect(surface, RED, border_rect, 2)
-
-# Main game loop
-def main():
-    wave_manager.start_wave()  # Start the first wave
-    player_health = player.health
-    max_health = 100
-
-    while True:
+    # Health changes constantly, so its number is drawn from the glyph atlas
+    digits = text_cache.atlas(HEALTH_FONT_SIZE, WHITE)
+    text = f"{max(0, int(health))}/{max_health}"
+    text_rect = digits.draw(surface, text, (x + bar_width // 2, y + (bar_height - digits.height) // 2), align='center')
+    return border_rect.union(text_rect)
+
+# Function to draw the startup loading screen
+def draw_loading_screen(surface, progress):
+    bar_width = 300
+    bar_height = 16
+    x = SCREEN_WIDTH // 2 - bar_width // 2
+    y = SCREEN_HEIGHT // 2
+    surface.fill((0, 0, 0))
+    title = text_cache.render("Loading...", WAVE_FONT_SIZE, WHITE)
+    surface.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, y - title.get_height() - 12))
+    pygame.draw.rect(surface, GREEN, (x, y, int(bar_width * progress), bar_height))
+    pygame.draw.rect(surface, WHITE, (x, y, bar_width, bar_height), 2)
+
+
+class GameSession:
+    """One game: the display, clock, player, weapons, projectiles and waves.
+
+    Nothing is created at import time, so the simulation can be imported and
+    stepped from benchmarks or balancing scripts. In headless mode SDL uses its
+    dummy video driver (sprites still need a display surface for convert_alpha)
+    and every draw call is skipped.
+
+    Pass a profiler.Profiler to time each subsystem per frame; wave_table
+    replaces the built-in waves (the scenario benchmarks use this). With
+    dirty_rects each frame only redraws and presents what moved (see
+    dirty_rects.py); without it every frame is redrawn and flipped whole.
+    grid_size sets the world size in tiles; a camera follows the player
+    across worlds larger than the screen. The world is a TileMap generated from
+    the seed (see tilemap.py): its chunks are only generated and rendered
+    around the player, so any size costs the same per frame. frame_budget_mb
+    caps the sprite frame memory (see frame_budget.py); None never evicts.
+    """
+    def __init__(self, headless=False, use_enemy_store=False, seed=None, render_fps=60,
+                 wave_table=None, profiler=null_profiler, dirty_rects=True, grid_size=GRID_SIZE,
+                 frame_budget_mb=FRAME_BUDGET_MB):
+        self.headless = headless
+        self.profiler = profiler
+        self.render_fps = render_fps  # Frame rate cap; the simulation always runs at SIM_HZ
+        if seed is not None:
+            random.seed(seed)
+
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+        # Initialize Pygame
+        pygame.init()
+
+        # Set up display
+        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.grid_size = grid_size
+        self.world_width = grid_size * TILE_SIZE
+        self.world_height = grid_size * TILE_SIZE
+        self.camera = Camera(SCREEN_WIDTH, SCREEN_HEIGHT, self.world_width, self.world_height)
+        # Terrain and its obstacles, generated chunk by chunk as the player gets near
+        self.tilemap = TileMap(grid_size, grid_size, seed if seed is not None else random.randrange(1 << 30))
+        pygame.display.set_caption("SwarmShot by IIITA")
+
+        if frame_cache.bundle is None:
+            # Prebuilt frames (python asset_bundle.py); without it sprites load from the PNGs
+            frame_cache.bundle = AssetBundle.open()
+        if frame_cache.atlas is None:
+            # Source sprites packed into a few pages (python atlas.py); without it each PNG loads on its own
+            frame_cache.atlas = TextureAtlas.open()
+
+        self.background = None
+        self.assets = None
+        self.dirty = DirtyRectTracker(self.screen.get_rect()) if dirty_rects and not headless else None
+        self.render_queue = RenderQueue()
+        if not headless:
+            # First wave's sheets load behind a loading screen; later waves prefetch during cooldowns
+            self.assets = AssetManager()
+            self.assets.load(*self.assets.wave_keys((wave_table or waves)[0]),
+                             on_progress=self._show_loading_progress)
+
+            # Chunks of the tile map are rendered into cached surfaces as they come into view
+            # (needs the display for convert())
+            self.background = TileMapLayer(self.tilemap, TILE_SIZE)
+            # Load the fonts and render the wave messages now, not on the first frame they show
+            for wave in wave_table or waves:
+                text_cache.render(wave['message'], WAVE_FONT_SIZE, WHITE)
+            text_cache.render("Game Over", GAME_OVER_FONT_SIZE, RED)
+            text_cache.atlas(HEALTH_FONT_SIZE, WHITE)
+
+        # Clock for controlling frame rate, and the accumulator that turns frames into fixed ticks
+        self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep()
+
+        # Load Player
+        # The player stays in the world, so the camera always has them in view
+        self.player = Player(self.world_width // 2, self.world_height // 2,
+                             bounds=(0, 0, self.world_width, self.world_height))
+        self.max_health = 100
+
+        # Every player bullet and enemy projectile lives in one pooled system
+        self.projectile_system = ProjectileSystem(bounds=(0, 0, self.world_width, self.world_height))
+        self.weapon_manager = WeaponManager(self.projectile_system)
+        self.wave_manager = WaveManager(self.player, self.projectile_system, use_enemy_store,
+                                        wave_table, profiler, self.assets, grid_size, self.tilemap,
+                                        None if frame_budget_mb is None else frame_budget_mb * 1024 * 1024)
+        self.ticks = 0
+        self.game_completed = False
+
+    def _show_loading_progress(self, progress):
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
+        draw_loading_screen(self.screen, progress)
+        pygame.display.flip()
+
+    def start(self):
+        self.wave_manager.start_wave()  # Start the first wave
+
+    def step(self, keys=NO_KEYS):
+        """Advances the simulation by one FIXED_DT tick. Returns False once the game has ended."""
+        player = self.player
+        wave_manager = self.wave_manager
+        profiler = self.profiler
 
         # Handle player movement
-        keys = pygame.key.get_pressed()
-        player.update(keys)
+        with profiler.section('player'):
+            player.save_previous_position()
+            player.update(keys)
 
         # Update wave manager
-        wave_manager.update()
+        with profiler.section('waves'):
+            wave_manager.update()
 
-        # Check for health reduction here (after collision)
-        player_health = player.health  # Update player health after enemies hit
+        # Update weapons
+        with profiler.section('weapons'):
+            self.weapon_manager.update(player.x, player.y, wave_manager.enemies, wave_manager.spatial_hash)
+        # Move all projectiles, then resolve bullet hits on enemies
+        with profiler.section('projectiles'):
+            self.projectile_system.advance(player)
+        with profiler.section('collision'):
+            self.projectile_system.collide_bullets(wave_manager.spatial_hash)
+
+        self.ticks += 1
+        if wave_manager.wave_index >= len(wave_manager.waves):
+            self.game_completed = True
+        return player.health > 0 and not self.game_completed
+
+    def draw(self, alpha=1.0):
+        """Renders a frame, alpha of the way between the last two simulation states."""
+        with self.profiler.section('draw'):
+            self._draw(alpha)
+
+    def _draw(self, alpha):
+        screen = self.screen
+        wave_manager = self.wave_manager
+        player = self.player
+
+        dirty = self.dirty
+        camera = self.camera
+
+        # The view follows where the player is drawn this frame
+        player.interpolate(alpha)
+        camera.follow(player.render_x, player.render_y)
+        offset = camera.offset()
 
         # Render everything
-        screen.fill(WHITE)  # Optional fallback color
-        render_map()
-        # Update weapons
-        weapon_manager.update(player.x, player.y, wave_manager.enemies)
-        player.draw(screen)
-        # Draw weapons
-        weapon_manager.draw(screen)
-        wave_manager.draw(screen)  # Draw the enemies
+        with self.profiler.section('map'):
+            if dirty is not None:
+                dirty.restore(screen, self.background, offset)  # Erases only what was drawn last frame
+            else:
+                render_map(screen, self.background, offset)  # Covers the whole screen, so no fill is needed
+            # Render the next chunk about to scroll into view, at most one per frame
+            self.background.prefetch(camera.view_rect())
+        with self.profiler.section('entities'):
+            render_queue = self.render_queue
+            # Everything is queued, then drawn with one blits() call per layer; off-screen things are culled
+            rects = wave_manager.draw(screen, render_queue, alpha, camera)  # Queue the enemies
+            player.draw(render_queue)
+            # Queue weapons
+            self.weapon_manager.draw(render_queue, (player.render_x, player.render_y))
+            self.projectile_system.draw(render_queue, alpha, camera.cull_bounds())
+            rects.extend(render_queue.flush(screen, doreturn=dirty is not None, offset=offset))
 
         # Display wave message
-        if pygame.time.get_ticks() - wave_manager.message_timer < 2000:
-            font = pygame.font.Font(None, 36)
-            text = font.render(wave_manager.wave_message, True, WHITE)
-            screen.blit(text, (MAP_WIDTH // 2 - text.get_width() // 2, MAP_HEIGHT // 2 - text.get_height() // 2))
+        if wave_manager.time - wave_manager.message_timer < 2:
+            text = text_cache.render(wave_manager.wave_message, WAVE_FONT_SIZE, WHITE)
+            rects.append(screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - text.get_height() // 2)))
 
         # Draw health bardd
-        draw_health_bar(screen, 10, 10, player_health, max_health)
-
-        # Check player health and display game over if health is 0
-        if player_health <= 0:
-            font = pygame.font.Font(None, 72)
-            game_over_text = font.render("Game Over", True, RED)
-            screen.blit(game_over_text, (MAP_WIDTH // 2 - game_over_text.get_width() // 2, MAP_HEIGHT // 2 - game_over_text.get_height() // 2))
+        rects.append(draw_health_bar(screen, 10, 10, self.player.health, self.max_health))
+        if dirty is not None:
+            dirty.extend(rects)
+
+    def present(self):
+        """Shows the drawn frame: just the dirty rects when tracking them, else a full flip."""
+        if self.dirty is not None:
+            self.dirty.present()
+        else:
             pygame.display.flip()
-            pygame.time.wait(3000)
-            pygame.quit()
-            sys.exit()
 
-        pygame.display.flip()
-        clock.tick(60)  # 60 FPS
+    def draw_game_over(self):
+        game_over_text = text_cache.render("Game Over", GAME_OVER_FONT_SIZE, RED)
+        self.screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2 - game_over_text.get_height() // 2))
+
+    def run(self):
+        """Interactive loop: as many fixed ticks as the last frame took, then one interpolated frame."""
+        global DEBUG_MODE
+        if self.profiler is null_profiler:
+            # Always on when playing: a few timer calls per frame, and the overlay needs the history
+            self.profiler = Profiler(history=240)
+            self.wave_manager.profiler = self.profiler
+        profiler = self.profiler
+        overlay = None
+
+        self.start()
+        self.clock.tick()
+        while True:
+            frame_start = time.perf_counter()
+            with profiler.section('events'):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        pygame.quit()
+                        sys.exit()
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        DEBUG_MODE = not DEBUG_MODE
+
+            # A slow frame runs several ticks, a fast one may run none
+            keys = pygame.key.get_pressed()
+            for _ in range(self.timestep.advance(self.clock.get_time() / 1000)):
+                self.step(keys)
+            self.draw(self.timestep.alpha)
+            if DEBUG_MODE:
+                if overlay is None:
+                    overlay = PerfOverlay(profiler)
+                overlay_rect = overlay.draw(self.screen, self, self.clock.get_fps())
+                if self.dirty is not None:
+                    self.dirty.add(overlay_rect)
+
+            # Check player health and display game over if health is 0
+            if self.player.health <= 0:
+                self.draw_game_over()
+                pygame.display.flip()
+                pygame.time.wait(3000)
+                pygame.quit()
+                sys.exit()
+
+            with profiler.section('flip'):
+                self.present()
+            profiler.add('frame', (time.perf_counter() - frame_start) * 1000)
+            profiler.end_frame()
+            self.clock.tick(self.render_fps)
+
+    def run_headless(self, max_ticks, keys=NO_KEYS):
+        """Steps the simulation as fast as possible, without drawing, frame limiting or vsync.
+
+        keys is either a key state or a function tick -> key state for scripted input.
+        Returns the number of ticks simulated.
+        """
+        self.start()
+        for tick in range(max_ticks):
+            running = self.step(keys(tick) if callable(keys) else keys)
+            self.profiler.end_frame()
+            if not running:
+                break
+        return self.ticks
+
+
+# Main game loop
+def main():
+    GameSession().run()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,571 @@
+#Code for grid pathfinding shared by all enemies
+import heapq
+import math
+import time
+from collections import OrderedDict
+
+DIAGONAL_COST = math.sqrt(2)
+
+# (dx, dy, cost) for the 8 neighbours of a cell
+NEIGHBOR_STEPS = [
+    (1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+    (1, 1, DIAGONAL_COST), (-1, 1, DIAGONAL_COST), (1, -1, DIAGONAL_COST), (-1, -1, DIAGONAL_COST),
+]
+
+
+class FlowField:
+    """Dijkstra distance map from the player's cell over the obstacle map.
+
+    Every enemy chases the same goal, so one search from the goal serves all of
+    them: each cell stores the neighbouring cell that is one step closer to the
+    goal, and an enemy reads its next step in O(1). The field is only recomputed
+    when the goal changes cell or the obstacle map version changes. An obstacle
+    map may cover only part of the world (see tilemap.ObstacleWindow): its
+    `origin` cell is subtracted from positions, and added back to the steps.
+    """
+    def __init__(self, tile_size=16):
+        self.tile_size = tile_size
+        self.width = 0
+        self.height = 0
+        self.origin_x = 0  # World cell of the obstacle map's [0][0]
+        self.origin_y = 0
+        self.goal = None
+        self.obstacle_version = None
+        self.blocked = []  # Flat lists indexed by y * width + x
+        self.neighbors = []  # (neighbor index, step cost) pairs of every cell
+        self.distances = []
+        self.next_cell = {}  # Cell index -> next cell index towards the goal, -1 if none
+        self.rebuild_count = 0
+
+    def update(self, goal_x, goal_y, obstacle_map, obstacle_version):
+        """Recomputes the field if the goal cell or the obstacle map changed. Returns True if it did."""
+        height = len(obstacle_map)
+        width = len(obstacle_map[0])
+        origin_x, origin_y = getattr(obstacle_map, 'origin', (0, 0))
+        goal = (min(max(int(goal_x // self.tile_size) - origin_x, 0), width - 1),
+                min(max(int(goal_y // self.tile_size) - origin_y, 0), height - 1))
+        if width != self.width or height != self.height or obstacle_version != self.obstacle_version:
+            self.width = width
+            self.height = height
+            self.origin_x = origin_x
+            self.origin_y = origin_y
+            self.obstacle_version = obstacle_version
+            self._build_neighbors(obstacle_map)
+        elif goal == self.goal:
+            return False
+
+        self.goal = goal
+        self._compute()
+        self.rebuild_count += 1
+        return True
+
+    def _build_neighbors(self, obstacle_map):
+        """Caches the passable neighbours of every cell; only redone when the obstacles change."""
+        width, height = self.width, self.height
+        blocked = [obstacle_map[y][x] for y in range(height) for x in range(width)]
+        # Padded copy with a blocked border, so no step needs a bounds check
+        padded_width = width + 2
+        padded = [True] * (padded_width * (height + 2))
+        for y in range(height):
+            start = (y + 1) * padded_width + 1
+            padded[start:start + width] = blocked[y * width:(y + 1) * width]
+        # (padded offset, offset, cost, and for diagonals the padded offsets of the two corner cells)
+        steps = [(dy * padded_width + dx, dy * width + dx, cost, dx if dy else 0, dy * padded_width if dx else 0)
+                 for dx, dy, cost in NEIGHBOR_STEPS]
+        neighbors = []
+        append = neighbors.append
+        for y in range(height):
+            padded_row = (y + 1) * padded_width + 1
+            row = y * width
+            for x in range(width):
+                cell = padded_row + x
+                index = row + x
+                # Diagonal steps may not cut the corner of a blocked cell
+                append([(index + offset, cost) for padded_offset, offset, cost, side_x, side_y in steps
+                        if not padded[cell + padded_offset] and
+                        not (side_x and (padded[cell + side_x] or padded[cell + side_y]))])
+        self.blocked = blocked
+        self.neighbors = neighbors
+
+    def _compute(self):
+        neighbors = self.neighbors
+        distances = [math.inf] * (self.width * self.height)
+        goal_index = self.goal[1] * self.width + self.goal[0]
+        distances[goal_index] = 0
+        frontier = [(0, goal_index)]
+        heappop, heappush = heapq.heappop, heapq.heappush
+        while frontier:
+            distance, index = heappop(frontier)
+            if distance > distances[index]:
+                continue  # Stale heap entry
+            # Steps are symmetric, so a cell's outgoing neighbours are also its incoming ones,
+            # except that blocked cells never appear as neighbours and are never expanded
+            for neighbor, cost in neighbors[index]:
+                new_distance = distance + cost
+                if new_distance < distances[neighbor]:
+                    distances[neighbor] = new_distance
+                    heappush(frontier, (new_distance, neighbor))
+
+        self.distances = distances
+        self.next_cell = {}  # Filled lazily by next_step, one entry per visited cell
+
+    def next_step(self, x, y):
+        """Pixel center of the next cell towards the goal from (x, y), or None.
+
+        None means the position is off the grid, already in the goal cell, or
+        cannot reach the goal, and the caller should head for the goal directly.
+        """
+        if self.goal is None:
+            return None
+        cell_x = int(x // self.tile_size) - self.origin_x
+        cell_y = int(y // self.tile_size) - self.origin_y
+        if not (0 <= cell_x < self.width and 0 <= cell_y < self.height):
+            return None
+        index = cell_y * self.width + cell_x
+        next_index = self.next_cell.get(index)
+        if next_index is None:
+            next_index = self._best_neighbor(index)
+            self.next_cell[index] = next_index
+        if next_index < 0:
+            return None
+        half_tile = self.tile_size / 2
+        return ((next_index % self.width + self.origin_x) * self.tile_size + half_tile,
+                (next_index // self.width + self.origin_y) * self.tile_size + half_tile)
+
+    def _best_neighbor(self, index):
+        """Cheapest passable neighbour of a cell, or -1. Blocked cells get one too so enemies can walk off them."""
+        distances = self.distances
+        own_distance = distances[index]
+        best_index = -1
+        best_distance = math.inf
+        for neighbor, cost in self.neighbors[index]:
+            # Only step downhill; compare on the neighbour's distance to avoid float ties
+            if distances[neighbor] < own_distance and distances[neighbor] + cost < best_distance:
+                best_distance = distances[neighbor] + cost
+                best_index = neighbor
+        return best_index
+
+    def next_cell_table(self):
+        """Next cell index towards the goal for every cell (-1 where there is none), as a flat list."""
+        return [self._best_neighbor(index) for index in range(self.width * self.height)]
+
+    def distance_at(self, x, y):
+        """Path length in cells from (x, y) to the goal (math.inf if unreachable)."""
+        cell_x = int(x // self.tile_size) - self.origin_x
+        cell_y = int(y // self.tile_size) - self.origin_y
+        if self.goal is None or not (0 <= cell_x < self.width and 0 <= cell_y < self.height):
+            return math.inf
+        return self.distances[cell_y * self.width + cell_x]
+
+
+def octile_distance(ax, ay, bx, by):
+    """Exact path length between two cells on an 8-connected grid with no obstacles."""
+    dx = abs(ax - bx)
+    dy = abs(ay - by)
+    return max(dx, dy) + (DIAGONAL_COST - 1) * min(dx, dy)
+
+
+class GridPathfinder:
+    """A* over the obstacle grid with optional jump point search and a path cache.
+
+    Moves are 8-connected with no corner cutting, the same rules the FlowField
+    uses. The open list is a heap, and g-costs / parents live in flat lists
+    indexed by y * width + x that are reused between searches (a search id stamp
+    marks which entries belong to the current search). Internally the grid is
+    padded with a border of blocked cells so no step needs a bounds check.
+    Results are cached on (start, goal, obstacle map version), and unreachable
+    goals return None. Cells are world cells: the `origin` of a partial obstacle
+    map (see tilemap.ObstacleWindow) is subtracted on the way in and added to
+    the returned path.
+    """
+    def __init__(self, use_jps=True, cache_size=256):
+        self.use_jps = use_jps
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.width = 0
+        self.height = 0
+        self.padded_width = 0
+        self.obstacle_version = None
+        self.blocked = []
+        self.neighbors = []  # Lazily built (neighbor index, cost) lists for plain A*
+        self.g = []
+        self.came_from = []
+        self.stamp = []  # Search id that last touched each cell
+        self.closed = []  # Search id that closed each cell
+        self.search_id = 0
+
+    def _prepare(self, obstacle_map, obstacle_version):
+        height = len(obstacle_map)
+        width = len(obstacle_map[0])
+        if width == self.width and height == self.height and obstacle_version == self.obstacle_version:
+            return
+        self.width = width
+        self.height = height
+        self.obstacle_version = obstacle_version
+        padded_width = width + 2
+        self.padded_width = padded_width
+        blocked = [True] * (padded_width * (height + 2))
+        for y in range(height):
+            row = obstacle_map[y]
+            offset = (y + 1) * padded_width + 1
+            for x in range(width):
+                blocked[offset + x] = bool(row[x])
+        self.blocked = blocked
+        size = len(blocked)
+        self.neighbors = [None] * size
+        self.g = [math.inf] * size
+        self.came_from = [-1] * size
+        self.stamp = [0] * size
+        self.closed = [0] * size
+        self.search_id = 0
+        self.cache.clear()
+
+    def find_path(self, start, goal, obstacle_map, obstacle_version):
+        """Returns the list of (x, y) cells from start (excluded) to goal, or None if unreachable."""
+        self._prepare(obstacle_map, obstacle_version)
+        origin_x, origin_y = getattr(obstacle_map, 'origin', (0, 0))
+        start = (min(max(start[0] - origin_x, 0), self.width - 1), min(max(start[1] - origin_y, 0), self.height - 1))
+        goal = (min(max(goal[0] - origin_x, 0), self.width - 1), min(max(goal[1] - origin_y, 0), self.height - 1))
+
+        key = (start, goal, obstacle_version, self.use_jps)
+        if key in self.cache:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+            path = self.cache[key]
+        else:
+            self.cache_misses += 1
+            path = self._search(start, goal)
+            path = self.cache[key] = None if path is None else tuple(path)
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        if path is None:
+            return None
+        if origin_x or origin_y:
+            return [(x + origin_x, y + origin_y) for x, y in path]
+        return list(path)
+
+    def _index(self, x, y):
+        return (y + 1) * self.padded_width + x + 1
+
+    def _search(self, start, goal):
+        padded_width = self.padded_width
+        start_index = self._index(*start)
+        goal_index = self._index(*goal)
+        if self.blocked[goal_index]:
+            return None
+        if start_index == goal_index:
+            return []
+
+        self.search_id += 1
+        search_id = self.search_id
+        g, came_from, stamp, closed = self.g, self.came_from, self.stamp, self.closed
+        goal_x, goal_y = goal_index % padded_width, goal_index // padded_width
+
+        g[start_index] = 0
+        came_from[start_index] = -1
+        stamp[start_index] = search_id
+        start_h = octile_distance(start[0], start[1], goal[0], goal[1])
+        # Ties on f are broken towards the smaller heuristic, i.e. the node closer to the goal
+        open_list = [(start_h, start_h, start_index)]
+        successors = self._jump_successors if self.use_jps else self._neighbor_successors
+        heappop, heappush = heapq.heappop, heapq.heappush
+
+        while open_list:
+            _, _, index = heappop(open_list)
+            if closed[index] == search_id:
+                continue
+            closed[index] = search_id
+            if index == goal_index:
+                return self._reconstruct(start_index, goal_index)
+
+            index_g = g[index]
+            for neighbor, cost in successors(index, came_from[index], goal_index):
+                if closed[neighbor] == search_id:
+                    continue
+                new_g = index_g + cost
+                if stamp[neighbor] != search_id or new_g < g[neighbor]:
+                    stamp[neighbor] = search_id
+                    g[neighbor] = new_g
+                    came_from[neighbor] = index
+                    h = octile_distance(neighbor % padded_width, neighbor // padded_width, goal_x, goal_y)
+                    heappush(open_list, (new_g + h, h, neighbor))
+
+        return None  # Open list exhausted: the goal cannot be reached
+
+    def _reconstruct(self, start_index, goal_index):
+        padded_width = self.padded_width
+        jump_points = []
+        index = goal_index
+        while index != start_index:
+            jump_points.append(index)
+            index = self.came_from[index]
+        jump_points.reverse()
+
+        # Jump points can be several cells apart; fill in the straight/diagonal runs between them
+        path = []
+        x, y = start_index % padded_width, start_index // padded_width
+        for jump_point in jump_points:
+            jx, jy = jump_point % padded_width, jump_point // padded_width
+            step_x = (jx > x) - (jx < x)
+            step_y = (jy > y) - (jy < y)
+            while x != jx or y != jy:
+                if x != jx:
+                    x += step_x
+                if y != jy:
+                    y += step_y
+                path.append((x - 1, y - 1))
+        return path
+
+    def _neighbor_successors(self, index, parent, goal_index):
+        cell_neighbors = self.neighbors[index]
+        if cell_neighbors is None:
+            blocked = self.blocked
+            padded_width = self.padded_width
+            cell_neighbors = []
+            for dx, dy, cost in NEIGHBOR_STEPS:
+                neighbor = index + dx + dy * padded_width
+                if blocked[neighbor]:
+                    continue
+                if dx and dy and (blocked[index + dx] or blocked[index + dy * padded_width]):
+                    continue
+                cell_neighbors.append((neighbor, cost))
+            self.neighbors[index] = cell_neighbors
+        return cell_neighbors
+
+    def _pruned_directions(self, index, parent):
+        """Neighbour directions worth exploring from index given the direction we arrived from."""
+        blocked = self.blocked
+        padded_width = self.padded_width
+        if parent < 0:
+            # The start cell explores every open neighbour
+            return [self._direction(index, neighbor)
+                    for neighbor, _ in self._neighbor_successors(index, parent, None)]
+
+        dx, dy = self._direction(parent, index)
+        directions = []
+        if dx and dy:
+            vertical_open = not blocked[index + dy * padded_width]
+            horizontal_open = not blocked[index + dx]
+            if vertical_open:
+                directions.append((0, dy))
+            if horizontal_open:
+                directions.append((dx, 0))
+            if vertical_open and horizontal_open:
+                directions.append((dx, dy))
+        elif dx:
+            next_open = not blocked[index + dx]
+            up_open = not blocked[index - padded_width]
+            down_open = not blocked[index + padded_width]
+            if next_open:
+                directions.append((dx, 0))
+                if up_open:
+                    directions.append((dx, -1))
+                if down_open:
+                    directions.append((dx, 1))
+            if up_open:
+                directions.append((0, -1))
+            if down_open:
+                directions.append((0, 1))
+        else:
+            next_open = not blocked[index + dy * padded_width]
+            left_open = not blocked[index - 1]
+            right_open = not blocked[index + 1]
+            if next_open:
+                directions.append((0, dy))
+                if left_open:
+                    directions.append((-1, dy))
+                if right_open:
+                    directions.append((1, dy))
+            if left_open:
+                directions.append((-1, 0))
+            if right_open:
+                directions.append((1, 0))
+        return directions
+
+    def _direction(self, from_index, to_index):
+        padded_width = self.padded_width
+        from_x, from_y = from_index % padded_width, from_index // padded_width
+        to_x, to_y = to_index % padded_width, to_index // padded_width
+        return (to_x > from_x) - (to_x < from_x), (to_y > from_y) - (to_y < from_y)
+
+    def _jump_successors(self, index, parent, goal_index):
+        padded_width = self.padded_width
+        successors = []
+        for dx, dy in self._pruned_directions(index, parent):
+            jump_point = self._jump(index + dx + dy * padded_width, dx, dy, goal_index)
+            if jump_point is not None:
+                # Runs are straight or diagonal, so the octile distance is the exact run cost
+                successors.append((jump_point, octile_distance(
+                    index % padded_width, index // padded_width,
+                    jump_point % padded_width, jump_point // padded_width)))
+        return successors
+
+    def _jump(self, index, dx, dy, goal_index):
+        """Walks from index in direction (dx, dy) until it finds a jump point, or returns None."""
+        blocked = self.blocked
+        padded_width = self.padded_width
+        row_step = dy * padded_width
+        if not (dx and dy):
+            return self._jump_straight(index, dx, dy, goal_index)
+
+        while True:
+            if blocked[index] or blocked[index - dx] or blocked[index - row_step]:
+                return None  # Wall, or a diagonal step that would cut a corner
+            if index == goal_index:
+                return index
+            # A diagonal run stops where a straight run from it finds something
+            if (self._jump_straight(index + dx, dx, 0, goal_index) is not None or
+                    self._jump_straight(index + row_step, 0, dy, goal_index) is not None):
+                return index
+            index += dx + row_step
+
+    def _jump_straight(self, index, dx, dy, goal_index):
+        blocked = self.blocked
+        padded_width = self.padded_width
+        if dx:
+            step = dx
+            side = padded_width  # Cells above and below
+            back = -dx
+        else:
+            step = dy * padded_width
+            side = 1  # Cells left and right
+            back = -step
+        while True:
+            if blocked[index]:
+                return None
+            if index == goal_index:
+                return index
+            # Forced neighbour: a side cell opens up right after an obstacle behind it
+            if ((not blocked[index - side] and blocked[index - side + back]) or
+                    (not blocked[index + side] and blocked[index + side + back])):
+                return index
+            index += step
+
+
+class PathRequest:
+    """One queued path search."""
+    def __init__(self, requester, start, goal, obstacle_map, obstacle_version, on_done):
+        self.requester = requester
+        self.start = start
+        self.goal = goal
+        self.obstacle_map = obstacle_map
+        self.obstacle_version = obstacle_version
+        self.on_done = on_done
+        self.submitted_at = time.perf_counter()
+
+    def key(self):
+        return (self.start, self.goal, self.obstacle_version)
+
+
+class PathScheduler:
+    """Central queue of path requests, worked off within a per-frame time budget.
+
+    Each requester has at most one pending request (a newer one replaces it),
+    requests asking for the same goal cell they already have are dropped, and
+    queued requests with the same (start, goal, obstacle version) are answered by
+    a single search. Finished paths are handed back through the on_done callback.
+    """
+    def __init__(self, path_finder, budget_ms=1.0):
+        self.path_finder = path_finder
+        self.budget_ms = budget_ms
+        self.pending = OrderedDict()  # id(requester) -> PathRequest, oldest first
+        self.by_key = {}  # PathRequest.key() -> {id(requester): None} of the pending requests with that key
+        self.last_goal = {}  # id(requester) -> (goal, obstacle version) of its last request
+        self.submitted = 0
+        self.completed = 0
+        self.searches = 0
+        self.repeats_dropped = 0  # Submits for a goal the requester already asked for
+        self.shared_results = 0  # Requests answered by another request's search
+        self.superseded = 0
+        self.total_latency_ms = 0
+        self.max_latency_ms = 0
+        self.last_run_ms = 0
+
+    def submit(self, requester, start, goal, obstacle_map, obstacle_version, on_done):
+        """Queues a path search. Returns False if it was dropped as a duplicate."""
+        requester_id = id(requester)
+        goal_key = (goal, obstacle_version)
+        if self.last_goal.get(requester_id) == goal_key:
+            self.repeats_dropped += 1
+            return False
+
+        self.last_goal[requester_id] = goal_key
+        if requester_id in self.pending:
+            self._unqueue(requester_id)
+            self.superseded += 1
+        request = PathRequest(requester, start, goal, obstacle_map, obstacle_version, on_done)
+        self.pending[requester_id] = request
+        self.by_key.setdefault(request.key(), {})[requester_id] = None
+        self.submitted += 1
+        return True
+
+    def _unqueue(self, requester_id):
+        """Removes a pending request from both indexes and returns it (None if there is none)."""
+        request = self.pending.pop(requester_id, None)
+        if request is not None:
+            key = request.key()
+            twins = self.by_key[key]
+            del twins[requester_id]
+            if not twins:
+                del self.by_key[key]
+        return request
+
+    def cancel(self, requester):
+        """Drops everything queued or remembered for a requester (e.g. when it dies)."""
+        requester_id = id(requester)
+        self._unqueue(requester_id)
+        self.last_goal.pop(requester_id, None)
+
+    def run(self, budget_ms=None):
+        """Runs queued searches until the budget is spent. At least one runs per call."""
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        started = time.perf_counter()
+        deadline = started + budget_ms / 1000
+
+        while self.pending:
+            request = self._unqueue(next(iter(self.pending)))
+            path = self.path_finder.find_path(request.start, request.goal,
+                                              request.obstacle_map, request.obstacle_version)
+            self.searches += 1
+            self._finish(request, path)
+
+            # Identical searches queued behind this one share its result
+            for requester_id in self.by_key.pop(request.key(), ()):
+                self._finish(self.pending.pop(requester_id), path)
+                self.shared_results += 1
+
+            if time.perf_counter() >= deadline:
+                break
+
+        self.last_run_ms = (time.perf_counter() - started) * 1000
+
+    def _finish(self, request, path):
+        latency_ms = (time.perf_counter() - request.submitted_at) * 1000
+        self.completed += 1
+        self.total_latency_ms += latency_ms
+        self.max_latency_ms = max(self.max_latency_ms, latency_ms)
+        request.on_done(None if path is None else list(path))
+
+    def queue_depth(self):
+        return len(self.pending)
+
+    def stats(self):
+        """Queue depth and latency numbers for debugging and the benchmarks."""
+        return {
+            'queue_depth': len(self.pending),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'searches': self.searches,
+            'repeats_dropped': self.repeats_dropped,
+            'shared_results': self.shared_results,
+            'superseded': self.superseded,
+            'avg_latency_ms': self.total_latency_ms / self.completed if self.completed else 0,
+            'max_latency_ms': self.max_latency_ms,
+            'last_run_ms': self.last_run_ms,
+        }
+
+
+# One A* engine (and path cache) shared by every enemy and the scheduler
+shared_path_finder = GridPathfinder()
@@ -0,0 +1,113 @@
+#Code for the in-game performance overlay (shown while DEBUG_MODE is on)
+import time
+import pygame
+from projectiles import FACTION_ENEMY, FACTION_PLAYER
+from text_cache import text_cache
+
+# (profiler section, label) of every phase listed in the breakdown, in frame order
+PHASES = [
+    ('events', "event pump"),
+    ('player', "player.update"),
+    ('waves', "wave_manager"),
+    ('weapons', "weapon_manager"),
+    ('map', "map render"),
+    ('entities', "entity draw"),
+    ('flip', "display.flip"),
+]
+COUNTERS = ["enemies", "bullets", "projectiles", "path queue"]
+
+PANEL_WIDTH = 230
+PANEL_COLOR = (16, 16, 24)  # Opaque, so the panel blits as a plain copy
+VALUE_LEFT = 140  # Numbers are right-aligned between here and the panel edge
+FONT_SIZE = 18
+LINE_HEIGHT = 15
+GRAPH_HEIGHT = 40
+GRAPH_BUDGET_MS = 1000 / 60  # Frame times above this line miss 60 FPS
+TEXT_COLOR = (230, 230, 230)
+VALUE_COLOR = (255, 220, 120)
+GRAPH_COLOR = (90, 200, 90)
+GRAPH_SLOW_COLOR = (220, 70, 70)
+
+
+class PerfOverlay:
+    """Frame time, FPS, a rolling frame-time graph, per-phase timings and live counts.
+
+    Everything the overlay shows comes from the session's Profiler. To stay cheap
+    (well under 0.3 ms a frame) it never calls font.render while running: the
+    panel with all labels is rendered once, numbers are drawn from the shared
+    glyph atlas, only one row of numbers is refreshed per frame (each row updates a few
+    times per second), and the graph scrolls by one column per frame instead of
+    being redrawn.
+    """
+    def __init__(self, profiler):
+        self.profiler = profiler
+        self.digits = text_cache.atlas(FONT_SIZE, VALUE_COLOR)
+
+        # (label, x indent, function returning the value, decimals) of every row
+        self.rows = [
+            ("frame ms", 6, lambda session, fps: self.recent_mean('frame'), 2),
+            ("FPS", 6, lambda session, fps: fps, 1),
+            ("overlay ms", 6, lambda session, fps: self.last_cost_ms, 3),
+        ]
+        for name, text in PHASES:
+            self.rows.append((text, 14, lambda session, fps, name=name: self.recent_mean(name), 2))
+        for text in COUNTERS:
+            self.rows.append((text, 6, lambda session, fps, text=text: self.count(session, text), 0))
+
+        graph_top = 4 + len(self.rows) * LINE_HEIGHT + 4
+        self.panel = pygame.Surface((PANEL_WIDTH, graph_top + GRAPH_HEIGHT + 6)).convert()
+        self.panel.fill(PANEL_COLOR)
+        for index, (text, indent, _, _) in enumerate(self.rows):
+            self.panel.blit(text_cache.render(text, FONT_SIZE, TEXT_COLOR), (indent, 4 + index * LINE_HEIGHT))
+        # The graph is drawn straight into its area of the panel
+        self.graph = self.panel.subsurface((6, graph_top, PANEL_WIDTH - 12, GRAPH_HEIGHT))
+        self.graph_budget_y = GRAPH_HEIGHT // 2  # The graph spans 0..2x the 60 FPS budget
+        self.frame_count = 0
+        self.last_cost_ms = 0.0
+
+    def recent_mean(self, name, frames=30):
+        samples = self.profiler.samples.get(name)
+        if not samples:
+            return 0.0
+        recent = samples[-frames:]
+        return sum(recent) / len(recent)
+
+    def count(self, session, counter):
+        wave_manager = session.wave_manager
+        if counter == "enemies":
+            return sum(1 for enemy in wave_manager.enemies if not enemy.is_dead)
+        if counter == "bullets":
+            return session.projectile_system.count(FACTION_PLAYER)
+        if counter == "projectiles":
+            return session.projectile_system.count(FACTION_ENEMY)
+        return wave_manager.path_scheduler.queue_depth()
+
+    def refresh_row(self, index, session, fps):
+        """Redraws the number of one row from the glyph atlas, right-aligned."""
+        _, _, value, decimals = self.rows[index]
+        y = 4 + index * LINE_HEIGHT
+        self.panel.fill(PANEL_COLOR, (VALUE_LEFT, y, PANEL_WIDTH - VALUE_LEFT, LINE_HEIGHT))
+        self.digits.draw(self.panel, f"{value(session, fps):.{decimals}f}", (PANEL_WIDTH - 8, y), align='right')
+
+    def update_graph(self):
+        """Scrolls the graph left by one column and draws the newest frame time."""
+        frame_ms = self.profiler.last('frame')
+        self.graph.scroll(-1, 0)
+        x = self.graph.get_width() - 1
+        self.graph.fill(PANEL_COLOR, (x, 0, 1, GRAPH_HEIGHT))
+        height = min(GRAPH_HEIGHT, int(frame_ms * GRAPH_HEIGHT / (2 * GRAPH_BUDGET_MS)))
+        color = GRAPH_SLOW_COLOR if frame_ms > GRAPH_BUDGET_MS else GRAPH_COLOR
+        if height > 0:
+            self.graph.fill(color, (x, GRAPH_HEIGHT - height, 1, height))
+        self.graph.set_at((x, self.graph_budget_y), (255, 255, 255))
+
+    def draw(self, surface, session, fps):
+        """Draws the overlay in the top right corner for the last completed frame."""
+        start = time.perf_counter()
+        self.update_graph()
+        self.refresh_row(self.frame_count % len(self.rows), session, fps)
+        self.frame_count += 1
+
+        rect = surface.blit(self.panel, (surface.get_width() - PANEL_WIDTH - 10, 10))
+        self.last_cost_ms = (time.perf_counter() - start) * 1000
+        return rect
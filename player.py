@@ -1,24 +1,36 @@
 #Code for Main player
 
 import pygame
+from render_queue import LAYER_ENTITIES
+from sprite_cache import frame_cache
+from timestep import FIXED_DT, elapsed, lerp
 
 class Player:
-    def __init__(self, x, y):
+    def __init__(self, x, y, bounds=None):
         self.x = x
         self.y = y
-        self.speed = 5  # Movement speed
+        self.bounds = bounds  # (left, top, right, bottom) of the world the player must stay in, if any
+        # Position at the previous tick and the interpolated position drawn this frame
+        self.prev_x, self.prev_y = x, y
+        self.render_x, self.render_y = x, y
+        self.speed = 300  # Movement speed, pixels per second
         self.health= 100 # player health
 
-        # Load the sprite sheet
-        self.sprite_sheet = pygame.image.load("Sprites/Sprites_Player/mega_scientist_walk.png").convert_alpha()
+        # Load the sprite sheet (an atlas region when the atlas is built)
+        self.sprite_sheet = frame_cache.get_image("Sprites/Sprites_Player/mega_scientist_walk.png")
         self.current_frame = 0
-        self.frame_timer = 0
-        self.frame_delay = 10  # Adjusts animation speed
+        self.frame_timer = 0  # Seconds since the animation frame last advanced
+        self.frame_delay = 1 / 6  # Seconds per animation frame
 
         # Player direction and frame setup
         self.direction = "down"  # Default direction
         self.frames = self.load_frames()
 
+        # Pink rectangle to visualize the player's position, drawn once so it can be queued like a sprite
+        rect_width, rect_height = 64, 64  # Assuming the player sprite size is 64x64
+        self.outline = pygame.Surface((rect_width, rect_height), pygame.SRCALPHA)
+        pygame.draw.rect(self.outline, (255, 0, 255), self.outline.get_rect(), 2)
+
     def load_frames(self):
         """Extract frames from sprite sheet for animation."""
         frames = {
@@ -32,8 +44,18 @@ class Player:
         }
         return frames
 
+    def save_previous_position(self):
+        """Remembers where the player was before this tick, for render interpolation."""
+        self.prev_x = self.x
+        self.prev_y = self.y
+
+    def interpolate(self, alpha):
+        """Sets the position to draw at, alpha of the way from the previous tick to this one."""
+        self.render_x = lerp(self.prev_x, self.x, alpha)
+        self.render_y = lerp(self.prev_y, self.y, alpha)
+
     def update(self, keys):
-        """Update player position and animation based on input."""
+        """Update player position and animation for one fixed tick based on input."""
         dx, dy = 0, 0  # Movement vector components
         moving = False
 
@@ -64,26 +86,30 @@ class Player:
             dy /= magnitude
 
         # Update player position
-        self.x += dx * self.speed
-        self.y += dy * self.speed
+        self.x += dx * self.speed * FIXED_DT
+        self.y += dy * self.speed * FIXED_DT
+        if self.bounds is not None:
+            left, top, right, bottom = self.bounds
+            self.x = max(left, min(self.x, right))
+            self.y = max(top, min(self.y, bottom))
 
         # Update animation frame
         if moving:
-            self.frame_timer += 1
-            if self.frame_timer >= self.frame_delay:
+            self.frame_timer += FIXED_DT
+            if elapsed(self.frame_timer, self.frame_delay):
                 self.frame_timer = 0
                 self.current_frame = (self.current_frame + 1) % len(self.frames[self.direction])
         else:
             self.current_frame = 0  # Idle state resets to the first frame
 
-    def draw(self, surface):
-        # Draw the actual player sprite
+    def draw(self, render_queue):
+        # Submit the actual player sprite, ordered among the enemies by y
         sprite = self.frames[self.direction][self.current_frame]
-        sprite_rect = sprite.get_rect(center=(self.x, self.y))
-        surface.blit(sprite, sprite_rect.topleft)
+        sprite_rect = sprite.get_rect(center=(self.render_x, self.render_y))
+        render_queue.submit(sprite, sprite_rect.topleft, LAYER_ENTITIES, self.render_y)
 
-        # Draw a pink rectangle to visualize the player's position
-        rect_width, rect_height = 64, 64  # Assuming the player sprite size is 64x64
-        pygame.draw.rect(surface, (255, 0, 255), (self.x - rect_width // 2, self.y - rect_height // 2, rect_width, rect_height), 2)
+        # Pink rectangle to visualize the player's position, right after the sprite
+        outline_rect = self.outline.get_rect(center=(self.render_x, self.render_y))
+        render_queue.submit(self.outline, outline_rect.topleft, LAYER_ENTITIES, self.render_y)
 
 
@@ -0,0 +1,100 @@
+#Code for per-subsystem frame timing
+import math
+import time
+from contextlib import nullcontext
+
+
+class Profiler:
+    """Collects how many milliseconds each named section took, frame by frame.
+
+    Wrap work in `with profiler.section('ai'):`; time spent in the same section
+    several times during one frame is summed. end_frame() closes the frame and
+    records every section seen so far (0 for sections that did not run), so all
+    sections have one sample per frame and their percentiles line up.
+    """
+    def __init__(self, history=None):
+        self.history = history  # Keep only the newest samples when set (rolling window)
+        self.samples = {}  # Section name -> list of ms per frame
+        self.current = {}  # Section name -> ms accumulated in the open frame
+        self.frames = 0
+
+    def section(self, name):
+        return _Section(self, name)
+
+    def add(self, name, ms):
+        self.current[name] = self.current.get(name, 0.0) + ms
+
+    def end_frame(self):
+        current = self.current
+        for name in current:
+            if name not in self.samples:
+                # Sections first seen now get zeros for the frames before
+                self.samples[name] = [0.0] * min(self.frames, self.history or self.frames)
+        for name, samples in self.samples.items():
+            samples.append(current.get(name, 0.0))
+            if self.history is not None and len(samples) > self.history:
+                del samples[0]
+        self.current = {}
+        self.frames += 1
+
+    def last(self, name):
+        """Milliseconds the section took in the last completed frame."""
+        samples = self.samples.get(name)
+        return samples[-1] if samples else 0.0
+
+    def summary(self, percentiles=(50, 90, 99)):
+        """Per section: mean, the requested percentiles and max, in ms per frame."""
+        report = {}
+        for name, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            stats = {'mean': sum(ordered) / len(ordered)}
+            for percentile in percentiles:
+                stats[f'p{percentile}'] = percentile_of(ordered, percentile)
+            stats['max'] = ordered[-1]
+            report[name] = stats
+        return report
+
+    def reset(self):
+        self.samples = {}
+        self.current = {}
+        self.frames = 0
+
+
+class _Section:
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.profiler.add(self.name, (time.perf_counter() - self.start) * 1000)
+
+
+class NullProfiler:
+    """Drop-in Profiler that records nothing, used when timing is switched off."""
+    _context = nullcontext()
+
+    def section(self, name):
+        return self._context
+
+    def add(self, name, ms):
+        pass
+
+    def end_frame(self):
+        pass
+
+
+def percentile_of(ordered, percentile):
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(ordered) - 1, math.ceil(percentile / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+# Shared instance for code that has no profiler of its own
+null_profiler = NullProfiler()
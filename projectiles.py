@@ -0,0 +1,200 @@
+#Code for the shared projectile system (player bullets and enemy projectiles)
+import math
+import numpy as np
+from render_queue import LAYER_PROJECTILES
+from sprite_cache import frame_cache, rotation_cache
+from timestep import FIXED_DT, TIME_EPSILON
+
+FACTION_PLAYER = 0
+FACTION_ENEMY = 1
+
+
+class ProjectileSystem:
+    """Every projectile in the game, kept in preallocated arrays.
+
+    Slots are pooled: spawning takes a free slot and expiry gives it back, so no
+    objects are created per shot. Movement and lifetime run as one batched pass,
+    player bullets collide with enemies through the spatial hash, and enemy
+    projectiles collide with the player. Projectiles belong to the system, not
+    to whoever fired them, so they outlive a shooter that has been removed.
+    """
+    def __init__(self, capacity=512, bounds=None):
+        self.capacity = capacity
+        # Projectiles leaving (left, top, right, bottom), normally the world, are removed; None only uses lifetimes
+        self.bounds = bounds
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.prev_x = np.zeros(capacity)  # Position before the last tick, for render interpolation
+        self.prev_y = np.zeros(capacity)
+        self.vx = np.zeros(capacity)  # Pixels per second
+        self.vy = np.zeros(capacity)
+        self.damage = np.zeros(capacity)
+        self.lifetime = np.zeros(capacity)  # Seconds left before the projectile expires
+        self.faction = np.zeros(capacity, dtype=np.int8)
+        self.sprite = np.zeros(capacity, dtype=np.int32)
+        self.active = np.zeros(capacity, dtype=np.bool_)
+        self.generation = [0] * capacity  # Bumped on every reuse so old handles go stale
+        self.images = [None] * capacity  # (rotated sprite, centering offset) of each slot, picked at spawn
+        self.free_slots = list(range(capacity - 1, -1, -1))
+        self.sprites = []  # Sprite id -> RotationSet prerendered at every quantized angle
+        self._sprite_ids = {}  # Frame cache key (or id() of an uncached surface) -> sprite id
+        self.spawned = 0
+        self.expired = 0
+        # Evicted images drop their RotationSet here too (see discard())
+        frame_cache.dependents.add(self)
+
+    def register_sprite(self, surface, key=None):
+        """Returns the sprite id for a surface, registering it the first time.
+
+        Pass the frame cache key of cached images: the id then stays the same
+        when the image is evicted and loaded again, instead of growing the
+        registry with every reload.
+        """
+        registry_key = id(surface) if key is None else key
+        sprite_id = self._sprite_ids.get(registry_key)
+        if sprite_id is None:
+            sprite_id = len(self.sprites)
+            self.sprites.append(rotation_cache.get_rotations(surface, key=key))
+            self._sprite_ids[registry_key] = sprite_id
+        elif self.sprites[sprite_id] is None:
+            self.sprites[sprite_id] = rotation_cache.get_rotations(surface, key=key)
+        return sprite_id
+
+    def discard(self, key):
+        """Frame cache eviction of `key`: forgets its RotationSet until the sprite is registered again."""
+        sprite_id = self._sprite_ids.get(key)
+        if sprite_id is not None:
+            self.sprites[sprite_id] = None
+
+    def spawn(self, x, y, vx, vy, damage, faction, sprite_id, lifetime):
+        """Fires a projectile and returns a (slot, generation) handle for it."""
+        if not self.free_slots:
+            self._grow()
+        slot = self.free_slots.pop()
+        self.x[slot] = x
+        self.y[slot] = y
+        self.prev_x[slot] = x
+        self.prev_y[slot] = y
+        self.vx[slot] = vx
+        self.vy[slot] = vy
+        self.damage[slot] = damage
+        self.lifetime[slot] = lifetime
+        self.faction[slot] = faction
+        self.sprite[slot] = sprite_id
+        self.active[slot] = True
+        self.generation[slot] += 1
+        self.images[slot] = self.sprites[sprite_id].get_direction(vx, vy)
+        self.spawned += 1
+        return slot, self.generation[slot]
+
+    def spawn_towards(self, x, y, target_x, target_y, speed, damage, faction, sprite_id, lifetime):
+        """Fires a projectile from (x, y) at a target point at speed pixels per second.
+
+        Returns None if the two points coincide.
+        """
+        dx = target_x - x
+        dy = target_y - y
+        distance = math.hypot(dx, dy)
+        if distance == 0:
+            return None
+        return self.spawn(x, y, dx / distance * speed, dy / distance * speed,
+                          damage, faction, sprite_id, lifetime)
+
+    def is_alive(self, handle):
+        slot, generation = handle
+        return self.active[slot] and self.generation[slot] == generation
+
+    def count(self, faction=None):
+        if faction is None:
+            return int(self.active.sum())
+        return int((self.active & (self.faction == faction)).sum())
+
+    def clear(self):
+        for slot in np.flatnonzero(self.active):
+            self._release(slot)
+
+    def _release(self, slot):
+        self.active[slot] = False
+        self.images[slot] = None
+        self.free_slots.append(int(slot))
+        self.expired += 1
+
+    def _grow(self):
+        old_capacity = self.capacity
+        new_capacity = old_capacity * 2
+        for name in ('x', 'y', 'prev_x', 'prev_y', 'vx', 'vy', 'damage', 'lifetime', 'faction', 'sprite', 'active'):
+            array = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=array.dtype)
+            grown[:old_capacity] = array
+            setattr(self, name, grown)
+        self.generation.extend([0] * (new_capacity - old_capacity))
+        self.images.extend([None] * (new_capacity - old_capacity))
+        self.free_slots.extend(range(new_capacity - 1, old_capacity - 1, -1))
+        self.capacity = new_capacity
+
+    def update(self, player, spatial_hash=None):
+        """Advances every projectile by one fixed tick, expires old ones and resolves hits."""
+        self.advance(player)
+        if spatial_hash is not None:
+            self.collide_bullets(spatial_hash)
+
+    def advance(self, player):
+        """Batched movement, lifetime and bounds expiry, and enemy projectile hits on the player."""
+        active = np.flatnonzero(self.active)
+        if active.size == 0:
+            return
+
+        self.prev_x[active] = self.x[active]
+        self.prev_y[active] = self.y[active]
+        self.x[active] += self.vx[active] * FIXED_DT
+        self.y[active] += self.vy[active] * FIXED_DT
+        self.lifetime[active] -= FIXED_DT
+        x = self.x[active]
+        y = self.y[active]
+        expired = self.lifetime[active] <= TIME_EPSILON
+        if self.bounds is not None:
+            left, top, right, bottom = self.bounds
+            expired |= (x < left) | (x > right) | (y < top) | (y > bottom)
+
+        # Enemy projectiles: 10x10 box at (x, y) against the player's 64x64 box at (px, py)
+        enemy_owned = self.faction[active] == FACTION_ENEMY
+        hits_player = enemy_owned & ~expired & \
+            (x < player.x + 64) & (x + 10 > player.x) & (y < player.y + 64) & (y + 10 > player.y)
+        if hits_player.any():
+            player.health -= float(self.damage[active][hits_player].sum())
+        expired |= hits_player
+
+        for slot in active[expired]:
+            self._release(slot)
+
+    def collide_bullets(self, spatial_hash):
+        """Player bullets: 4x4 box centered on the bullet against 50x50 enemy boxes from the spatial hash."""
+        bullets = np.flatnonzero(self.active & (self.faction == FACTION_PLAYER))
+        for slot in bullets:
+            bullet_x = self.x[slot]
+            bullet_y = self.y[slot]
+            for enemy in spatial_hash.query_rect(bullet_x - 2, bullet_y - 2, 4, 4):
+                if not enemy.is_dead:
+                    enemy.take_damage(float(self.damage[slot]))
+                    self._release(slot)
+                    break
+
+    def draw(self, render_queue, alpha=1.0, view=None):
+        """Queues every projectile, alpha of the way from its previous to its current position.
+
+        With view (left, top, right, bottom), e.g. Camera.cull_bounds(), only
+        projectiles inside it are queued.
+        """
+        active = np.flatnonzero(self.active)
+        xs = self.prev_x[active] + (self.x[active] - self.prev_x[active]) * alpha
+        ys = self.prev_y[active] + (self.y[active] - self.prev_y[active]) * alpha
+        if view is not None:
+            left, top, right, bottom = view
+            inside = (xs >= left) & (xs <= right) & (ys >= top) & (ys <= bottom)
+            active, xs, ys = active[inside], xs[inside], ys[inside]
+        images = self.images
+        blits = []
+        for slot, x, y in zip(active.tolist(), xs.tolist(), ys.tolist()):
+            image, (offset_x, offset_y) = images[slot]
+            blits.append((image, (x + offset_x, y + offset_y)))
+        render_queue.extend(blits, LAYER_PROJECTILES)
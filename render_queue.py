@@ -0,0 +1,78 @@
+#Code for the render queue: sprites are submitted during draw and blitted per layer in one call
+from operator import itemgetter
+
+# Layers are flushed in increasing order
+LAYER_ENTITIES = 1  # Player, weapon and enemies, ordered by their y so lower sprites overlap higher ones
+LAYER_PROJECTILES = 2
+LAYER_HUD = 3
+
+SORTED_LAYERS = (LAYER_ENTITIES,)
+
+_sort_key = itemgetter(0)
+
+
+class RenderQueue:
+    """Collects (surface, position, layer, flags) submissions and draws each layer with one Surface.blits().
+
+    Entities no longer blit themselves: they submit their sprite, and flush()
+    hands every layer to blits() in a single C call instead of one blit() call
+    per sprite. Layers in sorted_layers are ordered by each submission's sort
+    y (ties keep submission order); the others keep submission order.
+    """
+    def __init__(self, sorted_layers=SORTED_LAYERS):
+        self.sorted_layers = frozenset(sorted_layers)
+        self.layers = {}  # Layer -> blits() items, or (sort y, item) pairs for sorted layers
+        self.submitted = 0  # Sprites drawn by the last flush
+        self.blits_calls = 0
+
+    def _layer(self, layer):
+        items = self.layers.get(layer)
+        if items is None:
+            items = self.layers[layer] = []
+        return items
+
+    def submit(self, surface, position, layer=LAYER_ENTITIES, sort_y=None, flags=0):
+        """Queues one blit; sort_y defaults to the bottom edge of the surface."""
+        item = (surface, position, None, flags) if flags else (surface, position)
+        items = self.layers.get(layer) or self._layer(layer)
+        if layer in self.sorted_layers:
+            items.append((position[1] + surface.get_height() if sort_y is None else sort_y, item))
+        else:
+            items.append(item)
+
+    def extend(self, items, layer):
+        """Queues many (surface, position) blits at once on a layer drawn in submission order."""
+        self._layer(layer).extend(items)
+
+    def flush(self, target, doreturn=True, offset=(0, 0)):
+        """Blits every queued sprite onto target, layer by layer, and empties the queue.
+
+        Positions are in world coordinates; offset (the camera's, see camera.py)
+        is subtracted from them. Returns the drawn rects (for dirty-rect
+        rendering), or an empty list when doreturn is False.
+        """
+        offset_x, offset_y = offset
+        rects = []
+        submitted = 0
+        for layer in sorted(self.layers):
+            items = self.layers[layer]
+            if not items:
+                continue
+            if layer in self.sorted_layers:
+                items.sort(key=_sort_key)
+                blits = [item for _, item in items]
+            else:
+                blits = items
+            if offset_x or offset_y:
+                blits = [(item[0], (item[1][0] - offset_x, item[1][1] - offset_y)) + item[2:] for item in blits]
+            drawn = target.blits(blits, doreturn=doreturn)
+            if doreturn:
+                rects.extend(drawn)
+            submitted += len(items)
+            self.blits_calls += 1
+            items.clear()
+        self.submitted = submitted
+        return rects
+
+    def clear(self):
+        self.layers.clear()
@@ -0,0 +1,179 @@
+#Code for the uniform-grid spatial hash used as a collision broadphase
+import math
+
+
+class SpatialHash:
+    """Buckets entities into square grid cells so overlap queries only look at nearby cells.
+
+    Every entity is stored once, in the cell containing its center, together with
+    its half extent. Queries grow their search area by the largest half extent seen,
+    so entities bigger than a cell are still found without being inserted many times.
+    """
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.max_half_extent = 0
+        self.count = 0
+        self.bounds = None  # (min_cx, min_cy, max_cx, max_cy) of occupied cells
+
+    def clear(self):
+        self.cells.clear()
+        self.max_half_extent = 0
+        self.count = 0
+        self.bounds = None
+
+    def insert(self, entity, half_width, half_height):
+        """Adds an entity whose AABB is centered on (entity.x, entity.y)."""
+        key = (int(entity.x // self.cell_size), int(entity.y // self.cell_size))
+        # The insertion index keeps query results in the same order as the source list
+        entry = (self.count, entity, half_width, half_height)
+        bucket = self.cells.get(key)
+        if bucket is None:
+            self.cells[key] = [entry]
+            if self.bounds is None:
+                self.bounds = (key[0], key[1], key[0], key[1])
+            else:
+                min_cx, min_cy, max_cx, max_cy = self.bounds
+                self.bounds = (min(min_cx, key[0]), min(min_cy, key[1]),
+                               max(max_cx, key[0]), max(max_cy, key[1]))
+        else:
+            bucket.append(entry)
+        self.count += 1
+        if half_width > self.max_half_extent:
+            self.max_half_extent = half_width
+        if half_height > self.max_half_extent:
+            self.max_half_extent = half_height
+
+    def rebuild(self, entities, half_width=25, half_height=25):
+        """Clears the grid and inserts every living entity. Called once per tick."""
+        self.clear()
+        size = self.cell_size
+        cells = self.cells
+        count = 0
+        # Same as calling insert() for each entity, inlined because it runs every tick
+        for entity in entities:
+            if entity.is_dead:
+                continue
+            key = (int(entity.x // size), int(entity.y // size))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [(count, entity, half_width, half_height)]
+            else:
+                bucket.append((count, entity, half_width, half_height))
+            count += 1
+
+        self.count = count
+        if cells:
+            self.max_half_extent = max(half_width, half_height)
+            xs = [key[0] for key in cells]
+            ys = [key[1] for key in cells]
+            self.bounds = (min(xs), min(ys), max(xs), max(ys))
+
+    def _candidates(self, left, top, right, bottom):
+        pad = self.max_half_extent
+        size = self.cell_size
+        first_x = int((left - pad) // size)
+        first_y = int((top - pad) // size)
+        last_x = int((right + pad) // size)
+        last_y = int((bottom + pad) // size)
+        cells = self.cells
+        for cy in range(first_y, last_y + 1):
+            for cx in range(first_x, last_x + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield from bucket
+
+    def query_rect(self, left, top, width, height):
+        """Returns the entities whose AABB overlaps the given rectangle, in insertion order."""
+        right = left + width
+        bottom = top + height
+        found = []
+        for entry in self._candidates(left, top, right, bottom):
+            _, entity, half_width, half_height = entry
+            if (entity.x - half_width < right and entity.x + half_width > left and
+                    entity.y - half_height < bottom and entity.y + half_height > top):
+                found.append(entry)
+        found.sort(key=lambda entry: entry[0])
+        return [entry[1] for entry in found]
+
+    def query_circle(self, x, y, radius):
+        """Returns the entities whose AABB overlaps the circle, in insertion order."""
+        found = []
+        for entry in self._candidates(x - radius, y - radius, x + radius, y + radius):
+            _, entity, half_width, half_height = entry
+            # Distance from the circle center to the closest point of the AABB
+            nearest_x = min(max(x, entity.x - half_width), entity.x + half_width)
+            nearest_y = min(max(y, entity.y - half_height), entity.y + half_height)
+            if math.hypot(nearest_x - x, nearest_y - y) <= radius:
+                found.append(entry)
+        found.sort(key=lambda entry: entry[0])
+        return [entry[1] for entry in found]
+
+    def k_nearest(self, x, y, k, max_range=None):
+        """Returns up to k living entities closest to (x, y), nearest first.
+
+        Searches square rings of cells outwards from the cell containing the point
+        and stops as soon as no unvisited ring can hold anything closer, so the cost
+        depends on local density rather than on the total number of entities.
+        """
+        if self.bounds is None or k <= 0:
+            return []
+
+        size = self.cell_size
+        center_x = int(x // size)
+        center_y = int(y // size)
+        min_cx, min_cy, max_cx, max_cy = self.bounds
+        max_ring = max(abs(center_x - min_cx), abs(center_x - max_cx),
+                       abs(center_y - min_cy), abs(center_y - max_cy))
+        # Distance from the point to the nearest edge of its own cell
+        edge = min(x - center_x * size, (center_x + 1) * size - x,
+                   y - center_y * size, (center_y + 1) * size - y)
+        max_range_sq = None if max_range is None else max_range * max_range
+
+        best = []  # (distance squared, insertion index, entity), kept sorted
+        cells = self.cells
+        for ring in range(max_ring + 1):
+            if ring > 0:
+                # Nothing in this ring or beyond can be closer than this
+                ring_distance = edge + (ring - 1) * size
+                ring_distance_sq = ring_distance * ring_distance
+                if len(best) == k and best[-1][0] <= ring_distance_sq:
+                    break
+                if max_range_sq is not None and ring_distance_sq > max_range_sq:
+                    break
+
+            for cx, cy in self._ring_cells(center_x, center_y, ring):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for index, entity, _, _ in bucket:
+                    if entity.is_dead:
+                        continue
+                    dx = entity.x - x
+                    dy = entity.y - y
+                    distance_sq = dx * dx + dy * dy
+                    if max_range_sq is not None and distance_sq > max_range_sq:
+                        continue
+                    if len(best) < k or (distance_sq, index) < best[-1][:2]:
+                        best.append((distance_sq, index, entity))
+                        best.sort(key=lambda item: item[:2])
+                        if len(best) > k:
+                            best.pop()
+
+        return [item[2] for item in best]
+
+    def nearest(self, x, y, max_range=None):
+        """Returns the nearest living entity to (x, y) within max_range, or None."""
+        found = self.k_nearest(x, y, 1, max_range)
+        return found[0] if found else None
+
+    def _ring_cells(self, center_x, center_y, ring):
+        if ring == 0:
+            yield center_x, center_y
+            return
+        for cx in range(center_x - ring, center_x + ring + 1):
+            yield cx, center_y - ring
+            yield cx, center_y + ring
+        for cy in range(center_y - ring + 1, center_y + ring):
+            yield center_x - ring, cy
+            yield center_x + ring, cy
@@ -0,0 +1,132 @@
+#Code for spreading a wave's enemy spawns over time
+import math
+import random
+import time
+from collections import deque
+from timestep import TIME_EPSILON
+
+
+class SpawnStream:
+    """One (enemy_type, count, spawn_rate) entry of a wave: count enemies at spawn_rate per second."""
+    __slots__ = ('enemy_type', 'remaining', 'spawn_rate', 'interval', 'next_time')
+
+    def __init__(self, enemy_type, count, spawn_rate, start_time):
+        self.enemy_type = enemy_type
+        self.remaining = count
+        self.spawn_rate = spawn_rate
+        # A missing or zero rate keeps the old behaviour: the whole entry spawns at once
+        self.interval = 1 / spawn_rate if spawn_rate and spawn_rate > 0 else 0
+        self.next_time = start_time  # The first enemy of every stream appears as the wave starts
+
+
+class SpawnScheduler:
+    """Turns a wave's entries into timed spawn streams and builds enemies within a time budget.
+
+    Streams run side by side, each releasing one enemy every 1 / spawn_rate
+    simulated seconds. Released enemies wait in a queue and are constructed
+    until the per-tick budget is spent (at least one per tick), so a large wave
+    or an enemy type loading its sprites for the first time cannot stall a
+    frame. Enemies appear on free cells at the map edge, precomputed whenever
+    the obstacle map changes, and away from the player where possible. With an
+    EnemyPool they are taken from the pool instead of constructed.
+    """
+    def __init__(self, tile_size=16, budget_ms=2.0, min_player_distance=160, pool=None):
+        self.tile_size = tile_size
+        self.pool = pool
+        self.budget_ms = budget_ms
+        self.min_player_distance = min_player_distance
+        self.streams = []
+        self.due = deque()  # SpawnStreams with one enemy each whose time has come, oldest first
+        self.edge_cells = []  # (x, y) grid cells enemies may appear on
+        self.obstacle_version = None
+        self.spawned = 0
+        self.deferred = 0  # Ticks that ended with released enemies still waiting for the budget
+        self.last_run_ms = 0
+
+    def start_wave(self, entries, now):
+        """Replaces any unfinished streams with the (enemy_type, count, spawn_rate) entries of a new wave."""
+        self.streams = [SpawnStream(enemy_type, count, spawn_rate, now)
+                        for enemy_type, count, spawn_rate in entries if count > 0]
+        self.due.clear()
+
+    def pending(self):
+        """Enemies of the current wave that have not been built yet."""
+        return sum(stream.remaining for stream in self.streams) + len(self.due)
+
+    def update_edge_cells(self, obstacle_map, obstacle_version):
+        """Recomputes the spawn cells if the obstacle map changed.
+
+        Walking inwards from each side of the map, the first free cell of every
+        row and column is an edge cell, so border walls push spawns one cell in.
+        Cells are world cells: the map's `origin` (see tilemap.ObstacleWindow) is added.
+        """
+        if obstacle_version == self.obstacle_version:
+            return
+        self.obstacle_version = obstacle_version
+        height = len(obstacle_map)
+        width = len(obstacle_map[0])
+        cells = set()
+        for y in range(height):
+            row = obstacle_map[y]
+            for xs in (range(width), range(width - 1, -1, -1)):
+                for x in xs:
+                    if not row[x]:
+                        cells.add((x, y))
+                        break
+        for x in range(width):
+            for ys in (range(height), range(height - 1, -1, -1)):
+                for y in ys:
+                    if not obstacle_map[y][x]:
+                        cells.add((x, y))
+                        break
+        origin_x, origin_y = getattr(obstacle_map, 'origin', (0, 0))
+        self.edge_cells = sorted((x + origin_x, y + origin_y) for x, y in cells)
+
+    def spawn_point(self, player_x, player_y, attempts=8):
+        """Pixel position of a random edge cell, preferring cells away from the player."""
+        tile_size = self.tile_size
+        if not self.edge_cells:
+            return 0, 0
+        cell = random.choice(self.edge_cells)
+        for _ in range(attempts - 1):
+            x = cell[0] * tile_size
+            y = cell[1] * tile_size
+            if math.hypot(x - player_x, y - player_y) >= self.min_player_distance:
+                break
+            cell = random.choice(self.edge_cells)
+        return cell[0] * tile_size, cell[1] * tile_size
+
+    def update(self, now, player_x, player_y, budget_ms=None):
+        """Releases the spawns due by `now` and returns the enemies built within the budget."""
+        for stream in self.streams:
+            while stream.remaining and stream.next_time <= now + TIME_EPSILON:
+                self.due.append(stream)
+                stream.remaining -= 1
+                stream.next_time += stream.interval
+        if self.streams and not all(stream.remaining for stream in self.streams):
+            self.streams = [stream for stream in self.streams if stream.remaining]
+
+        if not self.due:
+            return []
+
+        budget_ms = self.budget_ms if budget_ms is None else budget_ms
+        started = time.perf_counter()
+        deadline = started + budget_ms / 1000
+        enemies = []
+        while self.due:
+            stream = self.due.popleft()
+            x, y = self.spawn_point(player_x, player_y)
+            if self.pool is not None:
+                enemy = self.pool.acquire(stream.enemy_type, x, y)
+            else:
+                enemy = stream.enemy_type(x, y)
+            enemy.spawn_rate = stream.spawn_rate
+            enemies.append(enemy)
+            self.spawned += 1
+            if time.perf_counter() >= deadline:
+                break
+
+        if self.due:
+            self.deferred += 1
+        self.last_run_ms = (time.perf_counter() - started) * 1000
+        return enemies
@@ -0,0 +1,346 @@
+#Code for the shared sprite frame cache
+import math
+import weakref
+import pygame
+
+
+def surface_bytes(surface):
+    """Pixel size of a surface (a subsurface counts the part of its parent it covers)."""
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+class FrameSet:
+    """Frames sliced from one sprite sheet, plus their horizontally flipped copies."""
+    def __init__(self, frames, flipped=None):
+        self.frames = frames
+        # Flipped copies are made once here so draw() never has to flip per frame
+        if flipped is None:
+            flipped = [pygame.transform.flip(frame, True, False) for frame in frames]
+        self.flipped = flipped
+
+
+def slice_sheet(sprite_sheet, frame_width, frame_height, rows, cols, scale):
+    """Cuts a loaded sheet into scaled frames. Needs no display, so it can run off the main thread.
+
+    Unscaled frames stay subsurfaces of the sheet (or of its atlas page), so
+    they share its pixels instead of copying them.
+    """
+    scaled_size = (int(frame_width * scale), int(frame_height * scale))
+    frames = []
+    for row in range(rows):
+        for col in range(cols):
+            frame = sprite_sheet.subsurface(
+                (col * frame_width, row * frame_height, frame_width, frame_height)
+            )
+            frames.append(frame if scale == 1 else pygame.transform.scale(frame, scaled_size))
+    return frames
+
+
+class FrameCache:
+    """Process-wide cache of sliced and scaled frames shared by every enemy instance.
+
+    Frame sets are keyed by (sheet path, frame size, grid, scale), so two enemies
+    of the same type (or two actions using the same sheet) reuse one set of surfaces.
+    With a prebuilt AssetBundle attached (see asset_bundle.py), misses are served
+    from its ready-scaled frames and only stale or missing entries decode the PNG.
+    With a TextureAtlas attached (see atlas.py), source sheets and images are
+    regions of its pages rather than separate PNG files.
+
+    The cache counts the sprite memory its entries keep loaded (resident_bytes):
+    the pixels each entry owns, the pages of the bundle file under it, and
+    every atlas page an entry was cut or scaled from (once, however many
+    entries share it). evict() drops an entry, gives its bundle pages back,
+    unloads atlas pages no entry uses any more, and tells the dependents
+    (caches built from its surfaces, like the rotation cache) to drop theirs;
+    frame_budget.py decides what goes when memory is tight.
+    """
+    def __init__(self):
+        self.bundle = None
+        self.atlas = None
+        self.frame_sets = {}
+        self.images = {}
+        self.sizes = {}  # Key of a frame set or image -> its own pixel bytes, plus the bundle pages under it
+        self.spans = {}  # Key -> (start, end) of the bundle file it maps, given back on eviction
+        self.key_pages = {}  # Key -> atlas page indices it uses
+        self.page_keys = {}  # Atlas page index -> keys using it; a page is unloaded when it has none left
+        self.page_sizes = {}  # Atlas page index -> its pixel bytes, counted once while in use
+        self.dependents = weakref.WeakSet()  # Objects with discard(key), told about every eviction
+        self.resident_bytes = 0
+        self.evictions = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_frames(self, sprite_file_path, frame_width, frame_height, rows, cols, scale=1):
+        """Returns the FrameSet for a sprite sheet, loading it on the first request."""
+        key = (sprite_file_path, frame_width, frame_height, rows, cols, scale)
+        frame_set = self.frame_sets.get(key)
+        if frame_set is not None:
+            self.hits += 1
+            return frame_set
+
+        self.misses += 1
+        bundled = self.bundle.frame_set(key) if self.bundle is not None else None
+        if bundled is not None:
+            frame_set = FrameSet(*bundled)
+            sources = []
+        else:
+            sprite_sheet = self.load_source(sprite_file_path)
+            frame_set = FrameSet(slice_sheet(sprite_sheet, frame_width, frame_height, rows, cols, scale))
+            sources = [sprite_sheet]
+        self.put_frames(key, frame_set, sources)
+        return frame_set
+
+    def get_image(self, image_path, size=None):
+        """Returns a single (optionally scaled) image, loading it on the first request."""
+        key = (image_path, size)
+        image = self.images.get(key)
+        if image is not None:
+            self.hits += 1
+            return image
+
+        self.misses += 1
+        image = self.bundle.image(key) if self.bundle is not None else None
+        sources = []
+        if image is None:
+            image = self.load_source(image_path)
+            sources.append(image)
+            if size is not None:
+                image = pygame.transform.scale(image, size)
+        self.put_image(key, image, sources)
+        return image
+
+    def has_frames(self, key):
+        return key in self.frame_sets
+
+    def has_image(self, key):
+        return key in self.images
+
+    def put_frames(self, key, frame_set, sources=()):
+        """Stores a FrameSet built elsewhere (e.g. by the asset prefetcher) under its get_frames key.
+
+        sources are the images it was cut or scaled from, whose atlas pages it is charged for.
+        """
+        self.frame_sets[key] = frame_set
+        self._account(key, frame_set.frames + frame_set.flipped, sources)
+
+    def put_image(self, key, image, sources=()):
+        self.images[key] = image
+        self._account(key, [image], sources)
+
+    def _account(self, key, surfaces, sources):
+        atlas, bundle = self.atlas, self.bundle
+        size = 0
+        pages = set()
+        for surface in surfaces:
+            page = atlas.page_of(surface) if atlas is not None else None
+            if page is not None:
+                pages.add(page)
+            elif bundle is None or not bundle.maps(surface):
+                size += surface_bytes(surface)
+        if atlas is not None:
+            pages.update(page for page in map(atlas.page_of, sources) if page is not None)
+        span = bundle.span(surfaces) if bundle is not None else None
+        if span is not None:
+            size += bundle.span_bytes(*span)
+            self.spans[key] = span
+        else:
+            self.spans.pop(key, None)
+
+        # A key stored again (e.g. loaded on demand while also prefetched) replaces its old figures
+        self.resident_bytes += size - self.sizes.get(key, 0)
+        self.sizes[key] = size
+        old_pages = self.key_pages.get(key, set())
+        for page in pages - old_pages:
+            users = self.page_keys.get(page)
+            if users is None:
+                users = self.page_keys[page] = set()
+                self.page_sizes[page] = surface_bytes(atlas.pages[page])
+                self.resident_bytes += self.page_sizes[page]
+            users.add(key)
+        for page in old_pages - pages:
+            self._drop_page_user(page, key)
+        self.key_pages[key] = pages
+
+    def _drop_page_user(self, page, key):
+        """Removes key from the users of an atlas page, unloading the page if it was the last. Returns the bytes freed."""
+        users = self.page_keys[page]
+        users.discard(key)
+        if users:
+            return 0
+        del self.page_keys[page]
+        size = self.page_sizes.pop(page)
+        self.resident_bytes -= size
+        self.atlas.unload(page)
+        return size
+
+    def bytes_of(self, key):
+        """Memory a frame set or image key keeps loaded, atlas pages included (0 if it is not cached)."""
+        return self.footprint([key])
+
+    def footprint(self, keys):
+        """Memory the given keys keep loaded: their own bytes plus each atlas page they use, counted once.
+
+        This is what evicting all of them frees when no other key shares their pages.
+        """
+        sizes = self.sizes
+        key_pages = self.key_pages
+        pages = set()
+        total = 0
+        for key in keys:
+            total += sizes.get(key, 0)
+            pages.update(key_pages.get(key, ()))
+        return total + sum(self.page_sizes[page] for page in pages)
+
+    def evict(self, key):
+        """Drops a frame set or image, and whatever the dependents built from it. Returns the bytes freed.
+
+        The bytes are the entry's own pixels and bundle pages, plus the atlas
+        pages no other entry uses. Its surfaces are only freed once nothing
+        else (enemies, pooled enemies, projectiles in flight) still references
+        them; the next request loads it again.
+        """
+        size = self.sizes.pop(key, None)
+        if size is None:
+            return 0
+        self.frame_sets.pop(key, None)
+        self.images.pop(key, None)
+        self.resident_bytes -= size
+        span = self.spans.pop(key, None)
+        if span is not None:
+            self.bundle.release(*span)
+        for page in self.key_pages.pop(key, ()):
+            size += self._drop_page_user(page, key)
+        self.evictions += 1
+        for dependent in list(self.dependents):
+            dependent.discard(key)
+        return size
+
+    def load_source(self, path):
+        """A converted source image: its atlas region if the atlas has it, else the PNG itself.
+
+        The asset prefetcher calls this from its worker thread too, so both get the same atlas pages.
+        """
+        region = self.atlas.get(path) if self.atlas is not None else None
+        if region is not None:
+            return region
+        return pygame.image.load(path).convert_alpha()
+
+    def stats(self):
+        """Hit/miss counters, used to check that wave start cost does not grow with enemy count."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'frame_sets': len(self.frame_sets),
+            'images': len(self.images),
+            'resident_bytes': self.resident_bytes,
+            'atlas_pages': len(self.page_sizes),
+            'evictions': self.evictions,
+        }
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self.frame_sets.clear()
+        self.images.clear()
+        self.sizes.clear()
+        self.spans.clear()
+        self.key_pages.clear()
+        self.page_keys.clear()
+        self.page_sizes.clear()
+        self.resident_bytes = 0
+        self.evictions = 0
+        self.reset_stats()
+
+
+class RotationSet:
+    """One sprite prerendered at `steps` evenly spaced angles.
+
+    get() snaps an angle to the nearest step and returns the baked surface with
+    the offset that centers it, so callers blit at (center + offset) with no
+    per-frame pygame.transform.rotate.
+    """
+    def __init__(self, surface, steps, precise=False):
+        self.steps = steps
+        self.step_angle = 360 / steps
+        self.images = []
+        self.offsets = []
+        for step in range(steps):
+            angle = step * self.step_angle
+            if precise:
+                # Smoothed rotation: hides the stair-stepping that shows on large sprites
+                image = pygame.transform.rotozoom(surface, angle, 1)
+            else:
+                image = pygame.transform.rotate(surface, angle)
+            self.images.append(image)
+            self.offsets.append((-(image.get_width() // 2), -(image.get_height() // 2)))
+
+    def get(self, angle):
+        """Returns (surface, offset) for a counterclockwise angle in degrees, like pygame.transform.rotate."""
+        step = int(round(angle / self.step_angle)) % self.steps
+        return self.images[step], self.offsets[step]
+
+    def get_direction(self, dx, dy):
+        """Same as get(), for a direction vector in screen coordinates (y pointing down)."""
+        return self.get(-math.degrees(math.atan2(dy, dx)))
+
+
+class RotationCache:
+    """Process-wide cache of RotationSets, keyed by the source surface.
+
+    The default 64 steps (5.6 degrees) are invisible on bullets and guns;
+    precise mode bakes more, smoothed steps for large sprites where the
+    snapping would show. Surfaces from the frame cache should pass their frame
+    cache key: the set is then keyed by it, so a reloaded image reuses it, and
+    it is dropped when the frame cache evicts the image.
+    """
+    def __init__(self, steps=64, precise_steps=256):
+        self.steps = steps
+        self.precise_steps = precise_steps
+        self.rotation_sets = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get_rotations(self, surface, precise=False, steps=None, key=None):
+        """Returns the RotationSet of a surface (or of its frame cache key), baking every angle on the first request."""
+        if steps is None:
+            steps = self.precise_steps if precise else self.steps
+        cache_key = (id(surface) if key is None else key, steps, precise)
+        entry = self.rotation_sets.get(cache_key)
+        if entry is not None:
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        rotation_set = RotationSet(surface, steps, precise)
+        # Keep an unkeyed source alive so its id() is never reused for another surface
+        self.rotation_sets[cache_key] = (surface if key is None else None, rotation_set)
+        return rotation_set
+
+    def discard(self, key):
+        """Drops the RotationSets baked from frame cache key `key`."""
+        for cache_key in [cache_key for cache_key in self.rotation_sets if cache_key[0] == key]:
+            del self.rotation_sets[cache_key]
+
+    def rotate(self, surface, angle, precise=False):
+        """Cached replacement for pygame.transform.rotate: returns (surface, centering offset)."""
+        return self.get_rotations(surface, precise).get(angle)
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'rotation_sets': len(self.rotation_sets),
+        }
+
+    def clear(self):
+        self.rotation_sets.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Single caches shared by the whole process
+frame_cache = FrameCache()
+rotation_cache = RotationCache()
+frame_cache.dependents.add(rotation_cache)
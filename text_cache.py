@@ -0,0 +1,116 @@
+#Code for cached text rendering (fonts, rendered strings and glyph atlases)
+from collections import OrderedDict
+import pygame
+
+DIGITS = "0123456789.-+/%: "
+
+
+class GlyphAtlas:
+    """A font's characters rendered once, side by side on one surface.
+
+    Meant for text that changes every frame (timers, health, score, damage
+    popups): drawing a string is one blit per character from the atlas, with no
+    font.render call and nothing new to cache.
+    """
+    def __init__(self, font, color, characters=DIGITS):
+        self.color = color
+        self.height = font.get_height()
+        glyphs = [(char, font.render(char, True, color)) for char in characters]
+        width = sum(glyph.get_width() for _, glyph in glyphs)
+        self.surface = pygame.Surface((max(1, width), self.height), pygame.SRCALPHA)
+        self.rects = {}  # Character -> its area of the atlas surface
+        x = 0
+        for char, glyph in glyphs:
+            self.surface.blit(glyph, (x, 0))
+            self.rects[char] = pygame.Rect(x, 0, glyph.get_width(), self.height)
+            x += glyph.get_width()
+
+    def width(self, text):
+        rects = self.rects
+        return sum(rects[char].width for char in text)
+
+    def draw(self, surface, text, position, align='left'):
+        """Draws text at position (its left, center or right edge, per align) and returns the covered rect."""
+        x, y = position
+        if align != 'left':
+            width = self.width(text)
+            x -= width if align == 'right' else width // 2
+        start_x = x
+        rects = self.rects
+        atlas = self.surface
+        for char in text:
+            area = rects[char]
+            surface.blit(atlas, (x, y), area)
+            x += area.width
+        return pygame.Rect(start_x, y, x - start_x, self.height)
+
+
+class TextCache:
+    """Loads each font once and keeps recently rendered strings.
+
+    Rendered strings are keyed by (font, text, color, antialias), so a wave
+    message or a "Game Over" banner is rendered on its first frame only. The
+    string cache is a small LRU so text that keeps changing cannot grow it
+    without bound; use a GlyphAtlas for that kind of text instead.
+    """
+    def __init__(self, max_strings=256):
+        self.max_strings = max_strings
+        self.fonts = {}
+        self.strings = OrderedDict()
+        self.atlases = {}
+        self.hits = 0
+        self.misses = 0
+
+    def font(self, name=None, size=36):
+        """Returns the pygame font for (name, size), loading it on the first request."""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(name, size)
+            self.fonts[key] = font
+        return font
+
+    def render(self, text, size=36, color=(255, 255, 255), name=None, antialias=True):
+        """Returns the rendered surface of text, rendering it only if it is not cached."""
+        key = (name, size, text, color, antialias)
+        surface = self.strings.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.strings.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(name, size).render(text, antialias, color)
+        self.strings[key] = surface
+        if len(self.strings) > self.max_strings:
+            self.strings.popitem(last=False)
+        return surface
+
+    def atlas(self, size=36, color=(255, 255, 255), name=None, characters=DIGITS):
+        """Returns the GlyphAtlas of a font and color, building it on the first request."""
+        key = (name, size, color, characters)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(self.font(name, size), color, characters)
+            self.atlases[key] = atlas
+        return atlas
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'fonts': len(self.fonts),
+            'strings': len(self.strings),
+            'atlases': len(self.atlases),
+        }
+
+    def clear(self):
+        self.fonts.clear()
+        self.strings.clear()
+        self.atlases.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Single cache shared by the whole process
+text_cache = TextCache()
@@ -0,0 +1,351 @@
+#Code for the chunked world tilemap: generated from a seed, drawn from cached chunk surfaces
+import random
+from collections import OrderedDict
+import pygame
+from sprite_cache import frame_cache
+
+CHUNK_SIZE = 32  # Tiles per chunk side
+
+ENVIRONMENT = "Sprites/Sprites_Environment/"
+# Ground tiles and how often each is picked
+GROUND_TILES = [
+    (ENVIRONMENT + "desert_tile.png", 80),
+    (ENVIRONMENT + "desert_tile2.png", 17),
+    (ENVIRONMENT + "desert_grass_patch.png", 3),
+]
+# Features placed on the ground: name -> (sprite, width and height in tiles, blocks movement, weight)
+FEATURES = {
+    'rock': (ENVIRONMENT + "desert_rock_tile.png", 1, 1, True, 35),
+    'big_rock': (ENVIRONMENT + "desert_big_rock.png", 2, 2, True, 20),
+    'hut': (ENVIRONMENT + "desert_Hut.png", 3, 3, True, 10),
+    'grass': (ENVIRONMENT + "desert_grass.png", 2, 2, False, 20),
+    'big_grass': (ENVIRONMENT + "desert_big_grass.png", 3, 3, False, 15),
+}
+FEATURE_NAMES = list(FEATURES)
+FEATURE_WEIGHTS = [FEATURES[name][4] for name in FEATURE_NAMES]
+FEATURES_PER_CHUNK = (3, 8)  # Placement attempts per full chunk, scaled down for partial ones
+
+
+class Chunk:
+    """Generated data of one chunk: ground tile per cell, blocked cells and placed features."""
+    __slots__ = ('cx', 'cy', 'width', 'height', 'ground', 'blocked', 'features')
+
+    def __init__(self, cx, cy, width, height):
+        self.cx = cx
+        self.cy = cy
+        self.width = width  # Chunks on the far world edges may be smaller than CHUNK_SIZE
+        self.height = height
+        self.ground = bytearray(width * height)  # Index into GROUND_TILES, row-major
+        self.blocked = bytearray(width * height)
+        self.features = []  # (name, tile x, tile y) in world tiles
+
+
+class ObstacleWindow(list):
+    """Rows of obstacle flags for a rectangle of the world, indexed [y][x] from its origin cell.
+
+    It is a plain list of rows, so everything that reads an obstacle map works
+    on it unchanged; code converting between pixels and cells adds `origin`
+    (in cells) to get world cells.
+    """
+    def __init__(self, rows, origin):
+        super().__init__(rows)
+        self.origin = origin
+
+
+class TileMap:
+    """A width x height tile world whose chunks are generated from a seed when first needed.
+
+    Generation is deterministic per chunk, so chunk data lives in an LRU of
+    max_chunks and is simply regenerated after eviction: memory stays the same
+    for a 44 x 44 or a 4096 x 4096 world. The world border is blocked, and no
+    feature is placed within clear_radius tiles of clear_center (the player's
+    start).
+    """
+    def __init__(self, width, height, seed=0, chunk_size=CHUNK_SIZE, max_chunks=256,
+                 clear_center=None, clear_radius=4):
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.clear_center = clear_center if clear_center is not None else (width // 2, height // 2)
+        self.clear_radius = clear_radius
+        self.chunks = OrderedDict()  # (cx, cy) -> Chunk, least recently used first
+        self.generated = 0
+
+    def chunk(self, cx, cy):
+        """Data of the chunk at chunk coordinates (cx, cy), generating it if needed."""
+        key = (cx, cy)
+        chunk = self.chunks.get(key)
+        if chunk is not None:
+            self.chunks.move_to_end(key)
+            return chunk
+        chunk = self._generate(cx, cy)
+        self.chunks[key] = chunk
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+        return chunk
+
+    def _generate(self, cx, cy):
+        chunk_size = self.chunk_size
+        left = cx * chunk_size
+        top = cy * chunk_size
+        width = min(chunk_size, self.width - left)
+        height = min(chunk_size, self.height - top)
+        chunk = Chunk(cx, cy, width, height)
+        rng = random.Random(f"{self.seed}:{cx}:{cy}")  # String seeds hash the same in every process
+
+        ground = chunk.ground
+        ground_weights = [weight for _, weight in GROUND_TILES]
+        ground_indices = range(len(GROUND_TILES))
+        for index, tile in enumerate(rng.choices(ground_indices, ground_weights, k=width * height)):
+            ground[index] = tile
+
+        blocked = chunk.blocked
+        taken = bytearray(width * height)  # Cells covered by a feature, blocking or not
+        low, high = FEATURES_PER_CHUNK
+        attempts = rng.randint(low, high) * width * height // (chunk_size * chunk_size)
+        clear_x, clear_y = self.clear_center
+        for _ in range(attempts):
+            name = rng.choices(FEATURE_NAMES, FEATURE_WEIGHTS)[0]
+            _, feature_width, feature_height, blocks, _ = FEATURES[name]
+            if feature_width > width or feature_height > height:
+                continue
+            x = rng.randrange(width - feature_width + 1)
+            y = rng.randrange(height - feature_height + 1)
+            world_x, world_y = left + x, top + y
+            # Features stay inside their chunk and off the world border
+            if world_x < 1 or world_y < 1 or world_x + feature_width > self.width - 1 or \
+                    world_y + feature_height > self.height - 1:
+                continue
+            if abs(world_x + feature_width / 2 - clear_x) < self.clear_radius + feature_width / 2 and \
+                    abs(world_y + feature_height / 2 - clear_y) < self.clear_radius + feature_height / 2:
+                continue
+            cells = [(y + dy) * width + x + dx for dy in range(feature_height) for dx in range(feature_width)]
+            if any(taken[cell] for cell in cells):
+                continue
+            for cell in cells:
+                taken[cell] = 1
+                if blocks:
+                    blocked[cell] = 1
+            chunk.features.append((name, world_x, world_y))
+        self.generated += 1
+        return chunk
+
+    def is_blocked(self, x, y):
+        """True for cells outside the world, on its border, or under a blocking feature."""
+        if x <= 0 or y <= 0 or x >= self.width - 1 or y >= self.height - 1:
+            return True
+        chunk_size = self.chunk_size
+        chunk = self.chunk(x // chunk_size, y // chunk_size)
+        return bool(chunk.blocked[(y % chunk_size) * chunk.width + x % chunk_size])
+
+    def obstacle_window(self, left, top, width, height):
+        """ObstacleWindow of the width x height cells starting at world cell (left, top)."""
+        rows = [[False] * width for _ in range(height)]
+        chunk_size = self.chunk_size
+        for cy in range(top // chunk_size, (top + height - 1) // chunk_size + 1):
+            for cx in range(left // chunk_size, (left + width - 1) // chunk_size + 1):
+                chunk = self.chunk(cx, cy)
+                blocked = chunk.blocked
+                chunk_left = cx * chunk_size
+                chunk_top = cy * chunk_size
+                for y in range(max(top, chunk_top), min(top + height, chunk_top + chunk.height)):
+                    row = rows[y - top]
+                    offset = (y - chunk_top) * chunk.width - chunk_left
+                    for x in range(max(left, chunk_left), min(left + width, chunk_left + chunk.width)):
+                        if blocked[offset + x]:
+                            row[x - left] = True
+        # The world border is blocked whichever chunk it falls in
+        for y in range(height):
+            world_y = top + y
+            row = rows[y]
+            if world_y == 0 or world_y == self.height - 1:
+                row[:] = [True] * width
+            else:
+                if left == 0:
+                    row[0] = True
+                if left + width == self.width:
+                    row[-1] = True
+        return ObstacleWindow(rows, (left, top))
+
+    def stats(self):
+        return {'chunks_cached': len(self.chunks), 'generated': self.generated}
+
+
+class TileMapLayer:
+    """Draws a TileMap through prerendered chunk surfaces kept in an LRU.
+
+    A chunk is rendered (ground tiles, then features, then decals) the first
+    time it comes into view and kept until max_surfaces newer chunks push it
+    out; drawing a frame is then a few blits of cached chunks. prefetch()
+    renders the next chunk about to scroll into view, one per call, so
+    crossing into new chunks does not cost several chunk renders in one frame.
+
+    Changes on top of the generated map (set_tile, add_decal, remove_decal)
+    are kept by the layer, so a chunk rendered again later still shows them,
+    and only redraw the changed rect of the cached chunks under it.
+    Needs the display.
+    """
+    def __init__(self, tilemap, tile_size, max_surfaces=16, prefetch_margin=128):
+        self.tilemap = tilemap
+        self.tile_size = tile_size
+        self.max_surfaces = max_surfaces
+        self.prefetch_margin = prefetch_margin  # Pixels beyond the view whose chunks prefetch() renders
+        self.chunk_pixels = tilemap.chunk_size * tile_size
+        self.ground_images = [frame_cache.get_image(path, (tile_size, tile_size)) for path, _ in GROUND_TILES]
+        self.feature_images = {
+            name: frame_cache.get_image(path, (width * tile_size, height * tile_size))
+            for name, (path, width, height, _, _) in FEATURES.items()
+        }
+        self.tiles = {}  # (tile x, tile y) -> ground surface set with set_tile, replacing the generated one
+        self.decals = {}  # (cx, cy) -> (surface, world rect) pairs overlapping the chunk, in the order added
+        self.surfaces = OrderedDict()  # (cx, cy) -> rendered chunk surface, least recently used first
+        self.rendered = 0
+        self.recompose_count = 0  # Bumped when a cached chunk is redrawn in place, so a dirty-rect tracker redraws
+
+    def chunk_surface(self, cx, cy):
+        key = (cx, cy)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self._render(self.tilemap.chunk(cx, cy))
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_surfaces:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def _render(self, chunk):
+        tile_size = self.tile_size
+        surface = pygame.Surface((chunk.width * tile_size, chunk.height * tile_size)).convert()
+        self._compose(surface, chunk, surface.get_rect())
+        self.rendered += 1
+        return surface
+
+    def _compose(self, surface, chunk, area):
+        """Draws the ground, features and decals of a chunk that overlap area (in chunk pixels)."""
+        tile_size = self.tile_size
+        left = chunk.cx * self.tilemap.chunk_size
+        top = chunk.cy * self.tilemap.chunk_size
+        ground_images = self.ground_images
+        ground = chunk.ground
+        width = chunk.width
+        tiles = self.tiles
+        blits = []
+        for y in range(area.top // tile_size, (area.bottom - 1) // tile_size + 1):
+            for x in range(area.left // tile_size, (area.right - 1) // tile_size + 1):
+                image = tiles.get((left + x, top + y)) if tiles else None
+                if image is None:
+                    image = ground_images[ground[y * width + x]]
+                blits.append((image, (x * tile_size, y * tile_size)))
+        surface.set_clip(area)
+        surface.blits(blits, doreturn=False)
+        for name, x, y in chunk.features:
+            image = self.feature_images[name]
+            position = ((x - left) * tile_size, (y - top) * tile_size)
+            if area.colliderect(image.get_rect(topleft=position)):
+                surface.blit(image, position)
+        for decal, decal_rect in self.decals.get((chunk.cx, chunk.cy), ()):
+            local_rect = decal_rect.move(-left * tile_size, -top * tile_size)
+            if area.colliderect(local_rect):
+                surface.blit(decal, local_rect)
+        surface.set_clip(None)
+
+    def recompose_region(self, rect):
+        """Redraws the world pixel rect in every cached chunk it overlaps; chunks not cached pick it up when rendered."""
+        rect = pygame.Rect(rect)
+        chunk_pixels = self.chunk_pixels
+        redrawn = False
+        for cx, cy in self._chunks_in(rect.left, rect.top, rect.right, rect.bottom):
+            surface = self.surfaces.get((cx, cy))
+            if surface is None:
+                continue
+            area = rect.move(-cx * chunk_pixels, -cy * chunk_pixels).clip(surface.get_rect())
+            if not area:
+                continue
+            self._compose(surface, self.tilemap.chunk(cx, cy), area)
+            redrawn = True
+        if redrawn:
+            self.recompose_count += 1
+
+    def set_tile(self, x, y, tile):
+        """Changes the ground surface of one cell (world tiles); None restores the generated tile."""
+        if tile is None:
+            self.tiles.pop((x, y), None)
+        else:
+            self.tiles[(x, y)] = tile
+        tile_size = self.tile_size
+        self.recompose_region((x * tile_size, y * tile_size, tile_size, tile_size))
+
+    def add_decal(self, surface, position):
+        """Bakes a static surface (building, crater, blood splat...) into the map at a world pixel position."""
+        decal_rect = surface.get_rect(topleft=position)
+        for key in self._chunks_in(decal_rect.left, decal_rect.top, decal_rect.right, decal_rect.bottom):
+            self.decals.setdefault(key, []).append((surface, decal_rect))
+        self.recompose_region(decal_rect)
+        return decal_rect
+
+    def remove_decal(self, decal_rect):
+        """Removes a decal previously added with add_decal."""
+        for key in self._chunks_in(decal_rect.left, decal_rect.top, decal_rect.right, decal_rect.bottom):
+            decals = [(decal, rect) for decal, rect in self.decals.get(key, ()) if rect != decal_rect]
+            if decals:
+                self.decals[key] = decals
+            else:
+                self.decals.pop(key, None)
+        self.recompose_region(decal_rect)
+
+    def _chunks_in(self, left, top, right, bottom):
+        """Chunk coordinates overlapping the world pixel rectangle, clipped to the world."""
+        chunk_pixels = self.chunk_pixels
+        tilemap = self.tilemap
+        last_cx = (tilemap.width - 1) // tilemap.chunk_size
+        last_cy = (tilemap.height - 1) // tilemap.chunk_size
+        for cy in range(max(0, top // chunk_pixels), min(last_cy, (bottom - 1) // chunk_pixels) + 1):
+            for cx in range(max(0, left // chunk_pixels), min(last_cx, (right - 1) // chunk_pixels) + 1):
+                yield cx, cy
+
+    def draw(self, surface, offset=(0, 0)):
+        """Draws the part of the world under a view whose top-left is at world position offset."""
+        offset_x, offset_y = offset
+        chunk_pixels = self.chunk_pixels
+        width, height = surface.get_size()
+        surface.blits([(self.chunk_surface(cx, cy), (cx * chunk_pixels - offset_x, cy * chunk_pixels - offset_y))
+                       for cx, cy in self._chunks_in(offset_x, offset_y, offset_x + width, offset_y + height)],
+                      doreturn=False)
+
+    def draw_areas(self, surface, rects, offset=(0, 0)):
+        """Copies only the given screen rects of the map, e.g. to erase last frame's sprites."""
+        offset_x, offset_y = offset
+        chunk_pixels = self.chunk_pixels
+        blits = []
+        for rect in rects:
+            world = rect.move(offset_x, offset_y)
+            for cx, cy in self._chunks_in(world.left, world.top, world.right, world.bottom):
+                chunk_x = cx * chunk_pixels
+                chunk_y = cy * chunk_pixels
+                area = world.move(-chunk_x, -chunk_y)
+                blits.append((self.chunk_surface(cx, cy), (chunk_x - offset_x + area.x, chunk_y - offset_y + area.y),
+                              area))
+        surface.blits(blits, doreturn=False)
+
+    def prefetch(self, view_rect):
+        """Renders at most one not yet cached chunk near the view (world pixels). Returns True if it did."""
+        margin = self.prefetch_margin
+        for cx, cy in self._chunks_in(view_rect.left - margin, view_rect.top - margin,
+                                      view_rect.right + margin, view_rect.bottom + margin):
+            if (cx, cy) not in self.surfaces:
+                self.chunk_surface(cx, cy)
+                return True
+        return False
+
+    def stats(self):
+        return {
+            'surfaces': len(self.surfaces),
+            'rendered': self.rendered,
+            'recompose_count': self.recompose_count,
+            'tiles_changed': len(self.tiles),
+            'surface_bytes': sum(surface.get_bytesize() * surface.get_width() * surface.get_height()
+                                 for surface in self.surfaces.values()),
+        }
@@ -0,0 +1,53 @@
+#Code for the fixed-timestep simulation clock
+
+SIM_HZ = 60  # Simulation ticks per second, independent of the rendering frame rate
+FIXED_DT = 1 / SIM_HZ  # Seconds simulated by one tick
+TIME_EPSILON = 1e-9  # Summing FIXED_DT drifts slightly; timers treat anything this close as elapsed
+
+
+def countdown(timer, dt=FIXED_DT):
+    """Returns a seconds timer after dt has passed, snapped to 0 once it runs out."""
+    timer -= dt
+    return 0 if timer <= TIME_EPSILON else timer
+
+
+def elapsed(timer, duration):
+    """True once a timer counting up in seconds has reached duration."""
+    return timer >= duration - TIME_EPSILON
+
+
+def lerp(previous, current, alpha):
+    """Render position between the previous and current simulation state."""
+    return previous + (current - previous) * alpha
+
+
+class FixedTimestep:
+    """Turns variable frame times into a whole number of fixed simulation ticks.
+
+    Frame time is added to an accumulator and drained in FIXED_DT steps; whatever
+    is left over becomes `alpha`, the fraction of a tick the renderer should
+    interpolate towards the newest state. A long stall (dragging the window,
+    a breakpoint) is capped so the game does not try to catch up all at once.
+    """
+    def __init__(self, dt=FIXED_DT, max_frame_time=0.25):
+        self.dt = dt
+        self.max_frame_time = max_frame_time
+        self.accumulator = 0.0
+        self.sim_time = 0.0
+        self.ticks = 0
+
+    def advance(self, frame_time):
+        """Adds a frame's wall-clock seconds and returns how many ticks to simulate."""
+        self.accumulator += min(frame_time, self.max_frame_time)
+        steps = 0
+        while self.accumulator >= self.dt - TIME_EPSILON:
+            self.accumulator = max(0.0, self.accumulator - self.dt)
+            steps += 1
+        self.ticks += steps
+        self.sim_time += steps * self.dt
+        return steps
+
+    @property
+    def alpha(self):
+        """How far (0..1) the current frame lies between the last two simulation states."""
+        return min(1.0, self.accumulator / self.dt)
@@ -1,52 +1,37 @@
 import pygame
 import math
+from spatial_hash import SpatialHash
+from sprite_cache import frame_cache, rotation_cache
+from projectiles import FACTION_PLAYER
+from render_queue import LAYER_ENTITIES
+from timestep import countdown
 
-class Bullet:
-    def __init__(self, x, y, target_x, target_y, speed=5, damage=3000):
-        self.x = x
-        self.y = y
-        self.speed = speed
-        self.damage = damage
-        
-        # Load and scale bullet image
-        self.original_image = pygame.image.load("Sprites/Sprites_Effect/Bullets/14.png").convert_alpha()
-        self.original_image = pygame.transform.scale(self.original_image, (48, 48))  # Adjust these numbers for desired size
-
-        # Calculate direction vector
-        dx = target_x - x
-        dy = target_y - y
-        distance = math.sqrt(dx**2 + dy**2)
-        self.dx = (dx / distance) * speed if distance > 0 else 0
-        self.dy = (dy / distance) * speed if distance > 0 else 0
-        
-        # Calculate angle and rotate image
-        self.angle = math.degrees(math.atan2(dy, dx))
-        self.image = pygame.transform.rotate(self.original_image, -self.angle)
-        
-    def update(self):
-        self.x += self.dx
-        self.y += self.dy
-        
-    def draw(self, surface):
-        surface.blit(self.image, (self.x - self.image.get_width() // 2, self.y - self.image.get_height() // 2))
+BULLET_SPEED = 300  # Pixels per second
+BULLET_DAMAGE = 3000
+BULLET_LIFETIME = 10  # Seconds; bullets normally leave the screen long before this
+BULLET_IMAGE = ("Sprites/Sprites_Effect/Bullets/14.png", (48, 48))  # (path, size) in the frame cache
 
 class Weapon:
-    def __init__(self, name, fire_rate, reload_time, image_path):
+    def __init__(self, name, fire_rate, reload_time, image_path, projectile_system):
         self.name = name
         self.fire_rate = fire_rate  # Shots per second
         self.reload_time = reload_time  # Seconds
-        self.last_shot_time = 0
-        self.bullets = []
+        self.shot_cooldown = 0  # Simulated seconds until the next shot
+        self.projectile_system = projectile_system  # Bullets live in the shared ProjectileSystem
+        bullet_image = frame_cache.get_image(*BULLET_IMAGE)
+        self.bullet_sprite = projectile_system.register_sprite(bullet_image, BULLET_IMAGE)
         self.offset = 30  # Distance from player
         self.angle = 0  # Current angle of weapon
         
         # Load weapon image
         try:
-            self.image = pygame.image.load(image_path).convert_alpha()
-            self.image = pygame.transform.scale(self.image, (32, 32))
+            self.image = frame_cache.get_image(image_path, (32, 32))
         except:
             self.image = pygame.Surface((32, 32))
             self.image.fill((100, 100, 100))
+        # Gun prerendered at every quantized angle, so aiming never rotates per frame
+        self.rotations = rotation_cache.get_rotations(self.image)
+        self.rotated_image, self.rotated_offset = self.rotations.get(0)
     
     def update_position(self, player_x, player_y, target_x, target_y):
         # Calculate angle to target
@@ -58,63 +43,44 @@ class Weapon:
         self.x = player_x + math.cos(self.angle) * self.offset
         self.y = player_y + math.sin(self.angle) * self.offset
         
-        # Rotate weapon image
-        self.rotated_image = pygame.transform.rotate(
-            self.image, 
-            -math.degrees(self.angle) - 0
-        )
+        # Pick the prerendered rotation closest to the aim angle
+        self.rotated_image, self.rotated_offset = self.rotations.get(-math.degrees(self.angle))
         
     def move_with_player(self, player_x, player_y):
         # Keep weapon at current angle but update position with player
         self.x = player_x + math.cos(self.angle) * self.offset
         self.y = player_y + math.sin(self.angle) * self.offset
     
+    def update_cooldown(self):
+        """Advances the fire rate timer by one simulation tick."""
+        if self.shot_cooldown > 0:
+            self.shot_cooldown = countdown(self.shot_cooldown)
+
     def can_shoot(self):
-        current_time = pygame.time.get_ticks()
-        return current_time - self.last_shot_time > (1000 / self.fire_rate)
+        return self.shot_cooldown <= 0
     
     def shoot(self, target_x, target_y):
         if self.can_shoot():
-            self.bullets.append(Bullet(self.x, self.y, target_x, target_y))
-            self.last_shot_time = pygame.time.get_ticks()
-    
-    def update_bullets(self, enemies):
-        bullets_to_remove = []
-        for bullet in self.bullets:
-            bullet.update()
-            
-            # Check collision with enemies
-            for enemy in enemies:
-                if not enemy.is_dead:
-                    enemy_rect = pygame.Rect(enemy.x - 25, enemy.y - 25, 50, 50)
-                    bullet_rect = pygame.Rect(bullet.x - 2, bullet.y - 2, 4, 4)
-                    
-                    if bullet_rect.colliderect(enemy_rect):
-                        enemy.take_damage(bullet.damage)
-                        bullets_to_remove.append(bullet)
-                        break
-            
-            # Remove bullets that are off screen
-            if (bullet.x < 0 or bullet.x > 800 or 
-                bullet.y < 0 or bullet.y > 800):
-                bullets_to_remove.append(bullet)
-        
-        # Remove used bullets
-        for bullet in bullets_to_remove:
-            if bullet in self.bullets:
-                self.bullets.remove(bullet)
-    
-    def draw(self, surface):
-        # Draw weapon
-        weapon_rect = self.rotated_image.get_rect(center=(self.x, self.y))
-        surface.blit(self.rotated_image, weapon_rect)
-        
-        # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(surface)
+            self.projectile_system.spawn_towards(self.x, self.y, target_x, target_y, BULLET_SPEED,
+                                                 BULLET_DAMAGE, FACTION_PLAYER, self.bullet_sprite,
+                                                 BULLET_LIFETIME)
+            self.shot_cooldown = 1 / self.fire_rate
+
+    def draw(self, render_queue, origin=None):
+        # Submit weapon (bullets are drawn by the ProjectileSystem)
+        x, y = self.x, self.y
+        if origin is not None:
+            # Follow the player's interpolated position rather than its last simulated one
+            x = origin[0] + math.cos(self.angle) * self.offset
+            y = origin[1] + math.sin(self.angle) * self.offset
+        offset_x, offset_y = self.rotated_offset
+        # Sorted at the holder's y, so the gun stays on top of the player that carries it
+        holder_y = origin[1] if origin is not None else y
+        render_queue.submit(self.rotated_image, (x + offset_x, y + offset_y), LAYER_ENTITIES, holder_y)
 
 class WeaponManager:
-    def __init__(self):
+    def __init__(self, projectile_system):
+        self.projectile_system = projectile_system
         self.weapons = []
         self.max_weapons = 6
         self.current_weapon = None
@@ -124,23 +90,23 @@ class WeaponManager:
         
     def add_weapon(self, name, fire_rate, reload_time, image_path):
         if len(self.weapons) < self.max_weapons:
-            weapon = Weapon(name, fire_rate, reload_time, image_path)
+            weapon = Weapon(name, fire_rate, reload_time, image_path, self.projectile_system)
             self.weapons.append(weapon)
             if self.current_weapon is None:
                 self.current_weapon = weapon
     
-    def update(self, player_x, player_y, enemies):
+    def update(self, player_x, player_y, enemies, spatial_hash=None):
         if not self.current_weapon:
             return
-            
-        # Get living enemies only
-        living_enemies = [e for e in enemies if not e.is_dead]
-        
-        if living_enemies:
-            # Find nearest living enemy
-            nearest_enemy = min(living_enemies, 
-                key=lambda e: math.sqrt((e.x - player_x)**2 + (e.y - player_y)**2))
-            
+        self.current_weapon.update_cooldown()
+
+        # Nearest living enemy comes from the per-tick spatial index
+        if spatial_hash is None:
+            spatial_hash = SpatialHash()
+            spatial_hash.rebuild(enemies)
+        nearest_enemy = spatial_hash.nearest(player_x, player_y)
+
+        if nearest_enemy:
             # Update weapon position and orientation
             self.current_weapon.update_position(player_x, player_y, 
                                             nearest_enemy.x, nearest_enemy.y)
@@ -150,10 +116,7 @@ class WeaponManager:
         else:
             # If no living enemies, just move weapon with player at current angle
             self.current_weapon.move_with_player(player_x, player_y)
-            
-        # Update bullets
-        self.current_weapon.update_bullets(enemies)
     
-    def draw(self, surface):
+    def draw(self, render_queue, origin=None):
         if self.current_weapon:
-            self.current_weapon.draw(surface)
\ No newline at end of file
+            self.current_weapon.draw(render_queue, origin)
\ No newline at end of file